@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Webhook upload benchmark
+========================
+
+Compares the memory and CPU cost of the ways a large file can be sent to
+``PUT /webhook``:
+
+- read:  ``f.read()`` into one bytes object, as DocumentProcessor used to do
+- file:  ``upload_file_to_webhook`` with an open file object (default)
+- mmap:  ``upload_file_to_webhook(use_mmap=True)``
+
+Each mode runs in a fresh child process against a local sink server that
+discards the body, so the numbers reflect only the client side.
+
+Usage:
+    python benchmarks/webhook_upload.py --size-mb 200 --concurrency 4
+    python benchmarks/webhook_upload.py --file /path/to/large.pdf
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import tempfile
+import threading
+import subprocess
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+MODES = ("read", "file", "mmap")
+
+
+class SinkHandler(BaseHTTPRequestHandler):
+    """Reads and discards request bodies."""
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_PUT(self):
+        remaining = int(self.headers.get("Content-Length") or 0)
+        while remaining:
+            chunk = self.rfile.read(min(remaining, 1024 * 1024))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+        body = b'{"status": "OK", "data": {}}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _rss_kb() -> int:
+    # ru_maxrss is reported in KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def run_child(mode: str, url: str, file_path: str, concurrency: int) -> None:
+    """Upload ``file_path`` ``concurrency`` times in parallel and print measurements."""
+    from dtc_api_sdk import DTCApiClient
+
+    client = DTCApiClient(api_key="benchmark", base_url=url)
+    baseline_kb = _rss_kb()
+
+    def upload():
+        if mode == "read":
+            with open(file_path, "rb") as f:
+                data = f.read()
+            client.webhook_session.put(
+                f"{url}/webhook", params={"token": "bench"}, data=data, timeout=600
+            ).raise_for_status()
+        else:
+            client.upload_file_to_webhook("bench", file_path, timeout=600, use_mmap=(mode == "mmap"))
+
+    cpu_start = os.times()
+    wall_start = time.perf_counter()
+    threads = [threading.Thread(target=upload) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - wall_start
+    cpu_end = os.times()
+    client.close()
+
+    print(json.dumps({
+        "mode": mode,
+        "rss_delta_mb": (_rss_kb() - baseline_kb) / 1024,
+        "cpu_user_s": cpu_end.user - cpu_start.user,
+        "cpu_sys_s": cpu_end.system - cpu_start.system,
+        "wall_s": wall,
+    }))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--file", help="File to upload (default: generate a temporary file)")
+    parser.add_argument("--size-mb", type=int, default=200, help="Size of the generated file")
+    parser.add_argument("--concurrency", type=int, default=1, help="Parallel uploads of the same file")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--url", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.url, args.file, args.concurrency)
+        return
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SinkHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = "http://%s:%d" % server.server_address
+
+    temp_path = None
+    file_path = args.file
+    if file_path is None:
+        handle = tempfile.NamedTemporaryFile(suffix=".bin", delete=False)
+        with handle:
+            block = os.urandom(1024 * 1024)
+            for _ in range(args.size_mb):
+                handle.write(block)
+        file_path = temp_path = handle.name
+
+    size_mb = os.path.getsize(file_path) / (1024 * 1024)
+    print(f"Uploading {size_mb:.0f} MB x {args.concurrency} to {url}")
+    print(f"{'mode':<6} {'peak RSS +MB':>13} {'user CPU s':>11} {'sys CPU s':>10} {'wall s':>8}")
+
+    try:
+        for mode in args.modes:
+            output = subprocess.run(
+                [sys.executable, __file__, "--child", mode, "--url", url,
+                 "--file", file_path, "--concurrency", str(args.concurrency)],
+                check=True, capture_output=True, text=True
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(f"{mode:<6} {result['rss_delta_mb']:>13.1f} {result['cpu_user_s']:>11.2f} "
+                  f"{result['cpu_sys_s']:>10.2f} {result['wall_s']:>8.2f}")
+    finally:
+        server.shutdown()
+        if temp_path:
+            os.unlink(temp_path)
+
+
+if __name__ == "__main__":
+    main()
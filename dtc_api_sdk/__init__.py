@@ -7,15 +7,124 @@ A Python client library for interacting with the Aparavi Data Toolchain API.
 __version__ = "0.1.0"
 __author__ = "Aparavi Software"
 
-from .client import DTCApiClient
-from .models import APIResponse, TaskStatus, PipelineConfig
-from .exceptions import DTCApiError, AuthenticationError, ValidationError
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+# Public names are imported from their modules on first access, so importing
+# the package (or the ``dtc-cli`` entry point) stays fast until a name that
+# needs requests, sqlite3 or httpx is actually used
+_EXPORTS = {
+    "DTCApiClient": "client",
+    "AsyncDTCApiClient": "async_client",
+    "TaskPool": "task_pool",
+    "TaskLease": "task_pool",
+    "PipelineCache": "pipeline",
+    "PipelineGraph": "pipeline",
+    "ValidationResult": "pipeline",
+    "validate_config": "pipeline",
+    "APIResponse": "models",
+    "TaskStatus": "models",
+    "TaskInfo": "models",
+    "TaskStatusSnapshot": "models",
+    "PipelineConfig": "models",
+    "CompiledPipeline": "models",
+    "TransportProfile": "transport",
+    "PollPolicy": "polling",
+    "RetryPolicy": "retry",
+    "RateLimiter": "ratelimit",
+    "RateLimit": "ratelimit",
+    "ConcurrencyLimiter": "concurrency",
+    "ResultCache": "cache",
+    "JobJournal": "journal",
+    "FileState": "journal",
+    "BatchRunner": "batch",
+    "BatchResult": "batch",
+    "BatchStats": "batch",
+    "JsonLinesSink": "batch",
+    "scan_files": "batch",
+    "Reaper": "reaper",
+    "TokenRegistry": "reaper",
+    "TokenStore": "tokens",
+    "DaemonServer": "daemon",
+    "DaemonClient": "daemon",
+    "DTCApiError": "exceptions",
+    "AuthenticationError": "exceptions",
+    "ValidationError": "exceptions",
+}
+
+if TYPE_CHECKING:  # pragma: no cover - eager imports for type checkers and IDEs
+    from .client import DTCApiClient
+    from .async_client import AsyncDTCApiClient
+    from .task_pool import TaskPool, TaskLease
+    from .pipeline import PipelineCache, PipelineGraph, ValidationResult, validate_config
+    from .models import APIResponse, TaskStatus, TaskInfo, TaskStatusSnapshot, PipelineConfig, CompiledPipeline
+    from .transport import TransportProfile
+    from .polling import PollPolicy
+    from .retry import RetryPolicy
+    from .ratelimit import RateLimiter, RateLimit
+    from .concurrency import ConcurrencyLimiter
+    from .cache import ResultCache
+    from .journal import JobJournal, FileState
+    from .batch import BatchRunner, BatchResult, BatchStats, JsonLinesSink, scan_files
+    from .reaper import Reaper, TokenRegistry
+    from .tokens import TokenStore
+    from .daemon import DaemonServer, DaemonClient
+    from .exceptions import DTCApiError, AuthenticationError, ValidationError
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        # Submodules stay reachable as attributes, e.g. dtc_api_sdk.client
+        try:
+            return importlib.import_module(f".{name}", __name__)
+        except ModuleNotFoundError as e:
+            if e.name != f"{__name__}.{name}":
+                raise
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
+
 
 __all__ = [
     "DTCApiClient",
+    "AsyncDTCApiClient",
+    "TaskPool",
+    "TaskLease",
+    "PipelineCache",
+    "PipelineGraph",
+    "ValidationResult",
+    "validate_config",
     "APIResponse", 
     "TaskStatus",
+    "TaskInfo",
+    "TaskStatusSnapshot",
     "PipelineConfig",
+    "CompiledPipeline",
+    "TransportProfile",
+    "PollPolicy",
+    "RetryPolicy",
+    "RateLimiter",
+    "RateLimit",
+    "ConcurrencyLimiter",
+    "ResultCache",
+    "JobJournal",
+    "FileState",
+    "BatchRunner",
+    "BatchResult",
+    "BatchStats",
+    "JsonLinesSink",
+    "scan_files",
+    "Reaper",
+    "TokenRegistry",
+    "TokenStore",
+    "DaemonServer",
+    "DaemonClient",
     "DTCApiError",
     "AuthenticationError", 
     "ValidationError"
@@ -0,0 +1,1182 @@
+"""
+Asynchronous API client for the Aparavi Data Toolchain API.
+
+Requires the optional ``httpx`` dependency (``pip install dtc-api-sdk[async]``).
+
+Differences from the synchronous client:
+
+- Created tasks and pipelines are not recorded in a token registry, so
+  there is no ``registry`` parameter and no ``start_reaper()``.
+- ``process_directory()`` runs its own worker coroutines rather than a
+  BatchRunner, so it takes no ``task_pool`` or ``journal`` (the TaskPool
+  and JobJournal are thread-based).
+- With ``use_mmap=True`` uploads read the file through page faults on the
+  event loop thread; use it for files that are likely in the page cache.
+"""
+
+import os
+import time
+import asyncio
+import logging
+import contextlib
+from typing import Dict, Any, Callable, Optional, List, Union, Iterable, Iterator, AsyncIterator
+from pathlib import Path
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+from .client import (
+    USER_AGENT,
+    _cacheable,
+    _config_payload,
+    _extract_token,
+    _parse_response,
+    _parse_webhook_body,
+    _task_info_from_data,
+    _webhook_result,
+    _task_exited,
+    is_task_ready,
+    _services_from_data,
+    _guess_content_type,
+    _interface_url,
+    _override_policy,
+)
+from .streaming import MultipartEncoder, Base64JSONBody, MappedFileBody, ProgressCallback, _StreamingBody
+from .retry import RetryPolicy, RetryEngine, RetryStats, parse_retry_after
+from .ratelimit import RateLimiter
+from .concurrency import ConcurrencyLimiter, CONCURRENCY_LIMITED_ENDPOINTS, UNIT_BYTES, body_units
+from .pipeline import validate_config
+from .cache import ResultCache
+from .batch import BatchResult, BatchStats, ResultSink, _error_message, scan_files
+from .polling import TERMINAL_STATUSES, PollPolicy, PollTracker, PollMetrics, PollStats
+from .models import (
+    APIResponse,
+    PipelineConfig,
+    CompiledPipeline,
+    TaskInfo,
+    TaskStatusSnapshot,
+    ServiceInfo,
+    TaskStatus
+)
+from .exceptions import (
+    DTCApiError,
+    AuthenticationError,
+    PipelineError,
+    TaskError,
+    NetworkError
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncDTCApiClient:
+    """
+    Asynchronous Aparavi Data Toolchain API client.
+
+    Mirrors the methods of :class:`DTCApiClient` as coroutines (and the
+    ``task()``/``pipeline()`` context managers as async ones) on top of a
+    pooled keep-alive ``httpx.AsyncClient``, so a single event loop can keep
+    hundreds of uploads and status polls in flight. The module docstring
+    lists the differences.
+
+    Example:
+        >>> async with AsyncDTCApiClient() as client:
+        ...     token = await client.execute_task(pipeline_config)
+        ...     result = await client.upload_file_to_webhook(token, "document.pdf")
+    """
+
+    def __init__(
+        self,
+        api_key: str = None,
+        base_url: str = "https://eaas-dev.aparavi.com",
+        timeout: int = 30,
+        max_retries: int = 3,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        poll_policy: PollPolicy = None,
+        retry_policy: RetryPolicy = None,
+        rate_limiter: RateLimiter = None,
+        concurrency_limiter: ConcurrencyLimiter = None
+    ):
+        """
+        Initialize the async DTC API client.
+
+        Args:
+            api_key: API key for authentication. If not provided, will look for
+                    DTC_API_KEY environment variable.
+            base_url: Base URL for the API. Defaults to dev environment.
+            timeout: Request timeout in seconds.
+            max_retries: Maximum number of retry attempts for failed requests.
+                    Ignored when retry_policy is given.
+            max_connections: Maximum number of concurrent connections in the pool.
+            max_keepalive_connections: Maximum number of idle connections kept alive.
+            keepalive_expiry: Seconds an idle keep-alive connection is retained.
+            poll_policy: Default adaptive polling schedule for wait_for_task()
+                    and as_completed().
+            retry_policy: Retry settings: endpoint safety, backoff,
+                    Retry-After limits and the retry budget.
+            rate_limiter: Optional per-endpoint-group request pacing. May be
+                    shared with other clients, sync or async.
+            concurrency_limiter: Optional adaptive bound on in-flight task
+                    launches and uploads. May be shared with other clients,
+                    sync or async.
+        """
+        if httpx is None:
+            raise ImportError(
+                "AsyncDTCApiClient requires httpx. Install it with: pip install dtc-api-sdk[async]"
+            )
+
+        self.api_key = api_key or os.getenv("DTC_API_KEY")
+        if not self.api_key:
+            raise AuthenticationError("API key is required. Set DTC_API_KEY environment variable or pass api_key parameter.")
+
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self._retry = RetryEngine(retry_policy or RetryPolicy(max_retries=max_retries))
+        self.rate_limiter = rate_limiter
+        self.concurrency_limiter = concurrency_limiter
+        self.poll_policy = poll_policy or PollPolicy()
+        self._poll_metrics = PollMetrics()
+
+        # Retries are decided per endpoint by the retry engine in _send(),
+        # so the transport itself never retries
+        transport = httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry
+            )
+        )
+        self.session = httpx.AsyncClient(
+            transport=transport,
+            timeout=timeout,
+            headers={
+                "Authorization": f"Bearer {self.api_key}",
+                "User-Agent": USER_AGENT
+            }
+        )
+
+    async def __aenter__(self) -> "AsyncDTCApiClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the underlying connection pool."""
+        await self.session.aclose()
+
+    def get_poll_stats(self) -> PollStats:
+        """
+        Get task polling statistics accumulated by this client.
+
+        Returns:
+            PollStats with total polls, wasted polls and finished tasks
+        """
+        return self._poll_metrics.snapshot()
+
+    def get_retry_stats(self) -> RetryStats:
+        """
+        Get retry statistics accumulated by this client.
+
+        Returns:
+            RetryStats with request and retry counts and the remaining budget
+        """
+        return self._retry.stats()
+
+    async def _send(
+        self,
+        method: str,
+        endpoint: str,
+        url: str = None,
+        content: Any = None,
+        **kwargs: Any
+    ) -> "httpx.Response":
+        """
+        Send a request, retrying transient failures as the retry engine allows.
+
+        Every attempt is paced by the rate limiter and, for task launches and
+        uploads, holds a concurrency limiter slot; both adapt to the
+        responses.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint path, used to classify retry safety
+            url: Full URL; defaults to base_url + endpoint
+            content: Request body: bytes, or a callable returning a fresh
+                    async iterator of chunks for every attempt
+            **kwargs: Arguments for ``AsyncClient.request``
+
+        Returns:
+            The final httpx.Response
+        """
+        url = url or f"{self.base_url}{endpoint}"
+        replayable = "files" not in kwargs
+        limited = (
+            self.concurrency_limiter is not None
+            and (method.upper(), endpoint) in CONCURRENCY_LIMITED_ENDPOINTS
+        )
+        units = _content_units(content, kwargs.get("headers")) if limited else 1.0
+        self._retry.begin()
+
+        attempt = 0
+        while True:
+            if content is not None:
+                kwargs["content"] = content() if callable(content) else content
+            if self.rate_limiter is not None:
+                wait = self.rate_limiter.reserve(method, endpoint)
+                if wait:
+                    await asyncio.sleep(wait)
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            try:
+                async with self.concurrency_limiter.aslot(units) if limited else _null_slot() as slot:
+                    response = await self.session.request(method, url, **kwargs)
+                    if slot is not None:
+                        slot.dropped = response.status_code == 429 or response.status_code >= 500
+            except httpx.TransportError as e:
+                sent = not isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout))
+                delay = self._retry.next_delay(method, endpoint, attempt, sent=sent, replayable=replayable)
+                if delay is None:
+                    raise
+            else:
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if self.rate_limiter is not None:
+                    self.rate_limiter.feedback(
+                        method, endpoint, response.status_code, loop.time() - started, retry_after
+                    )
+                if response.status_code < 400:
+                    return response
+                delay = self._retry.next_delay(
+                    method, endpoint, attempt,
+                    status=response.status_code,
+                    retry_after=retry_after,
+                    replayable=replayable
+                )
+                if delay is None:
+                    return response
+                await response.aclose()
+
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _make_request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Dict[str, Any] = None,
+        data: Any = None,
+        files: Dict[str, Any] = None,
+        headers: Dict[str, str] = None
+    ) -> APIResponse:
+        """
+        Make an HTTP request to the API.
+
+        Args:
+            method: HTTP method (GET, POST, PUT, DELETE)
+            endpoint: API endpoint path
+            params: Query parameters
+            data: Request body data
+            files: Files to upload
+            headers: Additional headers
+
+        Returns:
+            APIResponse object with parsed response data
+
+        Raises:
+            DTCApiError: For various API errors
+        """
+        kwargs = {
+            "params": params,
+            "headers": dict(headers or {})
+        }
+        content = None
+
+        # Handle different content types (httpx sets Content-Type for json/files)
+        if files:
+            kwargs["files"] = files
+        elif data is not None:
+            if isinstance(data, (dict, list)):
+                kwargs["json"] = data
+            elif isinstance(data, _StreamingBody):
+                # Re-iterated from the start on every attempt
+                kwargs["headers"]["Content-Length"] = str(len(data))
+                content = data.__aiter__
+            else:
+                kwargs["headers"].setdefault("Content-Type", "application/json")
+                content = data
+
+        try:
+            response = await self._send(method, endpoint, content=content, **kwargs)
+        except httpx.TimeoutException:
+            raise NetworkError(f"Request timed out after {self.timeout} seconds")
+        except httpx.TransportError as e:
+            raise NetworkError(f"Connection error: {str(e)}")
+        except httpx.HTTPError as e:
+            raise DTCApiError(f"Request failed: {str(e)}")
+
+        return _parse_response(response)
+
+    # Health Check Methods
+
+    async def get_version(self) -> str:
+        """
+        Get the API version.
+
+        Returns:
+            Version string
+        """
+        response = await self._make_request("GET", "/version")
+        return response.data
+
+    async def get_status(self) -> Dict[str, Any]:
+        """
+        Get server status.
+
+        Returns:
+            Server status information
+        """
+        response = await self._make_request("GET", "/status")
+        return response.data
+
+    # Pipeline Management Methods
+
+    async def create_pipeline(
+        self,
+        config: Union[PipelineConfig, CompiledPipeline, Dict[str, Any]],
+        name: str = None
+    ) -> str:
+        """
+        Create a new processing pipeline.
+
+        Args:
+            config: Pipeline configuration
+            name: Optional pipeline name
+
+        Returns:
+            Pipeline token for subsequent operations
+        """
+        payload = _config_payload(config)
+        params = {"name": name} if name else {}
+
+        response = await self._make_request("POST", "/pipe", params=params, data=payload)
+        return _extract_token(response.data, PipelineError, "Pipeline creation")
+
+    async def delete_pipeline(self, token: str) -> bool:
+        """
+        Delete an existing pipeline.
+
+        Args:
+            token: Pipeline token
+
+        Returns:
+            True if deletion was successful
+        """
+        params = {"token": token}
+        response = await self._make_request("DELETE", "/pipe", params=params)
+        return response.is_success
+
+    @contextlib.asynccontextmanager
+    async def pipeline(
+        self,
+        config: Union[PipelineConfig, CompiledPipeline, Dict[str, Any]],
+        name: str = None
+    ) -> AsyncIterator[str]:
+        """
+        Create a pipeline for the duration of a block.
+
+        The pipeline is deleted when the block exits, including on errors.
+
+        Args:
+            config: Pipeline configuration
+            name: Optional pipeline name
+
+        Yields:
+            Pipeline token
+
+        Example:
+            >>> async with client.pipeline(pipeline_config) as token:
+            ...     await client.upload_files(token, ["document.pdf"])
+        """
+        token = await self.create_pipeline(config, name=name)
+        try:
+            yield token
+        finally:
+            try:
+                await self.delete_pipeline(token)
+            except DTCApiError as e:
+                logger.warning("Failed to delete pipeline %s: %s", token, e)
+
+    async def validate_pipeline(
+        self,
+        config: Union[PipelineConfig, CompiledPipeline, Dict[str, Any]],
+        offline: bool = False
+    ) -> bool:
+        """
+        Validate a pipeline configuration without creating it.
+
+        The component graph is checked locally first (see
+        ``pipeline.validate_config``); configurations failing that check
+        are rejected without a request and their errors are logged.
+
+        Args:
+            config: Pipeline configuration to validate
+            offline: Only run the local check, skipping ``POST /pipe/validate``
+
+        Returns:
+            True if configuration is valid
+        """
+        result = validate_config(config)
+        if not result.valid:
+            logger.warning("Pipeline configuration is invalid: %s", "; ".join(result.errors))
+            return False
+        if offline:
+            return True
+
+        payload = _config_payload(config)
+        response = await self._make_request("POST", "/pipe/validate", data=payload)
+        return response.is_success
+
+    async def upload_files(
+        self,
+        token: str,
+        files: List[Union[str, Path]],
+        progress: ProgressCallback = None
+    ) -> bool:
+        """
+        Upload files to a pipeline for processing.
+
+        The multipart body is streamed from disk one file at a time, with
+        disk reads kept off the event loop.
+
+        Args:
+            token: Pipeline token
+            files: List of file paths to upload
+            progress: Optional callback ``progress(filename, bytes_sent, file_size)``
+
+        Returns:
+            True if upload was successful
+        """
+        params = {"token": token}
+        encoder = MultipartEncoder(files, progress=progress)
+        headers = {"Content-Type": encoder.content_type}
+        response = await self._make_request("PUT", "/pipe/process", params=params, data=encoder, headers=headers)
+        return response.is_success
+
+    # Task Management Methods
+
+    async def execute_task(
+        self,
+        config: Union[PipelineConfig, CompiledPipeline, Dict[str, Any]],
+        name: str = None,
+        threads: int = None
+    ) -> str:
+        """
+        Execute a one-off task.
+
+        Args:
+            config: Task configuration
+            name: Optional task name
+            threads: Number of threads to use (1-16)
+
+        Returns:
+            Task token
+        """
+        payload = _config_payload(config)
+
+        params = {}
+        if name:
+            params["name"] = name
+        if threads:
+            if not 1 <= threads <= 16:
+                raise ValueError("Threads must be between 1 and 16")
+            params["threads"] = threads
+
+        response = await self._make_request("PUT", "/task", params=params, data=payload)
+        return _extract_token(response.data, TaskError, "Task execution")
+
+    async def get_task_status(self, token: str) -> TaskInfo:
+        """
+        Get the status of a task.
+
+        Args:
+            token: Task token
+
+        Returns:
+            TaskInfo object with current status
+        """
+        return _task_info_from_data(token, await self._get_task_data(token))
+
+    async def get_task_snapshot(self, token: str, include_trace: bool = False) -> TaskStatusSnapshot:
+        """
+        Get the detailed engine state of a task.
+
+        Args:
+            token: Task token
+            include_trace: Keep the engine trace (parsed lazily via ``snapshot.trace``)
+
+        Returns:
+            TaskStatusSnapshot with counters, throughput and ETA
+        """
+        data = await self._get_task_data(token)
+        if not isinstance(data, dict):
+            raise TaskError(f"Unexpected task status response: {data}")
+        return TaskStatusSnapshot.from_payload(data, include_trace=include_trace)
+
+    async def _get_task_data(self, token: str) -> Any:
+        """Fetch the raw ``data`` payload of ``GET /task`` for a token."""
+        params = {"token": token}
+        response = await self._make_request("GET", "/task", params=params)
+        return response.data
+
+    async def cancel_task(self, token: str) -> bool:
+        """
+        Cancel a running task.
+
+        Args:
+            token: Task token
+
+        Returns:
+            True if cancellation was successful
+        """
+        params = {"token": token}
+        response = await self._make_request("DELETE", "/task", params=params)
+        return response.is_success
+
+    @contextlib.asynccontextmanager
+    async def task(
+        self,
+        config: Union[PipelineConfig, CompiledPipeline, Dict[str, Any]],
+        name: str = None,
+        threads: int = None,
+        ready_timeout: Optional[float] = 120
+    ) -> AsyncIterator[str]:
+        """
+        Run a task for the duration of a block.
+
+        The task is cancelled when the block exits, including on errors.
+
+        Args:
+            config: Task configuration
+            name: Optional task name
+            threads: Number of threads to use (1-16)
+            ready_timeout: Wait up to this many seconds for the task to
+                    accept webhook data before entering the block; None
+                    enters immediately
+
+        Yields:
+            Task token
+
+        Example:
+            >>> async with client.task(pipeline_config) as token:
+            ...     result = await client.upload_file_to_webhook(token, "document.pdf")
+        """
+        token = await self.execute_task(config, name=name, threads=threads)
+        try:
+            if ready_timeout is not None:
+                await self.wait_until_ready(token, deadline=ready_timeout)
+            yield token
+        finally:
+            await self._cancel_quietly(token)
+
+    async def _cancel_quietly(self, token: str) -> None:
+        """Cancel a task the SDK launched, logging rather than raising on failure."""
+        try:
+            await self.cancel_task(token)
+        except DTCApiError as e:
+            logger.warning("Failed to cancel task %s: %s", token, e)
+
+    async def wait_for_task(
+        self,
+        token: str,
+        poll_interval: float = None,
+        timeout: int = 300,
+        policy: PollPolicy = None
+    ) -> TaskInfo:
+        """
+        Wait for a task to complete without blocking the event loop.
+
+        Like the synchronous client, a failed status request is raised
+        rather than retried beyond what the retry policy allows.
+
+        Args:
+            token: Task token
+            poll_interval: Fixed seconds between status checks. Overrides the
+                    adaptive policy when given.
+            timeout: Maximum seconds to wait
+            policy: Polling schedule; defaults to the client's poll_policy
+
+        Returns:
+            Final TaskInfo when task completes
+
+        Raises:
+            TimeoutError: If task doesn't complete within timeout
+            TaskError: If task fails
+        """
+        if poll_interval is not None:
+            policy = PollPolicy.fixed(poll_interval)
+        try:
+            task_info = await asyncio.wait_for(
+                self._poll_until_done(token, PollTracker(policy or self.poll_policy), retry_network_errors=False),
+                timeout
+            )
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Task did not complete within {timeout} seconds")
+
+        if task_info.status == TaskStatus.FAILED:
+            raise TaskError(f"Task failed: {task_info.error_message}")
+        elif task_info.status == TaskStatus.CANCELLED:
+            raise TaskError("Task was cancelled")
+        return task_info
+
+    async def as_completed(
+        self,
+        tokens: Iterable[str],
+        timeout: float = None,
+        min_interval: float = None,
+        max_interval: float = None,
+        max_workers: int = 8,
+        policy: PollPolicy = None
+    ) -> AsyncIterator[TaskInfo]:
+        """
+        Wait for many tasks, yielding each one as soon as it finishes.
+
+        Every token is polled on its own adaptive schedule (see wait_for_task()).
+        Status requests failing with a NetworkError are retried on that
+        schedule, as in the synchronous client.
+
+        Args:
+            tokens: Task tokens to wait for
+            timeout: Maximum seconds to wait for all tasks
+            min_interval: Initial seconds between polls of one task
+            max_interval: Upper bound on seconds between polls of one task
+            max_workers: Maximum number of concurrent status requests
+            policy: Polling schedule; defaults to the client's poll_policy
+
+        Yields:
+            Final TaskInfo for each task in completion order. Failed tasks are
+            yielded, not raised.
+
+        Raises:
+            TimeoutError: If some tasks are still running when the timeout expires
+        """
+        policy = _override_policy(policy or self.poll_policy, min_interval, max_interval)
+        status_slots = asyncio.Semaphore(max_workers)
+        pollers = [
+            asyncio.ensure_future(self._poll_until_done(token, PollTracker(policy), status_slots=status_slots))
+            for token in dict.fromkeys(tokens)
+        ]
+        try:
+            for next_done in asyncio.as_completed(pollers, timeout=timeout):
+                try:
+                    yield await next_done
+                except asyncio.TimeoutError:
+                    pending = sum(1 for poller in pollers if not poller.done())
+                    raise TimeoutError(f"{pending} task(s) did not complete within {timeout} seconds")
+        finally:
+            for poller in pollers:
+                poller.cancel()
+
+    async def wait_for_tasks(self, tokens: Iterable[str], timeout: float = 300, **kwargs: Any) -> Dict[str, TaskInfo]:
+        """
+        Wait for many tasks to finish.
+
+        Args:
+            tokens: Task tokens to wait for
+            timeout: Maximum seconds to wait for all tasks
+            **kwargs: Polling options accepted by as_completed()
+
+        Returns:
+            Mapping of token to final TaskInfo
+        """
+        return {
+            task_info.token: task_info
+            async for task_info in self.as_completed(tokens, timeout=timeout, **kwargs)
+        }
+
+    async def _poll_until_done(
+        self,
+        token: str,
+        tracker: PollTracker,
+        status_slots: asyncio.Semaphore = None,
+        retry_network_errors: bool = True
+    ) -> TaskInfo:
+        while True:
+            try:
+                async with status_slots if status_slots is not None else _null_slot():
+                    task_info = await self.get_task_status(token)
+            except NetworkError:
+                if not retry_network_errors:
+                    raise
+                # Transient failure: try again on the normal schedule
+                task_info = None
+
+            if task_info is not None:
+                changed = tracker.observe(task_info)
+                finished = task_info.status in TERMINAL_STATUSES
+                self._poll_metrics.record(wasted=not (changed or finished), finished=finished)
+                if finished:
+                    return task_info
+
+            await asyncio.sleep(tracker.next_delay())
+
+    async def wait_until_ready(
+        self,
+        token: str,
+        deadline: float = 120,
+        initial_interval: float = 0.25,
+        max_interval: float = 2.0,
+        object_prefix: str = "webhook://"
+    ) -> Dict[str, Any]:
+        """
+        Wait until a task's engine can accept webhook data.
+
+        Args:
+            token: Task token from execute_task()
+            deadline: Maximum seconds to wait for readiness
+            initial_interval: Seconds before the second status check
+            max_interval: Upper bound on the delay between status checks
+            object_prefix: ``currentObject`` prefix signalling readiness
+
+        Returns:
+            The raw task status payload that reported readiness
+
+        Raises:
+            TimeoutError: If the task isn't ready within the deadline
+            TaskError: If the task exits before becoming ready
+        """
+        loop = asyncio.get_running_loop()
+        end_time = loop.time() + deadline
+        interval = initial_interval
+
+        while True:
+            data = await self._get_task_data(token)
+
+            if is_task_ready(data, object_prefix):
+                return data
+            if _task_exited(data):
+                raise TaskError(
+                    f"Task exited before becoming ready: {data.get('exitMsg') or data.get('exitCode')}",
+                    response_data=data
+                )
+
+            remaining = end_time - loop.time()
+            if remaining <= 0:
+                raise TimeoutError(f"Task was not ready within {deadline} seconds")
+
+            await asyncio.sleep(min(interval, remaining))
+            interval = min(interval * 2, max_interval)
+
+    # Webhook and UI Methods
+
+    async def send_webhook(self, token: str, webhook_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Send webhook data to a task.
+
+        Args:
+            token: Task token
+            webhook_data: Data to send via webhook
+
+        Returns:
+            Webhook response data
+        """
+        params = {"token": token}
+        response = await self._make_request("PUT", "/webhook", params=params, data=webhook_data)
+        return _webhook_result(response.data)
+
+    async def send_webhook_file(
+        self,
+        token: str,
+        file_path: Union[str, Path],
+        fields: Dict[str, Any] = None,
+        progress: ProgressCallback = None
+    ) -> Dict[str, Any]:
+        """
+        Send a file to a task as a base64 JSON webhook payload.
+
+        The payload is encoded while it is streamed from disk, with disk
+        reads kept off the event loop.
+
+        Args:
+            token: Task token
+            file_path: Path to the file to send
+            fields: Extra JSON fields to include alongside the file data
+            progress: Optional callback ``progress(filename, bytes_sent, file_size)``
+
+        Returns:
+            Webhook response data
+        """
+        params = {"token": token}
+        body = Base64JSONBody(file_path, fields=fields, progress=progress)
+        headers = {"Content-Type": "application/json"}
+        response = await self._make_request("PUT", "/webhook", params=params, data=body, headers=headers)
+        return _webhook_result(response.data)
+
+    async def upload_file_to_webhook(self, token: str, file_path: Union[str, Path],
+                                     content_type: str = None, timeout: int = 60,
+                                     use_mmap: bool = False) -> Dict[str, Any]:
+        """
+        Upload a file directly to a webhook endpoint for processing.
+
+        The file is streamed from disk in chunks, so memory use stays flat
+        regardless of file size.
+
+        Args:
+            token: Task token from execute_task()
+            file_path: Path to the file to upload
+            content_type: MIME type of the file (auto-detected if not provided)
+            timeout: Request timeout in seconds (default: 60)
+            use_mmap: Send the file as windows of a memory map instead of
+                    reading it on the default executor. Pages are faulted
+                    in on the event loop thread, so this suits files that
+                    are likely in the page cache.
+
+        Returns:
+            Webhook response data with processed results
+
+        Raises:
+            FileNotFoundError: If the specified file doesn't exist
+            DTCApiError: For API errors
+            NetworkError: For connection issues
+        """
+        file_path = Path(file_path)
+        if not file_path.exists():
+            raise FileNotFoundError(f"File not found: {file_path}")
+
+        # Auto-detect content type if not provided
+        if content_type is None:
+            content_type = _guess_content_type(file_path)
+
+        params = {
+            'type': 'cpu',
+            'apikey': self.api_key,
+            'token': token
+        }
+
+        # Prepare headers for direct file upload
+        headers = {
+            'Authorization': self.api_key,  # No Bearer prefix for webhook
+            'Content-Type': content_type,
+            'Content-Length': str(file_path.stat().st_size)
+        }
+
+        if use_mmap:
+            body = MappedFileBody(file_path)
+            content = lambda: _aiter_windows(body)
+        else:
+            content = lambda: _aiter_file(file_path)
+
+        try:
+            response = await self._send(
+                "PUT",
+                "/webhook",
+                params=params,
+                headers=headers,
+                content=content,
+                timeout=timeout
+            )
+            response.raise_for_status()
+            return _parse_webhook_body(response)
+
+        except httpx.TimeoutException:
+            raise NetworkError(f"File upload timed out after {timeout} seconds")
+        except httpx.TransportError as e:
+            raise NetworkError(f"Connection error during file upload: {str(e)}")
+        except httpx.HTTPStatusError as e:
+            raise DTCApiError(f"HTTP error during file upload: {str(e)}")
+        except httpx.HTTPError as e:
+            raise DTCApiError(f"Request failed during file upload: {str(e)}")
+
+    async def process_file(
+        self,
+        config: Union[PipelineConfig, CompiledPipeline, Dict[str, Any]],
+        file_path: Union[str, Path],
+        cache: ResultCache = None,
+        ready_timeout: float = 120,
+        timeout: int = 60,
+        use_mmap: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Process one file with a fresh webhook task.
+
+        Launches a task, waits until it accepts data, uploads the file and
+        cancels the task. With a cache, a file whose contents were already
+        processed by an equivalent configuration is answered from the cache
+        without creating a task; cache lookups run on the default executor.
+
+        Args:
+            config: Task configuration
+            file_path: File to process
+            cache: Optional ResultCache
+            ready_timeout: Maximum seconds to wait for the task to accept data
+            timeout: Upload timeout in seconds
+            use_mmap: Upload the file from a memory map
+
+        Returns:
+            Webhook response data, as returned by upload_file_to_webhook()
+        """
+        loop = asyncio.get_running_loop()
+        key = None
+        if cache is not None:
+            key = await loop.run_in_executor(None, cache.file_key, config, file_path)
+            result = await loop.run_in_executor(None, cache.get, key)
+            if result is not None:
+                return result
+        elif not Path(file_path).exists():
+            raise FileNotFoundError(f"File not found: {file_path}")
+
+        async with self.task(config, ready_timeout=ready_timeout) as token:
+            result = await self.upload_file_to_webhook(token, file_path, timeout=timeout, use_mmap=use_mmap)
+
+        if key is not None and _cacheable(result):
+            await loop.run_in_executor(None, cache.put, key, result)
+        return result
+
+    async def process_webhook(
+        self,
+        config: Union[PipelineConfig, CompiledPipeline, Dict[str, Any]],
+        webhook_data: Dict[str, Any],
+        cache: ResultCache = None,
+        ready_timeout: float = 120
+    ) -> Dict[str, Any]:
+        """
+        Send webhook data to a fresh task, answering from a cache if possible.
+
+        Like process_file(), keyed on the data's canonical JSON.
+
+        Args:
+            config: Task configuration
+            webhook_data: Data to send via webhook
+            cache: Optional ResultCache
+            ready_timeout: Maximum seconds to wait for the task to accept data
+
+        Returns:
+            Webhook response data, as returned by send_webhook()
+        """
+        loop = asyncio.get_running_loop()
+        key = None
+        if cache is not None:
+            key = cache.data_key(config, webhook_data)
+            result = await loop.run_in_executor(None, cache.get, key)
+            if result is not None:
+                return result
+
+        async with self.task(config, ready_timeout=ready_timeout) as token:
+            result = await self.send_webhook(token, webhook_data)
+
+        if key is not None and _cacheable(result):
+            await loop.run_in_executor(None, cache.put, key, result)
+        return result
+
+    async def process_directory(
+        self,
+        config: Union[PipelineConfig, CompiledPipeline, Dict[str, Any]],
+        directory: Union[str, Path],
+        extensions: List[str] = None,
+        min_size: int = 0,
+        max_size: int = None,
+        recursive: bool = True,
+        max_workers: int = 8,
+        sink: ResultSink = None,
+        cache: ResultCache = None,
+        parse: Callable[[Dict[str, Any]], Any] = None,
+        ready_timeout: float = 120,
+        timeout: int = 60,
+        use_mmap: bool = False
+    ) -> BatchStats:
+        """
+        Process every matching file under a directory concurrently.
+
+        Up to ``max_workers`` worker coroutines each launch one webhook task
+        when they first need it and keep uploading to it; a task is replaced
+        only after an API error, and all are cancelled at the end. The
+        directory is scanned lazily on the default executor.
+
+        Args:
+            config: Task configuration applied to every file
+            directory: Directory to scan
+            extensions: Only process files with these suffixes
+            min_size: Skip files smaller than this many bytes
+            max_size: Skip files larger than this many bytes
+            recursive: Descend into subdirectories
+            max_workers: Maximum files processed concurrently
+            sink: Optional callable receiving each BatchResult
+            cache: Optional ResultCache consulted before each upload
+            parse: Optional function applied to each webhook response; its
+                    return value becomes the result
+            ready_timeout: Maximum seconds for a new task to accept data
+            timeout: Upload timeout in seconds
+            use_mmap: Upload files from memory maps
+
+        Returns:
+            BatchStats with counts and throughput
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        loop = asyncio.get_running_loop()
+        files: Iterator[Path] = scan_files(
+            directory, extensions=extensions, min_size=min_size, max_size=max_size, recursive=recursive
+        )
+        scanning = asyncio.Lock()
+        stats = BatchStats()
+        started = time.monotonic()
+
+        async def next_file() -> Optional[Path]:
+            # One scan step at a time; generators cannot be advanced concurrently
+            async with scanning:
+                return await loop.run_in_executor(None, next, files, None)
+
+        async def worker() -> None:
+            token: List[Optional[str]] = [None]
+            try:
+                while True:
+                    path = await next_file()
+                    if path is None:
+                        return
+                    result = await self._process_batch_file(
+                        config, path, token, cache, parse, ready_timeout, timeout, use_mmap
+                    )
+                    stats.files += 1
+                    stats.bytes += result.size
+                    stats.succeeded += result.ok
+                    stats.failed += not result.ok
+                    stats.cached += result.cached
+                    stats.elapsed = time.monotonic() - started
+                    if sink is not None:
+                        sink(result)
+            finally:
+                if token[0] is not None:
+                    await self._cancel_quietly(token[0])
+
+        await asyncio.gather(*(worker() for _ in range(max_workers)))
+        stats.elapsed = time.monotonic() - started
+        return stats
+
+    async def _process_batch_file(
+        self,
+        config: Union[PipelineConfig, CompiledPipeline, Dict[str, Any]],
+        path: Path,
+        token: List[Optional[str]],
+        cache: Optional[ResultCache],
+        parse: Optional[Callable[[Dict[str, Any]], Any]],
+        ready_timeout: float,
+        timeout: int,
+        use_mmap: bool
+    ) -> BatchResult:
+        """Process one file of process_directory() on the worker's task, held in ``token[0]``."""
+        loop = asyncio.get_running_loop()
+        started = time.monotonic()
+        size = 0
+        try:
+            size = path.stat().st_size
+            key = None
+            if cache is not None:
+                key = await loop.run_in_executor(None, cache.file_key, config, path)
+                cached = await loop.run_in_executor(None, cache.get, key)
+                if cached is not None:
+                    result = parse(cached) if parse else cached
+                    return BatchResult(path, size, time.monotonic() - started, result, cached=True)
+            if token[0] is None:
+                new_token = await self.execute_task(config)
+                try:
+                    await self.wait_until_ready(new_token, deadline=ready_timeout)
+                except BaseException:
+                    await self._cancel_quietly(new_token)
+                    raise
+                token[0] = new_token
+            try:
+                response = await self.upload_file_to_webhook(token[0], path, timeout=timeout, use_mmap=use_mmap)
+            except DTCApiError:
+                # The task may be gone; let the next file start a fresh one
+                await self._cancel_quietly(token[0])
+                token[0] = None
+                raise
+            if isinstance(response, dict) and response.get("status") == "Error":
+                message = _error_message(response.get("error")) or "Webhook returned an error"
+                return BatchResult(path, size, time.monotonic() - started, response, error=message)
+            if key is not None:
+                await loop.run_in_executor(None, cache.put, key, response)
+            return BatchResult(path, size, time.monotonic() - started, parse(response) if parse else response)
+        except (DTCApiError, OSError, TimeoutError) as e:
+            return BatchResult(path, size, time.monotonic() - started, error=f"{type(e).__name__}: {e}")
+        except Exception as e:
+            # One bad file (or a parse function bug) must not abort the run
+            logger.exception("Unexpected error processing %s", path)
+            return BatchResult(path, size, time.monotonic() - started, error=f"{type(e).__name__}: {e}")
+
+    def get_chat_url(self, token: str, pipeline_type: str, api_key: str = None) -> str:
+        """
+        Get chat interface URL with session parameters.
+
+        Args:
+            token: Task token
+            pipeline_type: Type of pipeline
+            api_key: API key (uses client's key if not provided)
+
+        Returns:
+            Chat URL with session parameters
+        """
+        return _interface_url(self.base_url, "/chat", token, pipeline_type, api_key or self.api_key)
+
+    def get_dropper_url(self, token: str, pipeline_type: str, api_key: str = None) -> str:
+        """
+        Get dropper interface URL with session parameters.
+
+        Args:
+            token: Task token
+            pipeline_type: Type of pipeline
+            api_key: API key (uses client's key if not provided)
+
+        Returns:
+            Dropper URL with session parameters
+        """
+        return _interface_url(self.base_url, "/dropper", token, pipeline_type, api_key or self.api_key)
+
+    # Service Management Methods
+
+    async def get_services(self, service_name: str = None) -> List[ServiceInfo]:
+        """
+        Get available services.
+
+        Args:
+            service_name: Optional specific service name to filter
+
+        Returns:
+            List of ServiceInfo objects
+        """
+        params = {"service": service_name} if service_name else {}
+        response = await self._make_request("GET", "/services", params=params)
+        return _services_from_data(response.data)
+
+
+@contextlib.asynccontextmanager
+async def _null_slot() -> AsyncIterator[None]:
+    yield None
+
+
+def _content_units(content: Any, headers: Dict[str, str] = None) -> float:
+    """Work units of a request body; streamed bodies are sized by Content-Length."""
+    length = (headers or {}).get("Content-Length")
+    if length is not None:
+        return max(1.0, int(length) / UNIT_BYTES)
+    return body_units(None if callable(content) else content)
+
+
+async def _aiter_windows(body: MappedFileBody) -> AsyncIterator[memoryview]:
+    """Yield the memory-map windows of a MappedFileBody."""
+    for window in body:
+        yield window
+
+
+async def _aiter_file(file_path: Path, chunk_size: int = 1024 * 1024) -> AsyncIterator[bytes]:
+    """Read a file in chunks on the default executor so the event loop never blocks on disk."""
+    loop = asyncio.get_running_loop()
+    with open(file_path, 'rb') as file:
+        while True:
+            chunk = await loop.run_in_executor(None, file.read, chunk_size)
+            if not chunk:
+                break
+            yield chunk
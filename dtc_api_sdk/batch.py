@@ -0,0 +1,514 @@
+"""
+Batch processing for the DTC API SDK.
+
+Scans directory trees and pushes the files through webhook tasks on a
+bounded worker pool. Each worker keeps its task warm and reuses it for
+file after file, results stream to a sink as they complete, and throughput
+is reported for the run. With a JobJournal the run can be resumed after a
+crash.
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from pathlib import Path
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import TYPE_CHECKING, Any, Callable, Dict, IO, Iterable, Iterator, List, Optional, Sequence, Union
+
+from .models import PipelineConfig, CompiledPipeline
+from .cache import ResultCache
+from .concurrency import ConcurrencyLimiter, UNIT_BYTES
+from .journal import FileState, JobJournal
+from .exceptions import DTCApiError
+
+if TYPE_CHECKING:  # pragma: no cover - the client imports this module
+    from .client import DTCApiClient
+    from .task_pool import TaskPool
+
+logger = logging.getLogger(__name__)
+
+# Called with every BatchResult as it completes
+ResultSink = Callable[["BatchResult"], None]
+
+
+def scan_files(
+    root: Union[str, Path],
+    extensions: Sequence[str] = None,
+    min_size: int = 0,
+    max_size: int = None,
+    recursive: bool = True,
+    follow_symlinks: bool = False
+) -> Iterator[Path]:
+    """
+    Yield the regular files under a directory.
+
+    Uses ``os.scandir`` so file types and sizes come from the directory
+    listing without a separate ``stat`` per file on most platforms.
+
+    Args:
+        root: Directory to scan
+        extensions: Only yield files with these suffixes (case-insensitive,
+                with or without the leading dot)
+        min_size: Skip files smaller than this many bytes
+        max_size: Skip files larger than this many bytes
+        recursive: Descend into subdirectories
+        follow_symlinks: Follow symbolic links to files and directories
+    """
+    suffixes = None
+    if extensions:
+        suffixes = {ext.lower() if ext.startswith(".") else f".{ext.lower()}" for ext in extensions}
+
+    pending = [os.fspath(root)]
+    while pending:
+        try:
+            entries = os.scandir(pending.pop())
+        except OSError as e:
+            logger.warning("Cannot scan %s: %s", e.filename, e)
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=follow_symlinks):
+                        if recursive:
+                            pending.append(entry.path)
+                        continue
+                    if not entry.is_file(follow_symlinks=follow_symlinks):
+                        continue
+                    if suffixes is not None and os.path.splitext(entry.name)[1].lower() not in suffixes:
+                        continue
+                    size = entry.stat(follow_symlinks=follow_symlinks).st_size
+                except OSError:
+                    continue
+                if size < min_size or (max_size is not None and size > max_size):
+                    continue
+                yield Path(entry.path)
+
+
+def _error_message(error: Any) -> Optional[str]:
+    """Message of a webhook ``error`` field, which may be a dict or a plain value."""
+    if not error:
+        return None
+    if isinstance(error, dict):
+        return error.get("message") or str(error)
+    return str(error)
+
+
+@dataclass
+class BatchResult:
+    """Outcome of processing one file."""
+    path: Path
+    size: int
+    seconds: float
+    result: Any = None
+    error: Optional[str] = None
+    cached: bool = False
+
+    @property
+    def ok(self) -> bool:
+        """True if the file was processed without error."""
+        return self.error is None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form, as written by JsonLinesSink."""
+        return {
+            "path": str(self.path),
+            "size": self.size,
+            "seconds": round(self.seconds, 6),
+            "cached": self.cached,
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+@dataclass
+class BatchStats:
+    """Progress and throughput of a batch run."""
+    files: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    cached: int = 0
+    skipped: int = 0  # Already done according to the journal
+    bytes: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def files_per_second(self) -> float:
+        """Files completed per second of wall-clock time."""
+        return self.files / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        """Bytes of input completed per second of wall-clock time."""
+        return self.bytes / self.elapsed if self.elapsed else 0.0
+
+
+class JsonLinesSink:
+    """
+    Result sink writing one JSON object per line.
+
+    Example:
+        >>> with JsonLinesSink("results.jsonl") as sink:
+        ...     runner.run(scan_files("documents/"), sink=sink)
+    """
+
+    def __init__(self, target: Union[str, Path, IO[str]]):
+        """
+        Initialize the sink.
+
+        Args:
+            target: File path to write (truncated) or an open text stream
+        """
+        self._owned = not hasattr(target, "write")
+        self._stream = open(target, "w", encoding="utf-8") if self._owned else target
+        self._lock = threading.Lock()
+
+    def __call__(self, result: BatchResult) -> None:
+        line = json.dumps(result.to_dict(), ensure_ascii=False, default=str)
+        with self._lock:
+            self._stream.write(line + "\n")
+            self._stream.flush()
+
+    def __enter__(self) -> "JsonLinesSink":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the output file if the sink opened it."""
+        if self._owned:
+            self._stream.close()
+
+
+class BatchRunner:
+    """
+    Processes many files through one pipeline configuration in parallel.
+
+    Up to ``max_workers`` files are in flight. Each worker launches (or
+    leases from a TaskPool) a webhook task the first time it needs one and
+    keeps uploading to it; a task is only replaced after an API error. All
+    tasks are cancelled when the run ends. Uploads hold a slot of a
+    ConcurrencyLimiter, so the number actually in flight adapts below
+    ``max_workers`` as server latency changes; the client's limiter is used
+    if it has one, otherwise the runner creates its own.
+
+    With a ``journal`` every file's progress and every launched task is
+    recorded durably. Running the same files again with the same journal
+    skips finished files, retries the ones a crash interrupted, reuses
+    tasks the crashed run left ready and cancels its other tasks.
+
+    Example:
+        >>> runner = BatchRunner(client, pipeline_config, max_workers=16)
+        >>> stats = runner.run(scan_files("documents/", extensions=[".pdf"]), sink=print)
+        >>> print(f"{stats.files_per_second:.1f} files/s")
+    """
+
+    def __init__(
+        self,
+        client: "DTCApiClient",
+        config: Union[PipelineConfig, CompiledPipeline, Dict[str, Any]],
+        max_workers: int = 8,
+        cache: ResultCache = None,
+        task_pool: "TaskPool" = None,
+        parse: Callable[[Dict[str, Any]], Any] = None,
+        ready_timeout: float = 120,
+        timeout: int = 60,
+        use_mmap: bool = False,
+        name_prefix: str = "batch",
+        journal: JobJournal = None,
+        retry_failed: bool = True,
+        concurrency_limiter: ConcurrencyLimiter = None
+    ):
+        """
+        Initialize the runner.
+
+        Args:
+            client: Client used to launch tasks and upload files
+            config: Task configuration applied to every file
+            max_workers: Maximum files processed concurrently
+            cache: Optional ResultCache consulted before each upload
+            task_pool: Optional TaskPool to lease warm tasks from
+            parse: Optional function applied to each webhook response in the
+                    worker thread; its return value becomes the result
+            ready_timeout: Maximum seconds for a new task to accept data
+            timeout: Upload timeout in seconds
+            use_mmap: Upload files from memory maps
+            name_prefix: Prefix for the names of launched tasks
+            journal: Optional JobJournal recording progress for resumption
+            retry_failed: When resuming, process files that failed before
+                    again instead of skipping them
+            concurrency_limiter: Adaptive bound on concurrent uploads;
+                    defaults to the client's limiter, or a new one capped
+                    at ``max_workers``
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+
+        self.client = client
+        self.config = config
+        self.max_workers = max_workers
+        self.cache = cache
+        self.task_pool = task_pool
+        self.parse = parse
+        self.ready_timeout = ready_timeout
+        self.timeout = timeout
+        self.use_mmap = use_mmap
+        self.name_prefix = name_prefix
+        self.journal = journal
+        self.retry_failed = retry_failed
+        client_limiter = getattr(client, "concurrency_limiter", None)
+        self.concurrency_limiter = (
+            concurrency_limiter or client_limiter
+            or ConcurrencyLimiter(initial_limit=max_workers, max_limit=max_workers)
+        )
+        # The client already holds a slot around each of its uploads
+        self._gate_uploads = self.concurrency_limiter is not client_limiter
+
+        self._lock = threading.Lock()
+        self._idle: List[str] = []
+        self._tasks: List[str] = []
+        self._stats = BatchStats()
+        self._started: Optional[float] = None
+
+    def run(self, files: Iterable[Union[str, Path]], sink: ResultSink = None) -> BatchStats:
+        """
+        Process files, passing each result to ``sink`` as it completes.
+
+        Args:
+            files: Files to process, e.g. from scan_files()
+            sink: Optional callable receiving every BatchResult
+
+        Returns:
+            Final BatchStats
+        """
+        for result in self.iter_results(files):
+            if sink is not None:
+                sink(result)
+        return self.stats()
+
+    def iter_results(self, files: Iterable[Union[str, Path]]) -> Iterator[BatchResult]:
+        """
+        Process files, yielding results in completion order.
+
+        ``files`` is consumed lazily, so only a bounded number of paths is
+        queued at any time even for very large directory trees.
+        """
+        started = time.monotonic()
+        self._stats = BatchStats()
+        pending = set()
+        try:
+            if self.journal is not None:
+                self._recover()
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="dtc-batch") as pool:
+                try:
+                    for path in files:
+                        if self.journal is not None and not self.journal.enqueue(path, retry_failed=self.retry_failed):
+                            with self._lock:
+                                self._stats.skipped += 1
+                            continue
+                        pending.add(pool.submit(self._process, Path(path)))
+                        if len(pending) >= 2 * self.max_workers:
+                            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                            for future in done:
+                                yield self._record(future.result(), started)
+                    while pending:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            yield self._record(future.result(), started)
+                finally:
+                    # Stopped early: drop queued files instead of processing them
+                    for future in pending:
+                        future.cancel()
+        finally:
+            self._release_tasks()
+
+    def process(self, path: Union[str, Path]) -> BatchResult:
+        """
+        Process one file on the calling thread.
+
+        For long-lived callers such as the ``dtc-cli`` daemon: the file uses
+        (and returns) one of the runner's warm tasks, and statistics
+        accumulate across calls. Call close() to cancel the tasks.
+        """
+        with self._lock:
+            if self._started is None:
+                self._started = time.monotonic()
+        return self._record(self._process(Path(path)), self._started)
+
+    def warm(self, count: int = None) -> int:
+        """
+        Start tasks ahead of the first file so it skips engine start-up.
+
+        Tasks are launched concurrently and kept idle for later files.
+
+        Args:
+            count: Idle tasks to have ready; defaults to ``max_workers``
+
+        Returns:
+            Number of idle tasks now ready
+        """
+        count = self.max_workers if count is None else count
+        with self._lock:
+            missing = count - len(self._idle)
+        if missing > 0:
+            with ThreadPoolExecutor(max_workers=missing, thread_name_prefix="dtc-warm") as pool:
+                futures = [pool.submit(self._launch) for _ in range(missing)]
+            for future in futures:
+                try:
+                    self._checkin(future.result())
+                except (DTCApiError, TimeoutError) as e:
+                    logger.warning("Failed to warm a task: %s", e)
+        with self._lock:
+            return len(self._idle)
+
+    def close(self) -> None:
+        """Cancel the tasks kept by process() and warm()."""
+        self._release_tasks()
+
+    def stats(self) -> BatchStats:
+        """Return a snapshot of the run's statistics."""
+        with self._lock:
+            return BatchStats(**vars(self._stats))
+
+    def _record(self, result: BatchResult, started: float) -> BatchResult:
+        with self._lock:
+            stats = self._stats
+            stats.files += 1
+            stats.bytes += result.size
+            if result.ok:
+                stats.succeeded += 1
+            else:
+                stats.failed += 1
+            if result.cached:
+                stats.cached += 1
+            stats.elapsed = time.monotonic() - started
+        return result
+
+    def _process(self, path: Path) -> BatchResult:
+        result = self._run_file(path)
+        if self.journal is not None:
+            if result.ok:
+                self.journal.mark(path, FileState.DONE, result=result.result)
+            else:
+                self.journal.mark(path, FileState.FAILED, error=result.error)
+        return result
+
+    def _run_file(self, path: Path) -> BatchResult:
+        started = time.monotonic()
+        size = 0
+        try:
+            size = path.stat().st_size
+            key = None
+            if self.cache is not None:
+                key = self.cache.file_key(self.config, path)
+                cached = self.cache.get(key)
+                if cached is not None:
+                    return BatchResult(path, size, time.monotonic() - started, self._parse(cached), cached=True)
+
+            token = self._checkout()
+            if self.journal is not None:
+                self.journal.mark(path, FileState.TASK_CREATED, token=token)
+            try:
+                response = self._upload(token, path, size)
+            except DTCApiError:
+                # The task may be gone; let the next file start a fresh one
+                self._discard(token)
+                raise
+            except BaseException:
+                # A local failure (e.g. the file vanished) leaves the task usable
+                self._checkin(token)
+                raise
+            self._checkin(token)
+            if self.journal is not None:
+                self.journal.mark(path, FileState.UPLOADED)
+
+            if isinstance(response, dict) and response.get("status") == "Error":
+                message = _error_message(response.get("error")) or "Webhook returned an error"
+                return BatchResult(path, size, time.monotonic() - started, response, error=message)
+            if key is not None:
+                self.cache.put(key, response)
+            return BatchResult(path, size, time.monotonic() - started, self._parse(response))
+        except (DTCApiError, OSError, TimeoutError) as e:
+            return BatchResult(path, size, time.monotonic() - started, error=f"{type(e).__name__}: {e}")
+        except Exception as e:
+            # One bad file (or a parse function bug) must not abort the run
+            logger.exception("Unexpected error processing %s", path)
+            return BatchResult(path, size, time.monotonic() - started, error=f"{type(e).__name__}: {e}")
+
+    def _parse(self, response: Dict[str, Any]) -> Any:
+        return self.parse(response) if self.parse is not None else response
+
+    # Warm task management
+
+    def _upload(self, token: str, path: Path, size: int) -> Dict[str, Any]:
+        if not self._gate_uploads:
+            return self.client.upload_file_to_webhook(token, path, timeout=self.timeout, use_mmap=self.use_mmap)
+        with self.concurrency_limiter.slot(max(1.0, size / UNIT_BYTES)):
+            return self.client.upload_file_to_webhook(token, path, timeout=self.timeout, use_mmap=self.use_mmap)
+
+    def _checkout(self) -> str:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return self._launch()
+
+    def _launch(self) -> str:
+        if self.task_pool is not None:
+            token = self.task_pool.lease(self.config).token
+        else:
+            token = self.client.execute_task(
+                self.config, name=f"{self.name_prefix}_{int(time.time() * 1000)}"
+            )
+            try:
+                self.client.wait_until_ready(token, deadline=self.ready_timeout)
+            except BaseException:
+                self.client._cancel_quietly(token)
+                raise
+        if self.journal is not None:
+            self.journal.task_started(token)
+        with self._lock:
+            self._tasks.append(token)
+        return token
+
+    def _checkin(self, token: str) -> None:
+        with self._lock:
+            self._idle.append(token)
+
+    def _discard(self, token: str) -> None:
+        with self._lock:
+            if token in self._tasks:
+                self._tasks.remove(token)
+        self._cancel(token)
+
+    def _release_tasks(self) -> None:
+        with self._lock:
+            tokens, self._tasks, self._idle = self._tasks, [], []
+        for token in tokens:
+            self._cancel(token)
+
+    def _cancel(self, token: str) -> None:
+        self.client._cancel_quietly(token)
+        if self.journal is not None:
+            self.journal.task_finished(token)
+
+    def _recover(self) -> None:
+        """Reclaim or cancel the tasks an interrupted run left open."""
+        from .client import is_task_ready  # The client imports this module
+
+        for token in self.journal.recover():
+            try:
+                ready = is_task_ready(self.client._get_task_data(token))
+            except DTCApiError:
+                ready = False
+            with self._lock:
+                reclaim = ready and len(self._tasks) < self.max_workers
+                if reclaim:
+                    self._tasks.append(token)
+                    self._idle.append(token)
+            if reclaim:
+                logger.info("Reclaimed task %s from an interrupted run", token)
+            else:
+                self._cancel(token)
@@ -0,0 +1,252 @@
+"""
+Result caching for the DTC API SDK.
+
+Stores webhook results in a SQLite database keyed by the SHA-256 of the
+document contents plus the hash of the canonical pipeline configuration, so
+byte-identical documents sent through the same pipeline are processed once.
+Files are hashed in streamed chunks, optionally on a thread pool; hashlib
+releases the GIL while hashing large buffers.
+"""
+
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Optional, Union
+
+from .models import PipelineConfig, CompiledPipeline
+from .pipeline import config_hash
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_digest(file_path: Union[str, Path], chunk_size: int = HASH_CHUNK_SIZE) -> str:
+    """
+    SHA-256 of a file's contents, read in chunks into one reused buffer.
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+    """
+    digest = hashlib.sha256()
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    with open(file_path, "rb", buffering=0) as f:
+        while True:
+            read = f.readinto(buffer)
+            if not read:
+                break
+            digest.update(view[:read])
+    return digest.hexdigest()
+
+
+def digest_files(file_paths: Iterable[Union[str, Path]], max_workers: int = None) -> Dict[Path, str]:
+    """
+    Hash several files concurrently.
+
+    Args:
+        file_paths: Files to hash
+        max_workers: Hashing threads; defaults to the executor's default
+
+    Returns:
+        Mapping of each path to its SHA-256
+    """
+    paths = [Path(path) for path in file_paths]
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dtc-hash") as pool:
+        return dict(zip(paths, pool.map(file_digest, paths)))
+
+
+def data_digest(data: Any) -> str:
+    """SHA-256 of JSON webhook data, independent of key order."""
+    encoded = json.dumps(data, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+@dataclass
+class ResultCacheStats:
+    """Result cache statistics."""
+    entries: int
+    size_bytes: int
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+class ResultCache:
+    """
+    On-disk cache of webhook results.
+
+    Entries are evicted least recently used first once the stored results
+    exceed ``max_bytes`` or ``max_entries``. The database is opened in WAL
+    mode and may be shared by several threads and processes.
+
+    Example:
+        >>> with ResultCache("results.db") as cache:
+        ...     result = client.process_file(pipeline_config, "document.pdf", cache=cache)
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path] = "dtc_results.db",
+        max_bytes: int = 256 * 1024 * 1024,
+        max_entries: int = None
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            path: SQLite database file; ":memory:" keeps the cache in memory
+            max_bytes: Maximum total size of stored results
+            max_entries: Optional maximum number of stored results
+        """
+        self.path = str(path)
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, result TEXT NOT NULL, size INTEGER NOT NULL, "
+            "created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)")
+        self._create_totals()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __enter__(self) -> "ResultCache":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    @staticmethod
+    def key(config: Union[PipelineConfig, CompiledPipeline, Dict[str, Any]], content_digest: str) -> str:
+        """Cache key for a document digest processed by a configuration."""
+        return f"{config_hash(config)}:{content_digest}"
+
+    def file_key(self, config: Union[PipelineConfig, CompiledPipeline, Dict[str, Any]], file_path: Union[str, Path]) -> str:
+        """Cache key for a file processed by a configuration."""
+        return self.key(config, file_digest(file_path))
+
+    def data_key(self, config: Union[PipelineConfig, CompiledPipeline, Dict[str, Any]], webhook_data: Any) -> str:
+        """Cache key for webhook data processed by a configuration."""
+        return self.key(config, data_digest(webhook_data))
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a stored result and mark it recently used, or None."""
+        with self._lock:
+            row = self._connection.execute("SELECT result FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self._misses += 1
+                return None
+            self._connection.execute("UPDATE results SET accessed = ? WHERE key = ?", (time.time(), key))
+            self._hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        """Store a result, evicting least recently used entries if over the limits."""
+        encoded = json.dumps(result, separators=(",", ":"))
+        size = len(encoded.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            connection = self._connection
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                # An upsert rather than REPLACE, whose implicit delete skips the totals triggers
+                connection.execute(
+                    "INSERT INTO results (key, result, size, created, accessed) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (key) DO UPDATE SET result = excluded.result, size = excluded.size, "
+                    "created = excluded.created, accessed = excluded.accessed",
+                    (key, encoded, size, now, now)
+                )
+                self._evict()
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+
+    def delete(self, key: str) -> bool:
+        """Remove a stored result; returns True if one existed."""
+        with self._lock:
+            return self._connection.execute("DELETE FROM results WHERE key = ?", (key,)).rowcount > 0
+
+    def clear(self) -> None:
+        """Remove every stored result."""
+        with self._lock:
+            self._connection.execute("DELETE FROM results")
+
+    def stats(self) -> ResultCacheStats:
+        """Return a snapshot of the cache statistics."""
+        with self._lock:
+            entries, size = self._totals()
+            return ResultCacheStats(
+                entries=entries,
+                size_bytes=size,
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions
+            )
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._connection.close()
+
+    def _create_totals(self) -> None:
+        # Entry count and total size kept in one row by triggers, so puts never scan the table
+        connection = self._connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS results_totals ("
+                "id INTEGER PRIMARY KEY CHECK (id = 1), entries INTEGER NOT NULL, size INTEGER NOT NULL)"
+            )
+            connection.execute(
+                "INSERT OR IGNORE INTO results_totals (id, entries, size) "
+                "SELECT 1, COUNT(*), COALESCE(SUM(size), 0) FROM results"
+            )
+            connection.execute(
+                "CREATE TRIGGER IF NOT EXISTS results_totals_insert AFTER INSERT ON results BEGIN "
+                "UPDATE results_totals SET entries = entries + 1, size = size + new.size WHERE id = 1; END"
+            )
+            connection.execute(
+                "CREATE TRIGGER IF NOT EXISTS results_totals_delete AFTER DELETE ON results BEGIN "
+                "UPDATE results_totals SET entries = entries - 1, size = size - old.size WHERE id = 1; END"
+            )
+            connection.execute(
+                "CREATE TRIGGER IF NOT EXISTS results_totals_update AFTER UPDATE OF size ON results BEGIN "
+                "UPDATE results_totals SET size = size - old.size + new.size WHERE id = 1; END"
+            )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def _totals(self) -> tuple:
+        return self._connection.execute("SELECT entries, size FROM results_totals WHERE id = 1").fetchone()
+
+    def _evict(self) -> None:
+        entries, size = self._totals()
+        excess_bytes = size - self.max_bytes
+        excess_entries = entries - self.max_entries if self.max_entries is not None else 0
+        if excess_bytes <= 0 and excess_entries <= 0:
+            return
+        # Drop the least recently used rows until both limits hold, in one statement
+        self._evictions += self._connection.execute(
+            "DELETE FROM results WHERE key IN ("
+            "SELECT key FROM ("
+            "SELECT key, size, SUM(size) OVER lru AS freed, ROW_NUMBER() OVER lru AS n "
+            "FROM results WINDOW lru AS (ORDER BY accessed, rowid)"
+            ") WHERE freed - size < ? OR n <= ?)",
+            (excess_bytes, excess_entries)
+        ).rowcount
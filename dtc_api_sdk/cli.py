@@ -0,0 +1,348 @@
+"""
+Command-line interface for the DTC API SDK, installed as ``dtc-cli``.
+
+    dtc-cli process -c pipeline.json -j 16 -o results.jsonl documents/ "scans/**/*.pdf"
+
+    dtc-cli daemon -c pipeline.json -j 8 --warm 4 &
+    dtc-cli submit document.pdf
+
+Only the standard library is imported at startup; the SDK modules (and
+requests, sqlite3) are loaded by the subcommand that needs them, so
+``dtc-cli --help`` and argument errors return immediately.
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+import signal
+import argparse
+import threading
+import contextlib
+from pathlib import Path
+from typing import IO, Any, Iterable, Iterator, List, Optional, Sequence
+
+from . import __version__
+
+GLOB_CHARS = "*?["
+PROGRESS_INTERVAL = 0.5
+
+
+def expand_inputs(
+    inputs: Iterable[str],
+    extensions: Sequence[str] = None,
+    min_size: int = 0,
+    max_size: int = None,
+    recursive: bool = True
+) -> Iterator[Path]:
+    """
+    Yield the files named by command-line inputs, each once.
+
+    Directories (given directly or matched by a glob) are scanned with
+    ``scan_files`` and the extension and size filters; glob patterns
+    support ``**``; anything else is taken as a file path as given.
+    """
+    seen = set()
+    for item in inputs:
+        if any(char in item for char in GLOB_CHARS):
+            matches: Iterable[Any] = glob.iglob(item, recursive=True)
+        else:
+            matches = (item,)
+        for match in matches:
+            if os.path.isdir(match):
+                from .batch import scan_files
+
+                paths: Iterable[Path] = scan_files(
+                    match, extensions=extensions, min_size=min_size, max_size=max_size, recursive=recursive
+                )
+            else:
+                paths = (Path(match),)
+            for path in paths:
+                if path not in seen:
+                    seen.add(path)
+                    yield path
+
+
+class Progress:
+    """Single-line live throughput display on a terminal stream."""
+
+    def __init__(self, stream: IO[str], live: bool, interval: float = PROGRESS_INTERVAL):
+        self.stream = stream
+        self.live = live
+        self.interval = interval
+        self._shown = 0.0
+        self._width = 0
+
+    def update(self, stats: Any) -> None:
+        """Redraw the line if ``interval`` has passed since the last redraw."""
+        now = time.monotonic()
+        if self.live and now - self._shown >= self.interval:
+            self._shown = now
+            self._draw(stats, end="")
+
+    def finish(self, stats: Any) -> None:
+        """Print the final summary line."""
+        self._draw(stats, end="\n")
+
+    def _draw(self, stats: Any, end: str) -> None:
+        line = (
+            f"{stats.files} files, {stats.failed} failed, {stats.cached} cached, {stats.skipped} skipped"
+            f" | {stats.files_per_second:.1f} files/s, {stats.bytes_per_second / (1024 * 1024):.2f} MiB/s"
+        )
+        padding = " " * max(0, self._width - len(line))
+        self._width = len(line)
+        self.stream.write(("\r" if self.live else "") + line + padding + end)
+        self.stream.flush()
+
+
+def _client(args: argparse.Namespace) -> Any:
+    from .client import DTCApiClient
+    from .concurrency import ConcurrencyLimiter
+
+    # --jobs caps the workers; task launches and uploads adapt below it
+    limiter = ConcurrencyLimiter(initial_limit=args.jobs, max_limit=args.jobs)
+    kwargs = {"api_key": args.api_key, "concurrency_limiter": limiter}
+    if args.base_url:
+        kwargs["base_url"] = args.base_url
+    return DTCApiClient(**kwargs)
+
+
+def _extensions(values: Optional[List[str]]) -> Optional[List[str]]:
+    if not values:
+        return None
+    return [ext.strip() for value in values for ext in value.split(",") if ext.strip()]
+
+
+def cmd_process(args: argparse.Namespace) -> int:
+    """Process files in parallel, writing one JSON result per line."""
+    from .batch import BatchRunner, JsonLinesSink
+    from .cache import ResultCache
+    from .journal import JobJournal
+    from .pipeline import PipelineGraph
+
+    config = PipelineGraph.load(args.config).as_task().compile()
+    files = expand_inputs(
+        args.inputs,
+        extensions=_extensions(args.ext),
+        min_size=args.min_size,
+        max_size=args.max_size,
+        recursive=not args.no_recursive
+    )
+
+    with contextlib.ExitStack() as stack:
+        client = stack.enter_context(_client(args))
+        journal = stack.enter_context(JobJournal(args.resume)) if args.resume else None
+        cache = stack.enter_context(ResultCache(args.cache)) if args.cache else None
+        if args.output in (None, "-"):
+            stream = sys.stdout
+        else:
+            # A resumed run appends to the results of the runs before it
+            stream = stack.enter_context(open(args.output, "a" if journal else "w", encoding="utf-8"))
+        sink = JsonLinesSink(stream)
+
+        runner = BatchRunner(
+            client, config,
+            max_workers=args.jobs,
+            cache=cache,
+            journal=journal,
+            ready_timeout=args.ready_timeout,
+            timeout=args.timeout,
+            use_mmap=args.mmap
+        )
+        live = not args.quiet and (args.progress or sys.stderr.isatty())
+        progress = Progress(sys.stderr, live=live)
+
+        results = runner.iter_results(files)
+        stack.callback(results.close)
+        for result in results:
+            sink(result)
+            progress.update(runner.stats())
+
+        stats = runner.stats()
+        if not args.quiet:
+            progress.finish(stats)
+    return 1 if stats.failed else 0
+
+
+def cmd_daemon(args: argparse.Namespace) -> int:
+    """Serve jobs on a Unix socket with a warm client, tasks and cache."""
+    from .batch import BatchRunner
+    from .cache import ResultCache
+    from .daemon import DaemonError, DaemonServer
+    from .pipeline import PipelineGraph
+
+    config = PipelineGraph.load(args.config).as_task().compile()
+    with contextlib.ExitStack() as stack:
+        client = stack.enter_context(_client(args))
+        cache = stack.enter_context(ResultCache(args.cache)) if args.cache else None
+        runner = BatchRunner(
+            client, config,
+            max_workers=args.jobs,
+            cache=cache,
+            ready_timeout=args.ready_timeout,
+            timeout=args.timeout,
+            use_mmap=args.mmap,
+            name_prefix="daemon"
+        )
+        stack.callback(runner.close)
+        try:
+            server = stack.enter_context(DaemonServer(runner, args.socket))
+        except DaemonError as e:
+            print(f"dtc-cli: error: {e}", file=sys.stderr)
+            return 1
+        if args.warm:
+            ready = runner.warm(args.warm)
+            print(f"dtc-cli: {ready} warm tasks ready", file=sys.stderr)
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, lambda signum, frame: threading.Thread(target=server.shutdown).start())
+        print(f"dtc-cli: listening on {server.socket_path}", file=sys.stderr, flush=True)
+        server.serve_forever()
+    return 0
+
+
+def cmd_submit(args: argparse.Namespace) -> int:
+    """Send files to a running daemon and print its results as JSONL."""
+    from .daemon import DaemonClient, DaemonError
+
+    try:
+        if args.ping or args.stats or args.shutdown:
+            with DaemonClient(args.socket) as daemon:
+                if args.shutdown:
+                    daemon.shutdown()
+                else:
+                    print(json.dumps(daemon.stats() if args.stats else {"ok": daemon.ping()}))
+            return 0
+
+        files = expand_inputs(
+            args.inputs,
+            extensions=_extensions(args.ext),
+            min_size=args.min_size,
+            max_size=args.max_size,
+            recursive=not args.no_recursive
+        )
+        local = threading.local()
+        clients: List[Any] = []
+        lock = threading.Lock()
+
+        def submit(path: Path) -> dict:
+            daemon = getattr(local, "daemon", None)
+            if daemon is None:
+                daemon = local.daemon = DaemonClient(args.socket)
+                with lock:
+                    clients.append(daemon)
+            return daemon.process(path)
+
+        failed = 0
+        with contextlib.ExitStack() as stack:
+            stack.callback(lambda: [daemon.close() for daemon in clients])
+            if args.jobs > 1:
+                from concurrent.futures import ThreadPoolExecutor
+
+                pool = stack.enter_context(ThreadPoolExecutor(max_workers=args.jobs, thread_name_prefix="dtc-submit"))
+                responses: Iterable[dict] = pool.map(submit, files)
+            else:
+                responses = map(submit, files)
+            for response in responses:
+                failed += not response.get("ok")
+                response.pop("id", None)
+                sys.stdout.write(json.dumps(response, ensure_ascii=False) + "\n")
+                sys.stdout.flush()
+    except DaemonError as e:
+        print(f"dtc-cli: error: {e}", file=sys.stderr)
+        return 1
+    return 1 if failed else 0
+
+
+def _add_input_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("-e", "--ext", action="append", help="Only process these extensions in directories, e.g. -e pdf,docx")
+    parser.add_argument("--min-size", type=int, default=0, help="Skip files smaller than this many bytes")
+    parser.add_argument("--max-size", type=int, default=None, help="Skip files larger than this many bytes")
+    parser.add_argument("--no-recursive", action="store_true", help="Do not descend into subdirectories")
+
+
+def _add_task_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--cache", metavar="DB", help="Result cache database; identical files are uploaded once")
+    parser.add_argument("--timeout", type=int, default=60, help="Upload timeout in seconds (default: 60)")
+    parser.add_argument("--ready-timeout", type=float, default=120, help="Seconds to wait for a task to start (default: 120)")
+    parser.add_argument("--mmap", action="store_true", help="Upload files from memory maps")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the ``dtc-cli`` argument parser."""
+    parser = argparse.ArgumentParser(prog="dtc-cli", description="Aparavi Data Toolchain command-line client")
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    parser.add_argument("--api-key", default=None, help="API key (default: $DTC_API_KEY)")
+    parser.add_argument("--base-url", default=os.getenv("DTC_BASE_URL"), help="API base URL (default: $DTC_BASE_URL)")
+    subparsers = parser.add_subparsers(dest="command", metavar="command")
+    subparsers.required = True
+
+    process = subparsers.add_parser(
+        "process",
+        help="Process files through a pipeline in parallel",
+        description="Process files through a pipeline in parallel and write one JSON result per line."
+    )
+    process.add_argument("inputs", nargs="+", help="Files, directories or glob patterns (** recurses)")
+    process.add_argument("-c", "--config", required=True, help="Pipeline JSON file")
+    process.add_argument("-j", "--jobs", type=int, default=8, help="Maximum files processed concurrently; adapts to server load (default: 8)")
+    process.add_argument("-o", "--output", help="JSONL output file (default: stdout)")
+    _add_input_arguments(process)
+    process.add_argument("--resume", metavar="JOURNAL", help="Job journal; rerun with the same journal to resume")
+    _add_task_arguments(process)
+    process.add_argument("--progress", action="store_true", help="Show live throughput even when stderr is not a terminal")
+    process.add_argument("-q", "--quiet", action="store_true", help="No progress or summary on stderr")
+    process.set_defaults(func=cmd_process)
+
+    daemon = subparsers.add_parser(
+        "daemon",
+        help="Serve jobs on a Unix socket with warm connections and tasks",
+        description="Keep a client, warm webhook tasks and the result cache alive, and process "
+                    "files sent by 'dtc-cli submit' over a Unix domain socket. Runs in the foreground."
+    )
+    daemon.add_argument("-c", "--config", required=True, help="Pipeline JSON file")
+    daemon.add_argument("-j", "--jobs", type=int, default=8, help="Maximum files processed concurrently; adapts to server load (default: 8)")
+    daemon.add_argument("--warm", type=int, default=0, help="Tasks to start before accepting jobs")
+    daemon.add_argument("--socket", help="Socket path (default: $DTC_DAEMON_SOCKET or ~/.dtc_daemon.sock)")
+    _add_task_arguments(daemon)
+    daemon.set_defaults(func=cmd_daemon)
+
+    submit = subparsers.add_parser(
+        "submit",
+        help="Send files to a running daemon",
+        description="Send files to a running 'dtc-cli daemon' and print one JSON result per line."
+    )
+    submit.add_argument("inputs", nargs="*", help="Files, directories or glob patterns (** recurses)")
+    submit.add_argument("-j", "--jobs", type=int, default=1, help="Files in flight at once (default: 1)")
+    submit.add_argument("--socket", help="Socket path (default: $DTC_DAEMON_SOCKET or ~/.dtc_daemon.sock)")
+    _add_input_arguments(submit)
+    control = submit.add_mutually_exclusive_group()
+    control.add_argument("--ping", action="store_true", help="Check that the daemon is running")
+    control.add_argument("--stats", action="store_true", help="Print the daemon's throughput statistics")
+    control.add_argument("--shutdown", action="store_true", help="Stop the daemon")
+    submit.set_defaults(func=cmd_submit)
+    return parser
+
+
+def main(argv: Sequence[str] = None) -> int:
+    """Entry point of ``dtc-cli``; returns the process exit code."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if getattr(args, "jobs", 1) < 1:
+        parser.error("--jobs must be at least 1")
+    if args.command == "submit" and not (args.inputs or args.ping or args.stats or args.shutdown):
+        parser.error("submit needs files or one of --ping, --stats, --shutdown")
+
+    from .exceptions import DTCApiError
+
+    try:
+        return args.func(args)
+    except KeyboardInterrupt:
+        print("\ndtc-cli: interrupted", file=sys.stderr)
+        return 130
+    except (DTCApiError, OSError, ValueError) as e:
+        print(f"dtc-cli: error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,18 +4,33 @@ Main API client for the Aparavi Data Toolchain API.
 
 import os
 import json
-import mimetypes
-from typing import Dict, Any, Optional, List, Union
+import time
+import logging
+import contextlib
+import dataclasses
+from typing import Dict, Any, Optional, List, Union, Iterable, Iterator
 from pathlib import Path
 import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+from urllib3.exceptions import NewConnectionError
 
+from .transport import DATA_PLANE_ENDPOINTS, TransportProfile, PoolStats, build_session
+from .streaming import MultipartEncoder, Base64JSONBody, MappedFileBody, ProgressCallback, _guess_content_type
+from .retry import RetryPolicy, RetryEngine, RetryStats, ReplayableBody, parse_retry_after
+from .ratelimit import RateLimiter
+from .concurrency import ConcurrencyLimiter, CONCURRENCY_LIMITED_ENDPOINTS, body_units
+from .pipeline import _config_to_dict, config_hash, validate_config
+from .cache import ResultCache
+from .batch import BatchRunner, BatchStats, ResultSink, scan_files
+from .reaper import TASK, PIPELINE, Reaper, TokenRegistry
+from .tokens import TokenStore
+from .polling import TaskPoller, PollPolicy, PollTracker, PollMetrics, PollStats, TERMINAL_STATUSES
 from .models import (
     APIResponse, 
     PipelineConfig, 
+    CompiledPipeline,
     PipelineInfo, 
     TaskInfo, 
+    TaskStatusSnapshot,
     ServiceInfo,
     ResponseStatus,
     TaskStatus
@@ -30,6 +45,218 @@ from .exceptions import (
 )
 
 
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "dtc-api-sdk-python/0.1.0"
+
+
+def _config_payload(config: Union[PipelineConfig, CompiledPipeline, Dict[str, Any]]) -> Union[bytes, Dict[str, Any]]:
+    """Request body for a configuration; compiled pipelines are sent pre-serialized."""
+    if isinstance(config, CompiledPipeline):
+        return config.body
+    return _config_to_dict(config)
+
+
+def _extract_token(data: Any, error_cls: type, action: str) -> str:
+    """
+    Extract a pipeline or task token from response data.
+    
+    Args:
+        data: The ``data`` field of the API response
+        error_cls: Exception class raised when no token is present
+        action: Human readable operation name used in error messages
+        
+    Returns:
+        The token string
+    """
+    # Handle both dict and string responses
+    if isinstance(data, dict):
+        if not data or "token" not in data:
+            raise error_cls(f"{action} failed: no token returned")
+        return data["token"]
+    elif isinstance(data, str):
+        # If response is a string, try to parse it as a token
+        if data and len(data.strip()) > 0:
+            return data.strip()
+        else:
+            raise error_cls(f"{action} failed: empty response")
+    else:
+        raise error_cls(f"{action} failed: unexpected response type {type(data)}")
+
+
+def _parse_response(response: Any) -> APIResponse:
+    """
+    Parse an HTTP response into an APIResponse.
+    
+    Works with any response object exposing ``status_code``, ``text`` and
+    ``json()`` (``requests`` and ``httpx`` responses both qualify).
+    
+    Raises:
+        DTCApiError: For various API errors
+    """
+    try:
+        response_data = response.json()
+    except json.JSONDecodeError:
+        # If response is not JSON, create a basic response structure
+        if response.status_code >= 400:
+            raise DTCApiError(
+                f"HTTP {response.status_code}: {response.text}",
+                status_code=response.status_code
+            )
+        response_data = {"status": "OK", "data": response.text}
+    
+    # Create APIResponse object
+    api_response = APIResponse(
+        status=ResponseStatus(response_data.get("status", "Error")),
+        data=response_data.get("data"),
+        error=response_data.get("error"),
+        metrics=response_data.get("metrics")
+    )
+    
+    # Handle error responses
+    if not api_response.is_success or response.status_code >= 400:
+        error_msg = api_response.error_message or f"HTTP {response.status_code}"
+        
+        if response.status_code == 401:
+            raise AuthenticationError(error_msg, response.status_code, response_data)
+        elif response.status_code == 422:
+            raise ValidationError(error_msg, response.status_code, response_data)
+        else:
+            raise DTCApiError(error_msg, response.status_code, response_data)
+    
+    return api_response
+
+
+def _parse_webhook_body(response: Any) -> Dict[str, Any]:
+    """Decode a direct webhook upload response body."""
+    try:
+        return response.json()
+    except json.JSONDecodeError:
+        # If response is not JSON, wrap it in a dict
+        return {"response": response.text, "status": "received"}
+
+
+def _cacheable(result: Any) -> bool:
+    """Check whether a webhook result is a success worth caching."""
+    return isinstance(result, dict) and result.get("status") != ResponseStatus.ERROR.value
+
+
+def _connect_failed(error: requests.exceptions.RequestException) -> bool:
+    """Check whether a request failed before a connection was established."""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+def _webhook_result(data: Any) -> Dict[str, Any]:
+    """Normalize the ``data`` field of a ``PUT /webhook`` response to a dict."""
+    # Handle both dict and string responses
+    if isinstance(data, dict):
+        return data
+    # If response is not a dict, wrap it in a dict
+    return {"response": data, "status": "received"}
+
+
+def _task_info_from_data(token: str, data: Any) -> TaskInfo:
+    """Build a TaskInfo from the ``data`` field of a ``GET /task`` response."""
+    # Handle both dict and string responses
+    if not isinstance(data, dict):
+        # If response is not a dict, create a basic structure
+        data = {"status": "unknown", "error_message": f"Unexpected response: {data}"}
+    
+    snapshot = None
+    progress = data.get("progress")
+    error_message = data.get("error_message")
+    if "completed" in data:
+        # Engine payloads report "Running" until the completed flag is set,
+        # with a non-zero exitCode on failure
+        snapshot = TaskStatusSnapshot.from_payload(data)
+        status = snapshot.task_status
+        if progress is None:
+            progress = snapshot.progress
+        if error_message is None and status == TaskStatus.FAILED:
+            error_message = snapshot.exit_message or None
+    else:
+        status = TaskStatus(data.get("status", "pending"))
+        
+    return TaskInfo(
+        token=token,
+        status=status,
+        name=data.get("name"),
+        progress=progress,
+        created_at=data.get("created_at"),
+        completed_at=data.get("completed_at"),
+        error_message=error_message,
+        result=data.get("result"),
+        snapshot=snapshot
+    )
+
+
+def is_task_ready(data: Any, object_prefix: str = "webhook://") -> bool:
+    """
+    Check whether a raw ``GET /task`` payload reports a task ready for data.
+    
+    Args:
+        data: The ``data`` field of a ``GET /task`` response
+        object_prefix: Prefix of ``currentObject`` once the source is listening
+        
+    Returns:
+        True if the engine is up and waiting on its source
+    """
+    if not isinstance(data, dict):
+        return False
+    return (
+        bool(data.get("serviceUp"))
+        and not data.get("completed")
+        and not data.get("exitCode")
+        and str(data.get("currentObject") or "").startswith(object_prefix)
+    )
+
+
+def _task_exited(data: Any) -> bool:
+    """Check whether a raw ``GET /task`` payload reports the engine has exited."""
+    return isinstance(data, dict) and bool(data.get("completed") or data.get("exitCode"))
+
+
+def _override_policy(policy: PollPolicy, min_interval: float = None, max_interval: float = None) -> PollPolicy:
+    """Return ``policy`` with explicitly given interval bounds applied."""
+    overrides = {}
+    if min_interval is not None:
+        overrides["initial_interval"] = min_interval
+    if max_interval is not None:
+        overrides["max_interval"] = max_interval
+    return dataclasses.replace(policy, **overrides) if overrides else policy
+
+
+def _services_from_data(data: Any) -> List[ServiceInfo]:
+    """Build ServiceInfo objects from the ``data`` field of ``GET /services``."""
+    services_data = data or []
+    if not isinstance(services_data, list):
+        services_data = [services_data]
+    
+    return [
+        ServiceInfo(
+            name=service.get("name", ""),
+            status=service.get("status", "unknown"),
+            version=service.get("version"),
+            description=service.get("description"),
+            endpoints=service.get("endpoints")
+        )
+        for service in services_data
+    ]
+
+
+def _interface_url(base_url: str, path: str, token: str, pipeline_type: str, api_key: str) -> str:
+    """Build a chat/dropper interface URL with session parameters."""
+    params = {
+        "type": pipeline_type,
+        "token": token,
+        "apikey": api_key
+    }
+    return f"{base_url}{path}?" + "&".join(f"{k}={v}" for k, v in params.items())
+
+
 class DTCApiClient:
     """
     Aparavi Data Toolchain API client.
@@ -43,7 +270,14 @@ class DTCApiClient:
         api_key: str = None, 
         base_url: str = "https://eaas-dev.aparavi.com",
         timeout: int = 30,
-        max_retries: int = 3
+        max_retries: int = 3,
+        control_transport: TransportProfile = None,
+        data_transport: TransportProfile = None,
+        poll_policy: PollPolicy = None,
+        retry_policy: RetryPolicy = None,
+        rate_limiter: RateLimiter = None,
+        concurrency_limiter: ConcurrencyLimiter = None,
+        registry: Union[TokenRegistry, TokenStore] = None
     ):
         """
         Initialize the DTC API client.
@@ -54,6 +288,23 @@ class DTCApiClient:
             base_url: Base URL for the API. Defaults to dev environment.
             timeout: Request timeout in seconds.
             max_retries: Maximum number of retry attempts for failed requests.
+                    Ignored when retry_policy is given.
+            control_transport: Pool settings for control-plane calls (task
+                    creation, status polls, health checks).
+            data_transport: Pool settings for data-plane calls (/webhook,
+                    /pipe/process), kept separate so large uploads cannot
+                    starve status polls of connections.
+            poll_policy: Default adaptive polling schedule for wait_for_task()
+                    and as_completed().
+            retry_policy: Retry settings: endpoint safety, backoff,
+                    Retry-After limits and the retry budget.
+            rate_limiter: Optional per-endpoint-group request pacing. May be
+                    shared between clients to pace them together.
+            concurrency_limiter: Optional adaptive bound on in-flight task
+                    launches and uploads (PUT /task, /webhook, /pipe/process).
+            registry: Where created task and pipeline tokens are tracked
+                    until cleaned up. Defaults to a private in-memory
+                    registry; pass a TokenStore to persist and share them.
         """
         self.api_key = api_key or os.getenv("DTC_API_KEY")
         if not self.api_key:
@@ -61,26 +312,163 @@ class DTCApiClient:
         
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
+        self.poll_policy = poll_policy or PollPolicy()
+        self._poll_metrics = PollMetrics()
         
-        # Setup session with retry strategy
-        self.session = requests.Session()
-        retry_strategy = Retry(
-            total=max_retries,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["HEAD", "GET", "OPTIONS"],
-            backoff_factor=1
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
+        # Retries are decided per endpoint by the retry engine in _send(),
+        # so the adapters themselves never retry
+        self._retry = RetryEngine(retry_policy or RetryPolicy(max_retries=max_retries))
+        self.rate_limiter = rate_limiter
+        self.concurrency_limiter = concurrency_limiter
+        self.registry = registry if registry is not None else TokenRegistry()
+        self._reaper: Optional[Reaper] = None
+        self.control_transport = control_transport or TransportProfile()
+        self.data_transport = data_transport or TransportProfile()
+        self._control_adapter = self.control_transport.build_adapter()
+        self._data_adapter = self.data_transport.build_adapter()
         
-        # Set default headers
-        self.session.headers.update({
+        bearer_headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
-            "User-Agent": "dtc-api-sdk-python/0.1.0"
+            "User-Agent": USER_AGENT
+        }
+        self.session = build_session(self._control_adapter, bearer_headers)
+        self.data_session = build_session(self._data_adapter, bearer_headers)
+        
+        # Direct webhook uploads share the data-plane pool but authenticate
+        # with the raw API key instead of a Bearer token
+        self.webhook_session = build_session(self._data_adapter, {
+            "Authorization": self.api_key,
+            "User-Agent": USER_AGENT
         })
     
+    def __enter__(self) -> "DTCApiClient":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    def close(self) -> None:
+        """Stop the reaper, if started, and close all pooled connections held by the client."""
+        if self._reaper is not None:
+            self._reaper.close()
+            self._reaper = None
+        self.session.close()
+        self.data_session.close()
+        self.webhook_session.close()
+    
+    def get_pool_stats(self) -> Dict[str, PoolStats]:
+        """
+        Get connection pool statistics.
+        
+        Returns:
+            Mapping of pool name ("control", "data") to PoolStats
+        """
+        return {
+            "control": self._control_adapter.pool_stats(),
+            "data": self._data_adapter.pool_stats()
+        }
+    
+    def get_poll_stats(self) -> PollStats:
+        """
+        Get task polling statistics accumulated by this client.
+        
+        Returns:
+            PollStats with total polls, wasted polls and finished tasks
+        """
+        return self._poll_metrics.snapshot()
+    
+    def get_retry_stats(self) -> RetryStats:
+        """
+        Get retry statistics accumulated by this client.
+        
+        Returns:
+            RetryStats with request and retry counts and the remaining budget
+        """
+        return self._retry.stats()
+    
+    def _send(
+        self,
+        session: requests.Session,
+        method: str,
+        endpoint: str,
+        url: str = None,
+        **kwargs: Any
+    ) -> requests.Response:
+        """
+        Send a request, retrying transient failures as the retry engine allows.
+        
+        Every attempt is paced by the rate limiter and, for task launches and
+        uploads, holds a concurrency limiter slot; both adapt to the
+        responses. The request body is rewound rather than rebuilt between
+        attempts.
+        Responses with a retryable status are returned once retries are
+        exhausted; network errors are re-raised.
+        
+        Args:
+            session: Session to send on
+            method: HTTP method
+            endpoint: API endpoint path, used to classify retry safety
+            url: Full URL; defaults to base_url + endpoint
+            **kwargs: Arguments for ``session.request``
+            
+        Returns:
+            The final requests.Response
+        """
+        url = url or f"{self.base_url}{endpoint}"
+        params = kwargs.get("params")
+        if params and "token" in params:
+            self.registry.touch(params["token"])
+        body = ReplayableBody(kwargs.get("data"))
+        replayable = body.replayable and not kwargs.get("files")
+        limited = (
+            self.concurrency_limiter is not None
+            and (method.upper(), endpoint) in CONCURRENCY_LIMITED_ENDPOINTS
+        )
+        units = body_units(kwargs.get("data")) if limited else 1.0
+        self._retry.begin()
+        
+        attempt = 0
+        while True:
+            if attempt:
+                body.rewind()
+            if self.rate_limiter is not None:
+                wait = self.rate_limiter.reserve(method, endpoint)
+                if wait:
+                    time.sleep(wait)
+            started = time.monotonic()
+            try:
+                with self.concurrency_limiter.slot(units) if limited else contextlib.nullcontext() as slot:
+                    response = session.request(method, url, **kwargs)
+                    if slot is not None:
+                        slot.dropped = response.status_code == 429 or response.status_code >= 500
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                delay = self._retry.next_delay(
+                    method, endpoint, attempt, sent=not _connect_failed(e), replayable=replayable
+                )
+                if delay is None:
+                    raise
+            else:
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if self.rate_limiter is not None:
+                    self.rate_limiter.feedback(
+                        method, endpoint, response.status_code, time.monotonic() - started, retry_after
+                    )
+                if response.status_code < 400:
+                    return response
+                delay = self._retry.next_delay(
+                    method, endpoint, attempt,
+                    status=response.status_code,
+                    retry_after=retry_after,
+                    replayable=replayable
+                )
+                if delay is None:
+                    return response
+                response.close()
+            
+            attempt += 1
+            time.sleep(delay)
+    
     def _make_request(
         self, 
         method: str, 
@@ -107,7 +495,7 @@ class DTCApiClient:
         Raises:
             DTCApiError: For various API errors
         """
-        url = f"{self.base_url}{endpoint}"
+        session = self._session_for(endpoint)
         
         try:
             # Prepare request arguments
@@ -120,7 +508,7 @@ class DTCApiClient:
             # Handle different content types
             if files:
                 # For multipart form data, don't set Content-Type (requests will set it)
-                if "Content-Type" in self.session.headers:
+                if "Content-Type" in session.headers:
                     kwargs["headers"]["Content-Type"] = None
                 kwargs["files"] = files
             elif data is not None:
@@ -129,8 +517,8 @@ class DTCApiClient:
                 else:
                     kwargs["data"] = data
             
-            # Make the request
-            response = self.session.request(method, url, **kwargs)
+            # Make the request, retrying where the endpoint allows it
+            response = self._send(session, method, endpoint, **kwargs)
             
             # Handle response
             return self._handle_response(response)
@@ -142,6 +530,12 @@ class DTCApiClient:
         except requests.exceptions.RequestException as e:
             raise DTCApiError(f"Request failed: {str(e)}")
     
+    def _session_for(self, endpoint: str) -> requests.Session:
+        """Pick the control- or data-plane session for an endpoint."""
+        if endpoint in DATA_PLANE_ENDPOINTS:
+            return self.data_session
+        return self.session
+    
     def _handle_response(self, response: requests.Response) -> APIResponse:
         """
         Handle and parse API response.
@@ -155,37 +549,7 @@ class DTCApiClient:
         Raises:
             DTCApiError: For various API errors
         """
-        try:
-            response_data = response.json()
-        except json.JSONDecodeError:
-            # If response is not JSON, create a basic response structure
-            if response.status_code >= 400:
-                raise DTCApiError(
-                    f"HTTP {response.status_code}: {response.text}",
-                    status_code=response.status_code
-                )
-            response_data = {"status": "OK", "data": response.text}
-        
-        # Create APIResponse object
-        api_response = APIResponse(
-            status=ResponseStatus(response_data.get("status", "Error")),
-            data=response_data.get("data"),
-            error=response_data.get("error"),
-            metrics=response_data.get("metrics")
-        )
-        
-        # Handle error responses
-        if not api_response.is_success or response.status_code >= 400:
-            error_msg = api_response.error_message or f"HTTP {response.status_code}"
-            
-            if response.status_code == 401:
-                raise AuthenticationError(error_msg, response.status_code, response_data)
-            elif response.status_code == 422:
-                raise ValidationError(error_msg, response.status_code, response_data)
-            else:
-                raise DTCApiError(error_msg, response.status_code, response_data)
-        
-        return api_response
+        return _parse_response(response)
     
     # Health Check Methods
     
@@ -213,7 +577,7 @@ class DTCApiClient:
     
     def create_pipeline(
         self, 
-        config: Union[PipelineConfig, Dict[str, Any]], 
+        config: Union[PipelineConfig, CompiledPipeline, Dict[str, Any]], 
         name: str = None
     ) -> str:
         """
@@ -226,28 +590,13 @@ class DTCApiClient:
         Returns:
             Pipeline token for subsequent operations
         """
-        if isinstance(config, PipelineConfig):
-            config_dict = config.to_dict()
-        else:
-            config_dict = config
-            
+        payload = _config_payload(config)
         params = {"name": name} if name else {}
         
-        response = self._make_request("POST", "/pipe", params=params, data=config_dict)
-        
-        # Handle both dict and string responses
-        if isinstance(response.data, dict):
-            if not response.data or "token" not in response.data:
-                raise PipelineError("Pipeline creation failed: no token returned")
-            return response.data["token"]
-        elif isinstance(response.data, str):
-            # If response is a string, try to parse it as a token
-            if response.data and len(response.data.strip()) > 0:
-                return response.data.strip()
-            else:
-                raise PipelineError("Pipeline creation failed: empty response")
-        else:
-            raise PipelineError(f"Pipeline creation failed: unexpected response type {type(response.data)}")
+        response = self._make_request("POST", "/pipe", params=params, data=payload)
+        token = _extract_token(response.data, PipelineError, "Pipeline creation")
+        self.registry.register(token, PIPELINE, name=name, config_hash=config_hash(config))
+        return token
     
     def delete_pipeline(self, token: str) -> bool:
         """
@@ -261,61 +610,102 @@ class DTCApiClient:
         """
         params = {"token": token}
         response = self._make_request("DELETE", "/pipe", params=params)
+        self.registry.unregister(token)
         return response.is_success
     
-    def validate_pipeline(self, config: Union[PipelineConfig, Dict[str, Any]]) -> bool:
+    @contextlib.contextmanager
+    def pipeline(
+        self,
+        config: Union[PipelineConfig, CompiledPipeline, Dict[str, Any]],
+        name: str = None
+    ) -> Iterator[str]:
+        """
+        Create a pipeline for the duration of a block.
+        
+        The pipeline is deleted when the block exits, including on errors.
+        
+        Args:
+            config: Pipeline configuration
+            name: Optional pipeline name
+            
+        Yields:
+            Pipeline token
+            
+        Example:
+            >>> with client.pipeline(pipeline_config) as token:
+            ...     client.upload_files(token, ["document.pdf"])
+        """
+        token = self.create_pipeline(config, name=name)
+        try:
+            yield token
+        finally:
+            try:
+                self.delete_pipeline(token)
+            except DTCApiError as e:
+                logger.warning("Failed to delete pipeline %s: %s", token, e)
+    
+    def validate_pipeline(
+        self,
+        config: Union[PipelineConfig, CompiledPipeline, Dict[str, Any]],
+        offline: bool = False
+    ) -> bool:
         """
         Validate a pipeline configuration without creating it.
         
+        The component graph is checked locally first (see
+        ``pipeline.validate_config``); configurations failing that check
+        are rejected without a request and their errors are logged.
+        
         Args:
             config: Pipeline configuration to validate
+            offline: Only run the local check, skipping ``POST /pipe/validate``
             
         Returns:
             True if configuration is valid
         """
-        if isinstance(config, PipelineConfig):
-            config_dict = config.to_dict()
-        else:
-            config_dict = config
-            
-        response = self._make_request("POST", "/pipe/validate", data=config_dict)
+        result = validate_config(config)
+        if not result.valid:
+            logger.warning("Pipeline configuration is invalid: %s", "; ".join(result.errors))
+            return False
+        if offline:
+            return True
+        
+        payload = _config_payload(config)
+        response = self._make_request("POST", "/pipe/validate", data=payload)
         return response.is_success
     
-    def upload_files(self, token: str, files: List[Union[str, Path]]) -> bool:
+    def upload_files(
+        self,
+        token: str,
+        files: List[Union[str, Path]],
+        progress: ProgressCallback = None
+    ) -> bool:
         """
         Upload files to a pipeline for processing.
         
+        The multipart body is streamed from disk: each file is opened only
+        while its part is sent, so memory use and open file descriptors stay
+        flat regardless of batch size.
+        
         Args:
             token: Pipeline token
             files: List of file paths to upload
+            progress: Optional callback ``progress(filename, bytes_sent, file_size)``
             
         Returns:
             True if upload was successful
         """
         params = {"token": token}
-        
-        # Prepare files for upload
-        file_data = {}
-        for i, file_path in enumerate(files):
-            file_path = Path(file_path)
-            if not file_path.exists():
-                raise FileNotFoundError(f"File not found: {file_path}")
-            
-            file_data[f"file_{i}"] = (file_path.name, open(file_path, 'rb'))
-        
-        try:
-            response = self._make_request("PUT", "/pipe/process", params=params, files=file_data)
-            return response.is_success
-        finally:
-            # Close all file handles
-            for file_handle in file_data.values():
-                file_handle[1].close()
+        encoder = MultipartEncoder(files, progress=progress)
+        headers = {"Content-Type": encoder.content_type}
+        response = self._make_request("PUT", "/pipe/process", params=params, data=encoder, headers=headers)
+        return response.is_success
     
     # Task Management Methods
     
     def execute_task(
         self, 
-        config: Union[PipelineConfig, Dict[str, Any]], 
+        config: Union[PipelineConfig, CompiledPipeline, Dict[str, Any]], 
         name: str = None,
         threads: int = None
     ) -> str:
@@ -330,11 +720,8 @@ class DTCApiClient:
         Returns:
             Task token
         """
-        if isinstance(config, PipelineConfig):
-            config_dict = config.to_dict()
-        else:
-            config_dict = config
-            
+        payload = _config_payload(config)
+        
         params = {}
         if name:
             params["name"] = name
@@ -343,21 +730,10 @@ class DTCApiClient:
                 raise ValueError("Threads must be between 1 and 16")
             params["threads"] = threads
             
-        response = self._make_request("PUT", "/task", params=params, data=config_dict)
-        
-        # Handle both dict and string responses
-        if isinstance(response.data, dict):
-            if not response.data or "token" not in response.data:
-                raise TaskError("Task execution failed: no token returned")
-            return response.data["token"]
-        elif isinstance(response.data, str):
-            # If response is a string, try to parse it as a token
-            if response.data and len(response.data.strip()) > 0:
-                return response.data.strip()
-            else:
-                raise TaskError("Task execution failed: empty response")
-        else:
-            raise TaskError(f"Task execution failed: unexpected response type {type(response.data)}")
+        response = self._make_request("PUT", "/task", params=params, data=payload)
+        token = _extract_token(response.data, TaskError, "Task execution")
+        self.registry.register(token, TASK, name=name, config_hash=config_hash(config))
+        return token
     
     def get_task_status(self, token: str) -> TaskInfo:
         """
@@ -369,26 +745,29 @@ class DTCApiClient:
         Returns:
             TaskInfo object with current status
         """
+        return _task_info_from_data(token, self._get_task_data(token))
+    
+    def get_task_snapshot(self, token: str, include_trace: bool = False) -> TaskStatusSnapshot:
+        """
+        Get the detailed engine state of a task.
+        
+        Args:
+            token: Task token
+            include_trace: Keep the engine trace (parsed lazily via ``snapshot.trace``)
+            
+        Returns:
+            TaskStatusSnapshot with counters, throughput and ETA
+        """
+        data = self._get_task_data(token)
+        if not isinstance(data, dict):
+            raise TaskError(f"Unexpected task status response: {data}")
+        return TaskStatusSnapshot.from_payload(data, include_trace=include_trace)
+    
+    def _get_task_data(self, token: str) -> Any:
+        """Fetch the raw ``data`` payload of ``GET /task`` for a token."""
         params = {"token": token}
         response = self._make_request("GET", "/task", params=params)
-        
-        # Handle both dict and string responses
-        if isinstance(response.data, dict):
-            data = response.data
-        else:
-            # If response is not a dict, create a basic structure
-            data = {"status": "unknown", "error_message": f"Unexpected response: {response.data}"}
-            
-        return TaskInfo(
-            token=token,
-            status=TaskStatus(data.get("status", "pending")),
-            name=data.get("name"),
-            progress=data.get("progress"),
-            created_at=data.get("created_at"),
-            completed_at=data.get("completed_at"),
-            error_message=data.get("error_message"),
-            result=data.get("result")
-        )
+        return response.data
     
     def cancel_task(self, token: str) -> bool:
         """
@@ -402,16 +781,81 @@ class DTCApiClient:
         """
         params = {"token": token}
         response = self._make_request("DELETE", "/task", params=params)
+        self.registry.unregister(token)
         return response.is_success
     
-    def wait_for_task(self, token: str, poll_interval: int = 5, timeout: int = 300) -> TaskInfo:
+    @contextlib.contextmanager
+    def task(
+        self,
+        config: Union[PipelineConfig, CompiledPipeline, Dict[str, Any]],
+        name: str = None,
+        threads: int = None,
+        ready_timeout: Optional[float] = 120
+    ) -> Iterator[str]:
+        """
+        Run a task for the duration of a block.
+        
+        The task is cancelled when the block exits, including on errors.
+        
+        Args:
+            config: Task configuration
+            name: Optional task name
+            threads: Number of threads to use (1-16)
+            ready_timeout: Wait up to this many seconds for the task to
+                    accept webhook data before entering the block; None
+                    enters immediately
+            
+        Yields:
+            Task token
+            
+        Example:
+            >>> with client.task(pipeline_config) as token:
+            ...     result = client.upload_file_to_webhook(token, "document.pdf")
+        """
+        token = self.execute_task(config, name=name, threads=threads)
+        try:
+            if ready_timeout is not None:
+                self.wait_until_ready(token, deadline=ready_timeout)
+            yield token
+        finally:
+            self._cancel_quietly(token)
+    
+    def start_reaper(self, ttl: float = 3600.0, interval: float = 60.0, max_workers: int = 8) -> Reaper:
+        """
+        Start cleaning up leaked tasks and pipelines in the background.
+        
+        Resources in the client's registry that go unused for ``ttl``
+        seconds, or whose creating process has died, are cancelled or
+        deleted every ``interval`` seconds. The reaper stops when the client
+        is closed.
+        
+        Returns:
+            The running Reaper; call ``reap()`` on it to force a pass
+        """
+        if self._reaper is None:
+            self._reaper = Reaper(self, ttl=ttl, interval=interval, max_workers=max_workers).start()
+        return self._reaper
+    
+    def wait_for_task(
+        self,
+        token: str,
+        poll_interval: float = None,
+        timeout: int = 300,
+        policy: PollPolicy = None
+    ) -> TaskInfo:
         """
         Wait for a task to complete.
         
+        Polls adaptively: fast at first, then backing off with jitter, and
+        sooner again when the task's progress shows it nearing the end.
+        Poll counts are recorded in get_poll_stats().
+        
         Args:
             token: Task token
-            poll_interval: Seconds between status checks
+            poll_interval: Fixed seconds between status checks. Overrides the
+                    adaptive policy when given.
             timeout: Maximum seconds to wait
+            policy: Polling schedule; defaults to the client's poll_policy
             
         Returns:
             Final TaskInfo when task completes
@@ -420,12 +864,16 @@ class DTCApiClient:
             TimeoutError: If task doesn't complete within timeout
             TaskError: If task fails
         """
-        import time
-        
-        start_time = time.time()
+        if poll_interval is not None:
+            policy = PollPolicy.fixed(poll_interval)
+        tracker = PollTracker(policy or self.poll_policy)
+        start_time = time.monotonic()
         
-        while time.time() - start_time < timeout:
+        while True:
             task_info = self.get_task_status(token)
+            changed = tracker.observe(task_info)
+            finished = task_info.status in TERMINAL_STATUSES
+            self._poll_metrics.record(wasted=not (changed or finished), finished=finished)
             
             if task_info.status == TaskStatus.COMPLETED:
                 return task_info
@@ -434,10 +882,132 @@ class DTCApiClient:
             elif task_info.status == TaskStatus.CANCELLED:
                 raise TaskError("Task was cancelled")
             
-            time.sleep(poll_interval)
+            remaining = timeout - (time.monotonic() - start_time)
+            if remaining <= 0:
+                break
+            time.sleep(min(tracker.next_delay(), remaining))
         
         raise TimeoutError(f"Task did not complete within {timeout} seconds")
     
+    def as_completed(
+        self,
+        tokens: Iterable[str],
+        timeout: int = None,
+        min_interval: float = None,
+        max_interval: float = None,
+        max_workers: int = 8,
+        policy: PollPolicy = None
+    ) -> Iterator[TaskInfo]:
+        """
+        Wait for many tasks, yielding each one as soon as it finishes.
+        
+        A single scheduler polls every token on its own adaptive schedule
+        (see wait_for_task()), so a batch finishes as soon as its slowest
+        task does rather than on the next tick of a fixed polling loop.
+        
+        Args:
+            tokens: Task tokens to wait for
+            timeout: Maximum seconds to wait for all tasks
+            min_interval: Initial seconds between polls of one task
+            max_interval: Upper bound on seconds between polls of one task
+            max_workers: Maximum number of concurrent status requests
+            policy: Polling schedule; defaults to the client's poll_policy
+            
+        Yields:
+            Final TaskInfo for each task (completed, failed or cancelled) in
+            completion order. Failed tasks are yielded, not raised.
+            
+        Raises:
+            TimeoutError: If some tasks are still running when the timeout expires
+            
+        Example:
+            >>> for task_info in client.as_completed(tokens, timeout=600):
+            ...     print(task_info.token, task_info.status.value)
+        """
+        policy = _override_policy(policy or self.poll_policy, min_interval, max_interval)
+        poller = TaskPoller(
+            self.get_task_status,
+            policy=policy,
+            max_workers=max_workers,
+            metrics=self._poll_metrics
+        )
+        return poller.as_completed(tokens, timeout=timeout)
+    
+    def wait_for_tasks(self, tokens: Iterable[str], timeout: int = 300, **kwargs: Any) -> Dict[str, TaskInfo]:
+        """
+        Wait for many tasks to finish.
+        
+        Args:
+            tokens: Task tokens to wait for
+            timeout: Maximum seconds to wait for all tasks
+            **kwargs: Polling options accepted by as_completed()
+            
+        Returns:
+            Mapping of token to final TaskInfo
+            
+        Raises:
+            TimeoutError: If some tasks are still running when the timeout expires
+        """
+        return {
+            task_info.token: task_info
+            for task_info in self.as_completed(tokens, timeout=timeout, **kwargs)
+        }
+    
+    def wait_until_ready(
+        self,
+        token: str,
+        deadline: float = 120,
+        initial_interval: float = 0.25,
+        max_interval: float = 2.0,
+        object_prefix: str = "webhook://"
+    ) -> Dict[str, Any]:
+        """
+        Wait until a task's engine can accept webhook data.
+        
+        Polls ``GET /task`` with exponential backoff (starting at
+        ``initial_interval`` and capped at ``max_interval``) instead of
+        sleeping a fixed time after execute_task().
+        
+        Args:
+            token: Task token from execute_task()
+            deadline: Maximum seconds to wait for readiness
+            initial_interval: Seconds before the second status check
+            max_interval: Upper bound on the delay between status checks
+            object_prefix: ``currentObject`` prefix signalling readiness
+            
+        Returns:
+            The raw task status payload that reported readiness
+            
+        Raises:
+            TimeoutError: If the task isn't ready within the deadline
+            TaskError: If the task exits before becoming ready
+            
+        Example:
+            >>> task_token = client.execute_task(pipeline_config)
+            >>> client.wait_until_ready(task_token, deadline=60)
+            >>> result = client.upload_file_to_webhook(task_token, "document.pdf")
+        """
+        end_time = time.monotonic() + deadline
+        interval = initial_interval
+        
+        while True:
+            data = self._get_task_data(token)
+            
+            if is_task_ready(data, object_prefix):
+                return data
+            if _task_exited(data):
+                raise TaskError(
+                    f"Task exited before becoming ready: {data.get('exitMsg') or data.get('exitCode')}",
+                    response_data=data
+                )
+            
+            remaining = end_time - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"Task was not ready within {deadline} seconds")
+            
+            time.sleep(min(interval, remaining))
+            interval = min(interval * 2, max_interval)
+    
     # Webhook and UI Methods
     
     def send_webhook(self, token: str, webhook_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -453,16 +1023,40 @@ class DTCApiClient:
         """
         params = {"token": token}
         response = self._make_request("PUT", "/webhook", params=params, data=webhook_data)
+        return _webhook_result(response.data)
+    
+    def send_webhook_file(
+        self,
+        token: str,
+        file_path: Union[str, Path],
+        fields: Dict[str, Any] = None,
+        progress: ProgressCallback = None
+    ) -> Dict[str, Any]:
+        """
+        Send a file to a task as a base64 JSON webhook payload.
         
-        # Handle both dict and string responses
-        if isinstance(response.data, dict):
-            return response.data
-        else:
-            # If response is not a dict, wrap it in a dict
-            return {"response": response.data, "status": "received"}
+        Equivalent to send_webhook() with ``{"filename", "content_type",
+        "size", "data": <base64>}``, but the payload is encoded while it is
+        streamed from disk, so memory use does not grow with the file size.
+        
+        Args:
+            token: Task token
+            file_path: Path to the file to send
+            fields: Extra JSON fields to include alongside the file data
+            progress: Optional callback ``progress(filename, bytes_sent, file_size)``
+            
+        Returns:
+            Webhook response data
+        """
+        params = {"token": token}
+        body = Base64JSONBody(file_path, fields=fields, progress=progress)
+        headers = {"Content-Type": "application/json"}
+        response = self._make_request("PUT", "/webhook", params=params, data=body, headers=headers)
+        return _webhook_result(response.data)
     
     def upload_file_to_webhook(self, token: str, file_path: Union[str, Path], 
-                              content_type: str = None, timeout: int = 60) -> Dict[str, Any]:
+                              content_type: str = None, timeout: int = 60,
+                              use_mmap: bool = False) -> Dict[str, Any]:
         """
         Upload a file directly to a webhook endpoint for processing.
         
@@ -475,6 +1069,9 @@ class DTCApiClient:
             file_path: Path to the file to upload
             content_type: MIME type of the file (auto-detected if not provided)
             timeout: Request timeout in seconds (default: 60)
+            use_mmap: Send the file from a memory map, handing windows of it
+                    straight to the socket. Recommended for very large files
+                    and for uploading one file to several tasks concurrently.
             
         Returns:
             Webhook response data with processed results
@@ -495,9 +1092,7 @@ class DTCApiClient:
         
         # Auto-detect content type if not provided
         if content_type is None:
-            content_type, _ = mimetypes.guess_type(str(file_path))
-            if content_type is None:
-                content_type = "application/octet-stream"
+            content_type = _guess_content_type(file_path)
         
         # Construct webhook URL with required parameters
         webhook_url = f"{self.base_url}/webhook"
@@ -507,31 +1102,32 @@ class DTCApiClient:
             'token': token
         }
         
-        # Prepare headers for direct file upload
+        # The webhook session already carries the raw-key Authorization header
         headers = {
-            'Authorization': self.api_key,  # No Bearer prefix for webhook
             'Content-Type': content_type
         }
         
         try:
-            # Upload file directly as binary data
-            with open(file_path, 'rb') as file:
-                response = requests.put(
-                    webhook_url,
+            # Upload file directly as binary data over a pooled connection
+            if use_mmap:
+                source = contextlib.nullcontext(MappedFileBody(file_path))
+            else:
+                source = open(file_path, 'rb')
+            with source as body:
+                response = self._send(
+                    self.webhook_session,
+                    "PUT",
+                    "/webhook",
+                    url=webhook_url,
                     params=params,
                     headers=headers,
-                    data=file,
+                    data=body,
                     timeout=timeout
                 )
             
             # Handle response
             response.raise_for_status()
-            
-            try:
-                return response.json()
-            except json.JSONDecodeError:
-                # If response is not JSON, wrap it in a dict
-                return {"response": response.text, "status": "received"}
+            return _parse_webhook_body(response)
                 
         except requests.exceptions.Timeout:
             raise NetworkError(f"File upload timed out after {timeout} seconds")
@@ -542,6 +1138,149 @@ class DTCApiClient:
         except requests.exceptions.RequestException as e:
             raise DTCApiError(f"Request failed during file upload: {str(e)}")
     
+    def process_file(
+        self,
+        config: Union[PipelineConfig, CompiledPipeline, Dict[str, Any]],
+        file_path: Union[str, Path],
+        cache: ResultCache = None,
+        ready_timeout: float = 120,
+        timeout: int = 60,
+        use_mmap: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Process one file with a fresh webhook task.
+        
+        Launches a task, waits until it accepts data, uploads the file and
+        cancels the task. With a cache, a file whose contents were already
+        processed by an equivalent configuration is answered from the cache
+        without creating a task.
+        
+        Args:
+            config: Task configuration
+            file_path: File to process
+            cache: Optional ResultCache
+            ready_timeout: Maximum seconds to wait for the task to accept data
+            timeout: Upload timeout in seconds
+            use_mmap: Upload the file from a memory map
+            
+        Returns:
+            Webhook response data, as returned by upload_file_to_webhook()
+            
+        Example:
+            >>> with ResultCache("results.db") as cache:
+            ...     result = client.process_file(pipeline_config, "document.pdf", cache=cache)
+        """
+        key = None
+        if cache is not None:
+            key = cache.file_key(config, file_path)
+            result = cache.get(key)
+            if result is not None:
+                return result
+        elif not Path(file_path).exists():
+            raise FileNotFoundError(f"File not found: {file_path}")
+        
+        token = self.execute_task(config)
+        try:
+            self.wait_until_ready(token, deadline=ready_timeout)
+            result = self.upload_file_to_webhook(token, file_path, timeout=timeout, use_mmap=use_mmap)
+        finally:
+            self._cancel_quietly(token)
+        
+        if key is not None and _cacheable(result):
+            cache.put(key, result)
+        return result
+    
+    def process_webhook(
+        self,
+        config: Union[PipelineConfig, CompiledPipeline, Dict[str, Any]],
+        webhook_data: Dict[str, Any],
+        cache: ResultCache = None,
+        ready_timeout: float = 120
+    ) -> Dict[str, Any]:
+        """
+        Send webhook data to a fresh task, answering from a cache if possible.
+        
+        Like process_file(), keyed on the data's canonical JSON.
+        
+        Args:
+            config: Task configuration
+            webhook_data: Data to send via webhook
+            cache: Optional ResultCache
+            ready_timeout: Maximum seconds to wait for the task to accept data
+            
+        Returns:
+            Webhook response data, as returned by send_webhook()
+        """
+        key = None
+        if cache is not None:
+            key = cache.data_key(config, webhook_data)
+            result = cache.get(key)
+            if result is not None:
+                return result
+        
+        token = self.execute_task(config)
+        try:
+            self.wait_until_ready(token, deadline=ready_timeout)
+            result = self.send_webhook(token, webhook_data)
+        finally:
+            self._cancel_quietly(token)
+        
+        if key is not None and _cacheable(result):
+            cache.put(key, result)
+        return result
+    
+    def process_directory(
+        self,
+        config: Union[PipelineConfig, CompiledPipeline, Dict[str, Any]],
+        directory: Union[str, Path],
+        extensions: List[str] = None,
+        min_size: int = 0,
+        max_size: int = None,
+        recursive: bool = True,
+        max_workers: int = 8,
+        sink: ResultSink = None,
+        **kwargs: Any
+    ) -> BatchStats:
+        """
+        Process every matching file under a directory in parallel.
+        
+        Files are found with ``os.scandir`` and processed by a BatchRunner:
+        up to ``max_workers`` at a time, each worker reusing its own warm
+        webhook task. Results are passed to ``sink`` as they complete.
+        
+        Args:
+            config: Task configuration applied to every file
+            directory: Directory to scan
+            extensions: Only process files with these suffixes
+            min_size: Skip files smaller than this many bytes
+            max_size: Skip files larger than this many bytes
+            recursive: Descend into subdirectories
+            max_workers: Maximum files processed concurrently
+            sink: Optional callable receiving each BatchResult
+            **kwargs: Further BatchRunner options (cache, task_pool, parse,
+                    ready_timeout, timeout, use_mmap, journal,
+                    retry_failed, concurrency_limiter); without a limiter
+                    here or on the client, the runner adapts its uploads
+                    with its own
+            
+        Returns:
+            BatchStats with counts and throughput
+            
+        Example:
+            >>> with JsonLinesSink("results.jsonl") as sink:
+            ...     stats = client.process_directory(config, "documents/", extensions=[".pdf"], sink=sink)
+            >>> print(f"{stats.succeeded}/{stats.files} files, {stats.files_per_second:.1f} files/s")
+        """
+        files = scan_files(directory, extensions=extensions, min_size=min_size, max_size=max_size, recursive=recursive)
+        return BatchRunner(self, config, max_workers=max_workers, **kwargs).run(files, sink=sink)
+    
+    def _cancel_quietly(self, token: str) -> None:
+        """Cancel a task the SDK launched, logging rather than raising on failure."""
+        try:
+            self.cancel_task(token)
+        except DTCApiError as e:
+            logger.warning("Failed to cancel task %s: %s", token, e)
+    
     def get_chat_url(self, token: str, pipeline_type: str, api_key: str = None) -> str:
         """
         Get chat interface URL with session parameters.
@@ -554,13 +1293,7 @@ class DTCApiClient:
         Returns:
             Chat URL with session parameters
         """
-        api_key = api_key or self.api_key
-        params = {
-            "type": pipeline_type,
-            "token": token,
-            "apikey": api_key
-        }
-        return f"{self.base_url}/chat?" + "&".join(f"{k}={v}" for k, v in params.items())
+        return _interface_url(self.base_url, "/chat", token, pipeline_type, api_key or self.api_key)
     
     def get_dropper_url(self, token: str, pipeline_type: str, api_key: str = None) -> str:
         """
@@ -574,13 +1307,7 @@ class DTCApiClient:
         Returns:
             Dropper URL with session parameters
         """
-        api_key = api_key or self.api_key
-        params = {
-            "type": pipeline_type,
-            "token": token,
-            "apikey": api_key
-        }
-        return f"{self.base_url}/dropper?" + "&".join(f"{k}={v}" for k, v in params.items())
+        return _interface_url(self.base_url, "/dropper", token, pipeline_type, api_key or self.api_key)
     
     # Service Management Methods
     
@@ -596,18 +1323,4 @@ class DTCApiClient:
         """
         params = {"service": service_name} if service_name else {}
         response = self._make_request("GET", "/services", params=params)
-        
-        services_data = response.data or []
-        if not isinstance(services_data, list):
-            services_data = [services_data]
-        
-        return [
-            ServiceInfo(
-                name=service.get("name", ""),
-                status=service.get("status", "unknown"),
-                version=service.get("version"),
-                description=service.get("description"),
-                endpoints=service.get("endpoints")
-            )
-            for service in services_data
-        ] 
\ No newline at end of file
+        return _services_from_data(response.data) 
\ No newline at end of file
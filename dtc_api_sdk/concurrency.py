@@ -0,0 +1,302 @@
+"""
+Adaptive concurrency limiting for the DTC API SDK.
+
+Bounds the number of in-flight task launches and uploads the way TCP
+congestion control bounds a window: the limit grows by about one request per
+round of completions while latency stays near its no-load baseline, and is
+cut multiplicatively when latency climbs or requests fail, time out or are
+throttled. This finds the useful parallelism for the current server load
+instead of relying on a hand-picked thread count.
+"""
+
+import os
+import time
+import asyncio
+import threading
+import contextlib
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Iterator, List, Optional, Tuple
+
+
+# Requests that hold a concurrency slot; everything else is unlimited
+CONCURRENCY_LIMITED_ENDPOINTS: Tuple[Tuple[str, str], ...] = (
+    ("PUT", "/task"),
+    ("PUT", "/webhook"),
+    ("PUT", "/pipe/process"),
+)
+
+UNIT_BYTES = 1024 * 1024
+
+
+def body_units(body: Any) -> float:
+    """Size of a request body in MiB (at least 1), for latency normalization."""
+    size = None
+    if body is None or isinstance(body, (dict, list)):
+        size = None
+    elif hasattr(body, "__len__"):
+        size = len(body)
+    elif hasattr(body, "fileno"):
+        try:
+            size = os.fstat(body.fileno()).st_size - body.tell()
+        except (OSError, ValueError):
+            size = None
+    return max(1.0, (size or 0) / UNIT_BYTES)
+
+
+@dataclass
+class ConcurrencyStats:
+    """Concurrency limiter statistics."""
+    limit: float
+    in_flight: int
+    completed: int = 0
+    dropped: int = 0
+    decreases: int = 0
+    baseline_latency: Optional[float] = None
+    recent_latency: Optional[float] = None
+
+
+class _Slot:
+    """An acquired concurrency slot."""
+
+    __slots__ = ("epoch", "sequence", "started", "latency", "dropped")
+
+    def __init__(self, epoch: int, sequence: int):
+        self.epoch = epoch
+        self.sequence = sequence
+        self.started = time.monotonic()
+        self.latency: Optional[float] = None
+        self.dropped = False
+
+
+class ConcurrencyLimiter:
+    """
+    AIMD concurrency limiter driven by latency and failures.
+
+    Latency samples are normalized per unit of work (for uploads, per MiB)
+    so large files do not read as congestion. A limiter can be shared by
+    several clients, threads and event loops: threads wait in acquire(),
+    coroutines in acquire_async().
+
+    Example:
+        >>> limiter = ConcurrencyLimiter(initial_limit=4, max_limit=32)
+        >>> client = DTCApiClient(concurrency_limiter=limiter)
+        >>> with ThreadPoolExecutor(max_workers=32) as pool:
+        ...     list(pool.map(lambda path: client.upload_file_to_webhook(token, path), files))
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        backoff: float = 0.7,
+        latency_tolerance: float = 2.0,
+        smoothing: float = 0.2,
+        baseline_drift: float = 0.01
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            initial_limit: Starting number of concurrent requests
+            min_limit: Lowest limit the limiter backs off to
+            max_limit: Highest limit the limiter grows to
+            backoff: Factor applied to the limit on congestion
+            latency_tolerance: Recent latency above this multiple of the
+                    baseline counts as congestion
+            smoothing: Weight of each new sample in the recent latency average
+            baseline_drift: Weight of each sample in the baseline when it is
+                    above the baseline, letting the baseline follow lasting
+                    changes slowly
+        """
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("Limits must satisfy 1 <= min_limit <= initial_limit <= max_limit")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.smoothing = smoothing
+        self.baseline_drift = baseline_drift
+
+        self._condition = threading.Condition()
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._epoch = 0
+        self._acquired = 0
+        self._last_full = -1
+        self._baseline: Optional[float] = None
+        self._recent: Optional[float] = None
+        self._completed = 0
+        self._dropped = 0
+        self._decreases = 0
+        self._async_waiters: List[Tuple[asyncio.AbstractEventLoop, "asyncio.Future[None]"]] = []
+
+    @property
+    def limit(self) -> int:
+        """Current number of requests allowed in flight."""
+        return int(self._limit)
+
+    def acquire(self, timeout: float = None) -> _Slot:
+        """
+        Wait for a free slot.
+
+        Args:
+            timeout: Maximum seconds to wait; None waits indefinitely
+
+        Returns:
+            Slot to pass to release()
+
+        Raises:
+            TimeoutError: If no slot frees up in time
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._in_flight < int(self._limit), timeout):
+                raise TimeoutError("No concurrency slot became available in time")
+            return self._take()
+
+    async def acquire_async(self, timeout: float = None) -> _Slot:
+        """
+        Wait for a free slot without blocking the event loop.
+
+        Args:
+            timeout: Maximum seconds to wait; None waits indefinitely
+
+        Returns:
+            Slot to pass to release()
+
+        Raises:
+            TimeoutError: If no slot frees up in time
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while True:
+            with self._condition:
+                if self._in_flight < int(self._limit):
+                    return self._take()
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+            try:
+                remaining = None if deadline is None else deadline - loop.time()
+                if remaining is not None and remaining <= 0:
+                    raise asyncio.TimeoutError
+                await asyncio.wait_for(waiter, remaining)
+            except asyncio.TimeoutError:
+                raise TimeoutError("No concurrency slot became available in time") from None
+            finally:
+                with self._condition:
+                    if (loop, waiter) in self._async_waiters:
+                        self._async_waiters.remove((loop, waiter))
+
+    def _take(self) -> _Slot:
+        self._in_flight += 1
+        self._acquired += 1
+        if self._in_flight >= int(self._limit):
+            self._last_full = self._acquired
+        return _Slot(self._epoch, self._acquired)
+
+    def release(self, slot: _Slot, latency: float = None, dropped: bool = False, units: float = 1.0) -> None:
+        """
+        Return a slot and adapt the limit.
+
+        Args:
+            slot: Slot returned by acquire()
+            latency: Seconds the request took; measured from acquire() if omitted
+            dropped: The request failed in a way that signals overload
+                    (timeout, connection failure, 429 or 5xx)
+            units: Amount of work the request carried, used to normalize latency
+        """
+        if latency is None:
+            latency = time.monotonic() - slot.started
+        with self._condition:
+            if self._in_flight >= int(self._limit):
+                self._last_full = self._acquired
+            self._in_flight -= 1
+            self._completed += 1
+            if dropped:
+                self._dropped += 1
+                self._decrease(slot)
+            else:
+                sample = latency / max(units, 1e-9)
+                self._observe(sample)
+                if self._recent > self._baseline * self.latency_tolerance:
+                    self._decrease(slot)
+                elif self._last_full >= slot.sequence:
+                    # Only requests that saw the limit in full use say
+                    # anything about whether it could be higher
+                    # Additive increase: about +1 per limit's worth of completions
+                    self._limit = min(float(self.max_limit), self._limit + 1.0 / self._limit)
+            self._condition.notify_all()
+            waiters, self._async_waiters = self._async_waiters, []
+        # Waiting coroutines recheck the limit on their own loops
+        for loop, waiter in waiters:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(_wake, waiter)
+
+    @contextlib.contextmanager
+    def slot(self, units: float = 1.0, timeout: float = None) -> Iterator[_Slot]:
+        """
+        Hold a slot for the duration of a block.
+
+        The block may set ``slot.dropped = True`` to report an overload
+        failure without raising. Exceptions leaving the block count as
+        dropped requests.
+        """
+        acquired = self.acquire(timeout)
+        try:
+            yield acquired
+        except BaseException:
+            acquired.dropped = True
+            raise
+        finally:
+            self.release(acquired, latency=acquired.latency, dropped=acquired.dropped, units=units)
+
+    @contextlib.asynccontextmanager
+    async def aslot(self, units: float = 1.0, timeout: float = None) -> AsyncIterator[_Slot]:
+        """Async counterpart of slot() for coroutines."""
+        acquired = await self.acquire_async(timeout)
+        try:
+            yield acquired
+        except BaseException:
+            acquired.dropped = True
+            raise
+        finally:
+            self.release(acquired, latency=acquired.latency, dropped=acquired.dropped, units=units)
+
+    def stats(self) -> ConcurrencyStats:
+        """Return a snapshot of the limiter's state."""
+        with self._condition:
+            return ConcurrencyStats(
+                limit=self._limit,
+                in_flight=self._in_flight,
+                completed=self._completed,
+                dropped=self._dropped,
+                decreases=self._decreases,
+                baseline_latency=self._baseline,
+                recent_latency=self._recent
+            )
+
+    def _observe(self, sample: float) -> None:
+        if self._baseline is None:
+            self._baseline = self._recent = sample
+            return
+        self._recent += self.smoothing * (sample - self._recent)
+        if sample < self._baseline:
+            self._baseline = sample
+        else:
+            self._baseline += self.baseline_drift * (sample - self._baseline)
+
+    def _decrease(self, slot: _Slot) -> None:
+        # Requests sent before the last decrease saw the old limit; reacting
+        # to each of them would collapse the limit for one congestion event
+        if slot.epoch != self._epoch:
+            return
+        self._epoch += 1
+        self._decreases += 1
+        self._limit = max(float(self.min_limit), self._limit * self.backoff)
+        # Judge the new limit on fresh samples only
+        self._recent = self._baseline
+
+
+def _wake(waiter: "asyncio.Future[None]") -> None:
+    if not waiter.done():
+        waiter.set_result(None)
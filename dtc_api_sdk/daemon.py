@@ -0,0 +1,287 @@
+"""
+Local processing daemon for the DTC API SDK.
+
+A long-running process holds one client (with its pooled connections), a
+BatchRunner's warm webhook tasks and an optional result cache, and accepts
+jobs over a Unix domain socket. Shell pipelines then pay a socket round
+trip per document instead of interpreter start-up, imports, TLS handshakes
+and engine cold start.
+
+Protocol: UTF-8 JSON, one object per line in each direction. Each request
+gets exactly one response, in order, on the same connection::
+
+    -> {"id": 1, "op": "process", "path": "/data/a.pdf"}
+    <- {"id": 1, "ok": true, "path": "/data/a.pdf", "result": {...}, ...}
+
+Operations are ``process`` (``path``), ``ping``, ``stats`` and
+``shutdown``. Failed requests return ``"ok": false`` and an ``error``.
+"""
+
+import os
+import json
+import socket
+import logging
+import threading
+import socketserver
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Union
+from pathlib import Path
+
+if TYPE_CHECKING:  # pragma: no cover - loaded by the daemon process only
+    from .batch import BatchRunner
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET = "~/.dtc_daemon.sock"
+MAX_LINE_BYTES = 1024 * 1024
+
+
+def default_socket_path() -> str:
+    """Socket path from ``$DTC_DAEMON_SOCKET``, else ``~/.dtc_daemon.sock``."""
+    return os.path.expanduser(os.getenv("DTC_DAEMON_SOCKET") or DEFAULT_SOCKET)
+
+
+class DaemonError(Exception):
+    """Raised by DaemonClient when the daemon cannot be reached or answers badly."""
+    pass
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: "_SocketServer"
+
+    def handle(self) -> None:
+        while True:
+            line = self.rfile.readline(MAX_LINE_BYTES + 1)
+            if not line:
+                return
+            if len(line) > MAX_LINE_BYTES:
+                self._reply({"ok": False, "error": "Request line too long"})
+                return
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("request must be a JSON object")
+            except ValueError as e:
+                self._reply({"ok": False, "error": f"Invalid request: {e}"})
+                continue
+            response = self.server.daemon.dispatch(request)
+            if "id" in request:
+                response["id"] = request["id"]
+            self._reply(response)
+
+    def _reply(self, response: Dict[str, Any]) -> None:
+        self.wfile.write(json.dumps(response, ensure_ascii=False, default=str).encode("utf-8") + b"\n")
+        self.wfile.flush()
+
+
+class _SocketServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    daemon: "DaemonServer"
+
+
+class DaemonServer:
+    """
+    Serves BatchRunner.process() over a Unix domain socket.
+
+    At most ``runner.max_workers`` files are processed at once across all
+    connections; further requests wait for a free slot.
+
+    Example:
+        >>> runner = BatchRunner(client, compiled_config, max_workers=8, cache=cache)
+        >>> with DaemonServer(runner, "/tmp/dtc.sock") as server:
+        ...     server.serve_forever()
+    """
+
+    def __init__(self, runner: "BatchRunner", socket_path: Union[str, Path] = None):
+        """
+        Bind the socket.
+
+        Args:
+            runner: Runner whose warm tasks, cache and client process the jobs
+            socket_path: Socket file; defaults to default_socket_path()
+
+        Raises:
+            DaemonError: If another daemon is already listening on the socket
+        """
+        self.runner = runner
+        self.socket_path = os.fspath(socket_path) if socket_path is not None else default_socket_path()
+        self._slots = threading.BoundedSemaphore(runner.max_workers)
+        self._operations: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+            "process": self._process,
+            "ping": lambda request: {"ok": True},
+            "stats": self._stats,
+            "shutdown": self._shutdown,
+        }
+
+        _remove_stale_socket(self.socket_path)
+        # The daemon acts with the owner's API key; keep other users out.
+        # The socket is created owner-only rather than chmod'ed after bind,
+        # which would leave it connectable in between.
+        umask = os.umask(0o077)
+        try:
+            self._server = _SocketServer(self.socket_path, _Handler)
+        finally:
+            os.umask(umask)
+        self._server.daemon = self
+
+    def __enter__(self) -> "DaemonServer":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def serve_forever(self) -> None:
+        """Handle connections until shutdown() is called or a client sends ``shutdown``."""
+        logger.info("DTC daemon listening on %s", self.socket_path)
+        self._server.serve_forever()
+
+    def shutdown(self) -> None:
+        """Stop serve_forever(); safe to call from any thread but the serving one."""
+        self._server.shutdown()
+
+    def close(self) -> None:
+        """Close the socket and remove its file. The runner is left to the caller."""
+        self._server.server_close()
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+
+    def dispatch(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one request and build its response."""
+        operation = self._operations.get(request.get("op"))
+        if operation is None:
+            return {"ok": False, "error": f"Unknown op: {request.get('op')!r}"}
+        try:
+            return operation(request)
+        except Exception as e:  # pragma: no cover - keep serving other requests
+            logger.exception("Daemon request failed")
+            return {"ok": False, "error": f"{type(e).__name__}: {e}"}
+
+    def _process(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        path = request.get("path")
+        if not isinstance(path, str):
+            return {"ok": False, "error": "process needs a string path"}
+        with self._slots:
+            result = self.runner.process(path)
+        return {"ok": result.ok, **result.to_dict()}
+
+    def _stats(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        stats = self.runner.stats()
+        return {
+            "ok": True,
+            **vars(stats),
+            "files_per_second": stats.files_per_second,
+            "bytes_per_second": stats.bytes_per_second,
+        }
+
+    def _shutdown(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        # shutdown() blocks until serve_forever() returns, so not on a handler thread
+        threading.Thread(target=self._server.shutdown, daemon=True).start()
+        return {"ok": True}
+
+
+def _remove_stale_socket(path: str) -> None:
+    """Remove a socket file left by a dead daemon; refuse to replace a live one."""
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except (ConnectionRefusedError, FileNotFoundError):
+        os.unlink(path)
+        return
+    finally:
+        probe.close()
+    raise DaemonError(f"A daemon is already listening on {path}")
+
+
+class DaemonClient:
+    """
+    Client for a running daemon. One connection, reused for every request.
+
+    Imports nothing beyond the standard library, so short-lived processes
+    start quickly.
+
+    Example:
+        >>> with DaemonClient() as daemon:
+        ...     response = daemon.process("document.pdf")
+    """
+
+    def __init__(self, socket_path: Union[str, Path] = None, timeout: float = None):
+        """
+        Initialize the client; the connection opens on the first request.
+
+        Args:
+            socket_path: Socket file; defaults to default_socket_path()
+            timeout: Seconds to wait for each response; None waits indefinitely
+        """
+        self.socket_path = os.fspath(socket_path) if socket_path is not None else default_socket_path()
+        self.timeout = timeout
+        self._socket: Optional[socket.socket] = None
+        self._reader: Any = None
+        self._next_id = 0
+
+    def __enter__(self) -> "DaemonClient":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def request(self, op: str, **fields: Any) -> Dict[str, Any]:
+        """
+        Send one request and wait for its response.
+
+        Raises:
+            DaemonError: If the daemon is not running or the connection breaks
+        """
+        if self._socket is None:
+            self._connect()
+        self._next_id += 1
+        message = json.dumps({"id": self._next_id, "op": op, **fields}).encode("utf-8") + b"\n"
+        try:
+            self._socket.sendall(message)
+            line = self._reader.readline()
+        except OSError as e:
+            self.close()
+            raise DaemonError(f"Lost connection to daemon: {e}") from e
+        if not line:
+            self.close()
+            raise DaemonError("Daemon closed the connection")
+        return json.loads(line)
+
+    def process(self, path: Union[str, Path]) -> Dict[str, Any]:
+        """Process a file; relative paths are resolved against this process's directory."""
+        return self.request("process", path=os.path.abspath(os.fspath(path)))
+
+    def ping(self) -> bool:
+        """True if the daemon answers."""
+        return bool(self.request("ping").get("ok"))
+
+    def stats(self) -> Dict[str, Any]:
+        """The daemon's accumulated BatchStats fields."""
+        return self.request("stats")
+
+    def shutdown(self) -> None:
+        """Ask the daemon to stop."""
+        self.request("shutdown")
+        self.close()
+
+    def close(self) -> None:
+        """Close the connection."""
+        if self._socket is not None:
+            self._reader.close()
+            self._socket.close()
+            self._socket = self._reader = None
+
+    def _connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError as e:
+            sock.close()
+            raise DaemonError(f"No daemon listening on {self.socket_path}: {e}") from e
+        self._socket = sock
+        self._reader = sock.makefile("rb")
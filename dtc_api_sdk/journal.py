@@ -0,0 +1,210 @@
+"""
+Crash-safe job journal for the DTC API SDK.
+
+Records the state of every file in a batch, and every webhook task the batch
+launched, in a SQLite database in WAL mode. Each transition is committed
+before the batch moves on, so after a crash a new run skips finished files,
+retries interrupted ones and finds the server tasks the dead run left behind.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+
+class FileState(str, Enum):
+    """Journal states of a file."""
+    QUEUED = "queued"
+    TASK_CREATED = "task_created"  # Assigned to a task; upload not finished
+    UPLOADED = "uploaded"          # Upload finished; result not yet recorded
+    DONE = "done"
+    FAILED = "failed"
+
+
+# States a crashed run can leave a file in while it was being processed
+IN_FLIGHT_STATES = (FileState.TASK_CREATED.value, FileState.UPLOADED.value)
+
+
+def _file_key(path: Union[str, Path]) -> str:
+    """Journal key of a file: its absolute path, so ``x``, ``./x`` and runs from other directories agree."""
+    return os.path.abspath(os.fspath(path))
+
+
+class JobJournal:
+    """
+    Per-file progress of a batch job, persisted in SQLite.
+
+    One journal file describes one job. Pass it to BatchRunner (or
+    ``process_directory(journal=...)``) and run the same job again after a
+    failure to resume it. Files are recorded by absolute path, so the job
+    can be resumed from another working directory.
+
+    Example:
+        >>> with JobJournal("invoices.journal") as journal:
+        ...     stats = client.process_directory(config, "invoices/", journal=journal)
+        >>> print(stats.skipped, "files were already done")
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Open or create a journal.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        # Survives process crashes; only an OS crash can lose the last commits
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "path TEXT PRIMARY KEY, state TEXT NOT NULL, token TEXT, result TEXT, "
+            "error TEXT, attempts INTEGER NOT NULL DEFAULT 0, updated REAL NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS tasks ("
+            "token TEXT PRIMARY KEY, created REAL NOT NULL, finished REAL)"
+        )
+
+    def __enter__(self) -> "JobJournal":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    # Files
+
+    def enqueue(self, path: Union[str, Path], retry_failed: bool = True) -> bool:
+        """
+        Record a file as queued unless it is already done.
+
+        Args:
+            path: File path
+            retry_failed: Queue files that failed in an earlier run again
+
+        Returns:
+            True if the file needs processing
+        """
+        key = _file_key(path)
+        with self._lock:
+            row = self._connection.execute("SELECT state FROM files WHERE path = ?", (key,)).fetchone()
+            if row is not None and (row[0] == FileState.DONE.value or (row[0] == FileState.FAILED.value and not retry_failed)):
+                return False
+            self._connection.execute(
+                "INSERT INTO files (path, state, updated) VALUES (?, ?, ?) "
+                "ON CONFLICT(path) DO UPDATE SET state = excluded.state, token = NULL, updated = excluded.updated",
+                (key, FileState.QUEUED.value, time.time())
+            )
+        return True
+
+    def mark(
+        self,
+        path: Union[str, Path],
+        state: FileState,
+        token: str = None,
+        result: Any = None,
+        error: str = None
+    ) -> None:
+        """
+        Record a file's new state.
+
+        Args:
+            path: File path
+            state: New state
+            token: Task the file was assigned to (TASK_CREATED)
+            result: Result to keep (DONE); stored as JSON
+            error: Failure message (FAILED)
+        """
+        state = FileState(state)
+        encoded = json.dumps(result, default=str) if state == FileState.DONE else None
+        with self._lock:
+            if state == FileState.TASK_CREATED:
+                self._connection.execute(
+                    "UPDATE files SET state = ?, token = ?, attempts = attempts + 1, updated = ? WHERE path = ?",
+                    (state.value, token, time.time(), _file_key(path))
+                )
+            else:
+                self._connection.execute(
+                    "UPDATE files SET state = ?, result = COALESCE(?, result), error = ?, updated = ? WHERE path = ?",
+                    (state.value, encoded, error, time.time(), _file_key(path))
+                )
+
+    def state(self, path: Union[str, Path]) -> Optional[FileState]:
+        """Return a file's state, or None if it is not in the journal."""
+        with self._lock:
+            row = self._connection.execute("SELECT state FROM files WHERE path = ?", (_file_key(path),)).fetchone()
+        return FileState(row[0]) if row else None
+
+    def result(self, path: Union[str, Path]) -> Any:
+        """Return the stored result of a finished file, or None."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT result FROM files WHERE path = ? AND state = ?", (_file_key(path), FileState.DONE.value)
+            ).fetchone()
+        return json.loads(row[0]) if row and row[0] is not None else None
+
+    def results(self) -> Iterator[Tuple[str, Any]]:
+        """Yield ``(absolute path, result)`` for every finished file."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT path, result FROM files WHERE state = ? ORDER BY path", (FileState.DONE.value,)
+            ).fetchall()
+        for path, result in rows:
+            yield path, json.loads(result) if result is not None else None
+
+    def summary(self) -> Dict[str, int]:
+        """Number of files in each state."""
+        with self._lock:
+            rows = self._connection.execute("SELECT state, COUNT(*) FROM files GROUP BY state").fetchall()
+        counts = {state.value: 0 for state in FileState}
+        counts.update(dict(rows))
+        return counts
+
+    # Tasks
+
+    def task_started(self, token: str) -> None:
+        """Record a task launched for the job."""
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO tasks (token, created, finished) VALUES (?, ?, NULL)", (token, time.time())
+            )
+
+    def task_finished(self, token: str) -> None:
+        """Record that a task was cancelled or otherwise released."""
+        with self._lock:
+            self._connection.execute("UPDATE tasks SET finished = ? WHERE token = ?", (time.time(), token))
+
+    def open_tasks(self) -> List[str]:
+        """Tasks launched for the job and never released."""
+        with self._lock:
+            rows = self._connection.execute("SELECT token FROM tasks WHERE finished IS NULL ORDER BY created").fetchall()
+        return [row[0] for row in rows]
+
+    def recover(self) -> List[str]:
+        """
+        Prepare the journal for a resumed run.
+
+        Files left in flight by a crashed run are queued again.
+
+        Returns:
+            Tasks the crashed run left open, to be reclaimed or cancelled
+        """
+        with self._lock:
+            placeholders = ", ".join("?" for _ in IN_FLIGHT_STATES)
+            self._connection.execute(
+                f"UPDATE files SET state = ?, token = NULL, updated = ? WHERE state IN ({placeholders})",
+                (FileState.QUEUED.value, time.time(), *IN_FLIGHT_STATES)
+            )
+        return self.open_tasks()
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._connection.close()
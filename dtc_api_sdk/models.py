@@ -2,6 +2,8 @@
 Data models for the DTC API SDK.
 """
 
+import re
+import time
 from dataclasses import dataclass, field
 from typing import Any, Dict, Optional, List, Union
 from enum import Enum
@@ -71,6 +73,25 @@ class PipelineConfig:
         return result
 
 
+@dataclass(frozen=True)
+class CompiledPipeline:
+    """
+    Pipeline configuration pre-serialized for repeated submission.
+
+    Produced by ``PipelineGraph.compile()``. ``body`` is the compact JSON
+    request body, sent as-is by create_pipeline, validate_pipeline and
+    execute_task; ``config`` is the parsed form and must not be modified.
+    """
+    config: Dict[str, Any]
+    body: bytes
+    digest: str
+
+    @property
+    def size(self) -> int:
+        """Size of the request body in bytes."""
+        return len(self.body)
+
+
 @dataclass
 class PipelineInfo:
     """Pipeline information model."""
@@ -92,6 +113,217 @@ class TaskInfo:
     completed_at: Optional[str] = None
     error_message: Optional[str] = None
     result: Optional[Dict[str, Any]] = None
+    snapshot: Optional["TaskStatusSnapshot"] = None
+
+
+_TRACE_LINE = re.compile(r"^\[(\d+)MB\]\s?(.*)$")
+
+
+@dataclass
+class TraceEntry:
+    """One line of an engine trace."""
+    message: str
+    memory_mb: Optional[int] = None
+
+    @classmethod
+    def parse(cls, line: str) -> "TraceEntry":
+        """Parse a raw trace line such as ``"[79MB] [E] beginEndpoint : webhook"``."""
+        match = _TRACE_LINE.match(line)
+        if match:
+            return cls(message=match.group(2), memory_mb=int(match.group(1)))
+        return cls(message=line)
+
+
+class TaskStatusSnapshot:
+    """
+    Point-in-time view of a running task as reported by ``GET /task``.
+    
+    Holds the engine's counters (sizes in bytes, object counts, rates) and
+    derives throughput and an ETA from them. The ``trace`` list can run to
+    thousands of lines, so it is only kept when requested with
+    ``include_trace=True`` and is parsed on first access.
+    """
+    
+    __slots__ = (
+        "completed", "status", "service_up", "exit_code", "exit_message",
+        "current_object", "current_size", "start_time", "end_time",
+        "total_size", "total_count", "completed_size", "completed_count",
+        "failed_size", "failed_count", "words_size", "words_count",
+        "rate_size", "rate_count", "errors", "warnings", "notes", "metrics",
+        "trace_length", "_raw_trace", "_trace",
+    )
+    
+    def __init__(
+        self,
+        completed: bool = False,
+        status: str = "",
+        service_up: bool = False,
+        exit_code: int = 0,
+        exit_message: str = "",
+        current_object: str = "",
+        current_size: int = 0,
+        start_time: float = 0.0,
+        end_time: float = 0.0,
+        total_size: int = 0,
+        total_count: int = 0,
+        completed_size: int = 0,
+        completed_count: int = 0,
+        failed_size: int = 0,
+        failed_count: int = 0,
+        words_size: int = 0,
+        words_count: int = 0,
+        rate_size: float = 0.0,
+        rate_count: float = 0.0,
+        errors: Optional[List[Any]] = None,
+        warnings: Optional[List[Any]] = None,
+        notes: Optional[List[str]] = None,
+        metrics: Optional[Dict[str, Any]] = None,
+        trace: Optional[List[str]] = None,
+        trace_length: int = None
+    ):
+        self.completed = completed
+        self.status = status
+        self.service_up = service_up
+        self.exit_code = exit_code
+        self.exit_message = exit_message
+        self.current_object = current_object
+        self.current_size = current_size
+        self.start_time = start_time
+        self.end_time = end_time
+        self.total_size = total_size
+        self.total_count = total_count
+        self.completed_size = completed_size
+        self.completed_count = completed_count
+        self.failed_size = failed_size
+        self.failed_count = failed_count
+        self.words_size = words_size
+        self.words_count = words_count
+        self.rate_size = rate_size
+        self.rate_count = rate_count
+        self.errors = errors or []
+        self.warnings = warnings or []
+        self.notes = notes or []
+        self.metrics = metrics or {}
+        self.trace_length = len(trace or []) if trace_length is None else trace_length
+        self._raw_trace = trace
+        self._trace = None
+    
+    @classmethod
+    def from_payload(cls, data: Dict[str, Any], include_trace: bool = False) -> "TaskStatusSnapshot":
+        """
+        Build a snapshot from the ``data`` field of a ``GET /task`` response.
+        
+        Args:
+            data: Raw task payload
+            include_trace: Keep the engine trace for later parsing
+            
+        Returns:
+            TaskStatusSnapshot
+        """
+        trace = data.get("trace") or []
+        return cls(
+            completed=bool(data.get("completed")),
+            status=data.get("status") or "",
+            service_up=bool(data.get("serviceUp")),
+            exit_code=data.get("exitCode") or 0,
+            exit_message=data.get("exitMsg") or "",
+            current_object=data.get("currentObject") or "",
+            current_size=data.get("currentSize") or 0,
+            start_time=data.get("startTime") or 0.0,
+            end_time=data.get("endTime") or 0.0,
+            total_size=data.get("totalSize") or 0,
+            total_count=data.get("totalCount") or 0,
+            completed_size=data.get("completedSize") or 0,
+            completed_count=data.get("completedCount") or 0,
+            failed_size=data.get("failedSize") or 0,
+            failed_count=data.get("failedCount") or 0,
+            words_size=data.get("wordsSize") or 0,
+            words_count=data.get("wordsCount") or 0,
+            rate_size=data.get("rateSize") or 0.0,
+            rate_count=data.get("rateCount") or 0.0,
+            errors=data.get("errors"),
+            warnings=data.get("warnings"),
+            notes=data.get("notes"),
+            metrics=data.get("metrics"),
+            trace=trace if include_trace else None,
+            trace_length=len(trace)
+        )
+    
+    def __repr__(self) -> str:
+        return (
+            f"TaskStatusSnapshot(status={self.status!r}, completed={self.completed}, "
+            f"objects={self.completed_count}/{self.total_count}, "
+            f"bytes={self.completed_size}/{self.total_size})"
+        )
+    
+    @property
+    def task_status(self) -> TaskStatus:
+        """Map the engine state to a TaskStatus."""
+        if not self.completed:
+            return TaskStatus.RUNNING
+        if self.exit_code:
+            return TaskStatus.FAILED
+        return TaskStatus.COMPLETED
+    
+    @property
+    def trace(self) -> Optional[List[TraceEntry]]:
+        """Parsed engine trace, or None if the snapshot was taken without it."""
+        if self._raw_trace is None:
+            return None
+        if self._trace is None:
+            self._trace = [TraceEntry.parse(line) for line in self._raw_trace]
+        return self._trace
+    
+    def elapsed(self, now: float = None) -> float:
+        """Seconds the task has been running (or ran, once finished)."""
+        if not self.start_time:
+            return 0.0
+        end = self.end_time or (time.time() if now is None else now)
+        return max(0.0, end - self.start_time)
+    
+    @property
+    def progress(self) -> Optional[float]:
+        """Fraction of the work processed, by bytes or else by object count."""
+        if self.total_size:
+            return min(1.0, (self.completed_size + self.failed_size) / self.total_size)
+        if self.total_count:
+            return min(1.0, (self.completed_count + self.failed_count) / self.total_count)
+        return None
+    
+    def bytes_per_second(self, now: float = None) -> float:
+        """Processing throughput in bytes per second."""
+        if self.rate_size:
+            return float(self.rate_size)
+        elapsed = self.elapsed(now)
+        return self.completed_size / elapsed if elapsed else 0.0
+    
+    def objects_per_second(self, now: float = None) -> float:
+        """Processing throughput in objects per second."""
+        if self.rate_count:
+            return float(self.rate_count)
+        elapsed = self.elapsed(now)
+        return self.completed_count / elapsed if elapsed else 0.0
+    
+    def eta_seconds(self, now: float = None) -> Optional[float]:
+        """
+        Estimate seconds until the task finishes its known work.
+        
+        Returns:
+            Estimated seconds, 0.0 once completed, or None when no rate is known
+        """
+        if self.completed:
+            return 0.0
+        if self.total_size:
+            rate = self.bytes_per_second(now)
+            remaining = self.total_size - self.completed_size - self.failed_size
+        elif self.total_count:
+            rate = self.objects_per_second(now)
+            remaining = self.total_count - self.completed_count - self.failed_count
+        else:
+            return None
+        if rate <= 0:
+            return None
+        return max(0.0, remaining) / rate
 
 
 @dataclass
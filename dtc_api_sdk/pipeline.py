@@ -0,0 +1,700 @@
+"""
+Pipeline configuration helpers for the DTC API SDK.
+
+Canonicalizes and hashes pipeline configurations, compiles them into
+pre-serialized request bodies, and caches server pipeline tokens by
+configuration hash so that services which keep creating the same pipeline
+reuse a live one instead of creating a new pipeline on every call.
+"""
+
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, FrozenSet, List, Optional, Set, Tuple, Union
+
+from .models import PipelineConfig, CompiledPipeline
+from .exceptions import DTCApiError, ValidationError
+from .reaper import GONE_STATUS_CODES
+
+if TYPE_CHECKING:  # pragma: no cover - the client imports this module
+    from .client import DTCApiClient
+
+logger = logging.getLogger(__name__)
+
+# Called as is_alive(token); returning False drops the cached token
+LivenessCheck = Callable[[str], bool]
+
+# Outcomes of a PipelineCache liveness check
+_ALIVE = "alive"
+_DEAD = "dead"        # Reported unusable; may still exist on the server
+_GONE = "gone"        # The server no longer knows the token
+_UNKNOWN = "unknown"  # The check itself failed transiently
+
+
+# Lanes emitted and accepted by known providers. Providers missing from a
+# table are not checked; the response sink accepts every lane.
+OUTPUT_LANES: Dict[str, FrozenSet[str]] = {
+    "webhook": frozenset({"tags", "text"}),
+    "dropper": frozenset({"tags", "text"}),
+    "parse": frozenset({"text", "audio", "video", "image", "table"}),
+    "audio_transcribe": frozenset({"text"}),
+    "response": frozenset(),
+}
+INPUT_LANES: Dict[str, FrozenSet[str]] = {
+    "webhook": frozenset(),
+    "dropper": frozenset(),
+    "parse": frozenset({"tags"}),
+    "audio_transcribe": frozenset({"audio", "video"}),
+}
+SOURCE_PROVIDERS = frozenset({"webhook", "dropper"})
+SINK_PROVIDERS = frozenset({"response"})
+
+VALIDATION_CACHE_SIZE = 256
+
+
+def _config_to_dict(config: Union[PipelineConfig, CompiledPipeline, Dict[str, Any]]) -> Dict[str, Any]:
+    """Normalize a pipeline configuration to a plain dictionary."""
+    if isinstance(config, PipelineConfig):
+        return config.to_dict()
+    if isinstance(config, CompiledPipeline):
+        return config.config
+    return config
+
+
+def _strip_ui(pipeline: Dict[str, Any]) -> Dict[str, Any]:
+    if not isinstance(pipeline, dict):
+        return pipeline
+    stripped = {key: value for key, value in pipeline.items() if key != "ui"}
+    components = stripped.get("components")
+    if isinstance(components, list):
+        stripped["components"] = [
+            {key: value for key, value in component.items() if key != "ui"}
+            if isinstance(component, dict) else component
+            for component in components
+        ]
+    return stripped
+
+
+def canonicalize(config: Union[PipelineConfig, CompiledPipeline, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Return a configuration without its editor-only parts.
+
+    ``ui`` blocks (canvas positions, edges drawn in the pipeline designer)
+    are removed from the pipeline and from every component; they do not
+    affect processing. Both bare pipelines and ``{"pipeline": ...}`` task
+    configurations are accepted. The input is not modified.
+    """
+    config_dict = _strip_ui(_config_to_dict(config))
+    if isinstance(config_dict, dict) and isinstance(config_dict.get("pipeline"), dict):
+        config_dict["pipeline"] = _strip_ui(config_dict["pipeline"])
+    return config_dict
+
+
+def canonical_json(config: Union[PipelineConfig, CompiledPipeline, Dict[str, Any]]) -> bytes:
+    """Serialize a canonicalized configuration with sorted keys and no whitespace."""
+    if isinstance(config, CompiledPipeline):
+        return config.body
+    return json.dumps(canonicalize(config), sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def config_hash(config: Union[PipelineConfig, CompiledPipeline, Dict[str, Any]]) -> str:
+    """SHA-256 of a configuration's canonical form; equal for equivalent configs."""
+    if isinstance(config, CompiledPipeline):
+        return config.digest
+    return hashlib.sha256(canonical_json(config)).hexdigest()
+
+
+class PipelineGraph:
+    """
+    A pipeline configuration as a set of connected components.
+
+    Accepts pipeline designer exports (``example_pipelines/*.json``), bare
+    pipelines and ``{"pipeline": ...}`` task configurations. compile()
+    drops the designer's ``ui`` blocks, which make up most of an export but
+    are never read by the engine, and serializes the result once so that
+    repeated submissions skip JSON encoding.
+
+    Example:
+        >>> graph = PipelineGraph.load("example_pipelines/simpleparser.json")
+        >>> pipeline_token = client.create_pipeline(graph.compile())
+        >>> task = graph.as_task().compile()
+        >>> tokens = [client.execute_task(task) for _ in range(10)]
+    """
+
+    def __init__(self, config: Union[PipelineConfig, CompiledPipeline, Dict[str, Any]]):
+        """
+        Initialize the graph.
+
+        Args:
+            config: Pipeline or task configuration; not modified
+        """
+        self.config = canonicalize(config)
+        self._compiled: Optional[CompiledPipeline] = None
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "PipelineGraph":
+        """Build a graph from a pipeline JSON file."""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    @property
+    def pipeline(self) -> Dict[str, Any]:
+        """The pipeline itself, unwrapped from a task configuration if necessary."""
+        pipeline = self.config.get("pipeline")
+        return pipeline if isinstance(pipeline, dict) else self.config
+
+    @property
+    def components(self) -> Dict[str, Dict[str, Any]]:
+        """Components by id, in configuration order."""
+        return {
+            component.get("id"): component
+            for component in self.pipeline.get("components") or []
+            if isinstance(component, dict)
+        }
+
+    def as_task(self) -> "PipelineGraph":
+        """Return the graph wrapped as a ``{"pipeline": ...}`` task configuration."""
+        if self.pipeline is not self.config:
+            return self
+        return PipelineGraph({"pipeline": self.config})
+
+    def optimize(self, collapse_shadowed_lanes: bool = False) -> "OptimizationReport":
+        """
+        Remove work that cannot affect the pipeline's output.
+
+        - Components with no path to a sink are removed (skipped when the
+          graph has no known sink, since unknown providers may be sinks).
+          Source components are always kept.
+        - Duplicate input edges (same lane from the same component) are
+          collapsed.
+        - With ``collapse_shadowed_lanes``, when a component receives the
+          same lane from a component and from one of that component's
+          ancestors, the ancestor's edge is dropped. In simpleparser.json
+          this removes the raw ``text`` lane webhook_1 sends the response
+          next to parse_1's parsed text. This changes the output, so it is
+          opt-in.
+
+        Args:
+            collapse_shadowed_lanes: Also drop lanes shadowed by a descendant
+
+        Returns:
+            OptimizationReport with the optimized graph
+
+        Raises:
+            ValidationError: If the graph is invalid
+        """
+        self.validate().raise_for_errors()
+        components = self.components
+        inputs = {
+            component_id: list(component.get("input") or [])
+            for component_id, component in components.items()
+        }
+        removed_edges = 0
+
+        for component_id, edges in inputs.items():
+            seen = set()
+            unique = []
+            for edge in edges:
+                key = (edge.get("lane"), edge.get("from"))
+                if key not in seen:
+                    seen.add(key)
+                    unique.append(edge)
+            removed_edges += len(edges) - len(unique)
+            inputs[component_id] = unique
+
+        if collapse_shadowed_lanes:
+            ancestors = _ancestors(inputs)
+            for component_id, edges in inputs.items():
+                kept = [
+                    edge for edge in edges
+                    if not any(
+                        other.get("lane") == edge.get("lane") and edge.get("from") in ancestors[other.get("from")]
+                        for other in edges
+                    )
+                ]
+                removed_edges += len(edges) - len(kept)
+                inputs[component_id] = kept
+
+        keep = set(components)
+        sinks = [cid for cid, component in components.items() if component.get("provider") in SINK_PROVIDERS]
+        if sinks:
+            keep = set(sinks) | set(_roots(self.pipeline, components))
+            pending = list(keep)
+            while pending:
+                for edge in inputs[pending.pop()]:
+                    if edge.get("from") not in keep:
+                        keep.add(edge.get("from"))
+                        pending.append(edge.get("from"))
+
+        pipeline = dict(self.pipeline)
+        pipeline["components"] = [
+            {**component, "input": inputs[component_id]} if "input" in component else component
+            for component_id, component in components.items()
+            if component_id in keep
+        ]
+        optimized = PipelineGraph(pipeline if self.pipeline is self.config else {**self.config, "pipeline": pipeline})
+        return OptimizationReport(
+            graph=optimized,
+            removed_components=[cid for cid in components if cid not in keep],
+            removed_edges=removed_edges,
+            components_before=len(components),
+            edges_before=sum(len(component.get("input") or []) for component in components.values()),
+            body_bytes_before=self.compile().size,
+            body_bytes_after=optimized.compile().size
+        )
+
+    def validate(self) -> "ValidationResult":
+        """Check the graph offline; see validate_config()."""
+        return validate_config(self.compile())
+
+    def compile(self) -> CompiledPipeline:
+        """
+        Serialize the graph for submission.
+
+        The result is computed once per graph and can be passed to
+        create_pipeline, validate_pipeline and execute_task any number of
+        times, or keyed on by PipelineCache and TaskPool.
+        """
+        if self._compiled is None:
+            body = json.dumps(self.config, sort_keys=True, separators=(",", ":")).encode("utf-8")
+            self._compiled = CompiledPipeline(
+                config=self.config,
+                body=body,
+                digest=hashlib.sha256(body).hexdigest()
+            )
+        return self._compiled
+
+
+def _ancestors(inputs: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Set[str]]:
+    # Every component upstream of each component; the graph is acyclic
+    ancestors: Dict[str, Set[str]] = {}
+
+    def visit(component_id: str) -> Set[str]:
+        if component_id not in ancestors:
+            found: Set[str] = set()
+            for edge in inputs.get(component_id, []):
+                found.add(edge.get("from"))
+                found |= visit(edge.get("from"))
+            ancestors[component_id] = found
+        return ancestors[component_id]
+
+    for component_id in inputs:
+        visit(component_id)
+    return ancestors
+
+
+@dataclass
+class OptimizationReport:
+    """
+    Outcome of PipelineGraph.optimize().
+
+    Server work is estimated as components run plus lanes carried per
+    document; ``estimated_savings`` is the fraction of that removed.
+    """
+    graph: PipelineGraph
+    removed_components: List[str]
+    removed_edges: int
+    components_before: int
+    edges_before: int
+    body_bytes_before: int
+    body_bytes_after: int
+
+    @property
+    def components_after(self) -> int:
+        """Number of components left."""
+        return self.components_before - len(self.removed_components)
+
+    @property
+    def edges_after(self) -> int:
+        """Number of input edges left."""
+        return sum(len(component.get("input") or []) for component in self.graph.components.values())
+
+    @property
+    def estimated_savings(self) -> float:
+        """Fraction of per-document server work removed, from 0 to 1."""
+        before = self.components_before + self.edges_before
+        return 1.0 - (self.components_after + self.edges_after) / before if before else 0.0
+
+
+@dataclass(frozen=True)
+class ValidationResult:
+    """Outcome of an offline validation, mirroring ``POST /pipe/validate``."""
+    errors: Tuple[str, ...] = ()
+    warnings: Tuple[str, ...] = ()
+
+    @property
+    def valid(self) -> bool:
+        """True if no errors were found."""
+        return not self.errors
+
+    def raise_for_errors(self) -> None:
+        """
+        Raise if the configuration is invalid.
+
+        Raises:
+            ValidationError: Listing every error found
+        """
+        if self.errors:
+            raise ValidationError(
+                "Invalid pipeline: " + "; ".join(self.errors),
+                response_data={"errors": list(self.errors), "warnings": list(self.warnings)}
+            )
+
+
+_validation_cache: "OrderedDict[str, ValidationResult]" = OrderedDict()
+_validation_lock = threading.Lock()
+
+
+def validate_config(config: Union[PipelineConfig, CompiledPipeline, Dict[str, Any]]) -> ValidationResult:
+    """
+    Check a pipeline's component graph without contacting the server.
+
+    Errors: no components, missing or duplicate ids, a ``source`` that is
+    not a component (or, without ``source``, no source component), inputs
+    from unknown components, lanes a known provider cannot emit or accept,
+    cycles, and components that the source never reaches. Warnings: known
+    providers whose output nobody consumes.
+
+    Results are memoized by config_hash(), so repeated submissions of the
+    same configuration cost one hash (nothing for a CompiledPipeline).
+
+    Args:
+        config: Pipeline or task configuration
+
+    Returns:
+        ValidationResult
+    """
+    key = config_hash(config)
+    with _validation_lock:
+        result = _validation_cache.get(key)
+        if result is not None:
+            _validation_cache.move_to_end(key)
+            return result
+
+    canonical = canonicalize(config)
+    if isinstance(canonical, dict):
+        result = _check_graph(PipelineGraph(canonical).pipeline)
+    else:
+        result = ValidationResult(errors=("Configuration must be a JSON object",))
+
+    with _validation_lock:
+        _validation_cache[key] = result
+        while len(_validation_cache) > VALIDATION_CACHE_SIZE:
+            _validation_cache.popitem(last=False)
+    return result
+
+
+def _roots(pipeline: Dict[str, Any], by_id: Dict[str, Dict[str, Any]]) -> List[str]:
+    # The declared source, or for designer exports the source-type components
+    source = pipeline.get("source")
+    if source is not None:
+        return [source] if source in by_id else []
+    return [
+        component_id for component_id, component in by_id.items()
+        if component.get("provider") in SOURCE_PROVIDERS
+        or str((component.get("config") or {}).get("mode", "")).lower() == "source"
+    ]
+
+
+def _check_graph(pipeline: Dict[str, Any]) -> ValidationResult:
+    components = pipeline.get("components")
+    if not isinstance(components, list) or not components:
+        return ValidationResult(errors=("Pipeline has no components",))
+
+    errors: List[str] = []
+    warnings: List[str] = []
+    by_id: Dict[str, Dict[str, Any]] = {}
+    for index, component in enumerate(components):
+        component_id = component.get("id") if isinstance(component, dict) else None
+        if not isinstance(component_id, str) or not component_id:
+            errors.append(f"Component {index} has no id")
+        elif component_id in by_id:
+            errors.append(f"Duplicate component id '{component_id}'")
+        else:
+            by_id[component_id] = component
+
+    source = pipeline.get("source")
+    roots = _roots(pipeline, by_id)
+    if source is not None and not roots:
+        errors.append(f"Source '{source}' is not a component")
+    elif not roots:
+        errors.append("Pipeline has no source component")
+
+    # Edges that reference real components, as origin -> [consumers]
+    downstream: Dict[str, List[str]] = {component_id: [] for component_id in by_id}
+    for component_id, component in by_id.items():
+        edges = component.get("input") or []
+        if not isinstance(edges, list):
+            errors.append(f"Component '{component_id}': input must be a list")
+            continue
+        provider = component.get("provider")
+        for edge in edges:
+            if not isinstance(edge, dict):
+                errors.append(f"Component '{component_id}': input entries must be objects")
+                continue
+            origin, lane = edge.get("from"), edge.get("lane")
+            if origin not in by_id:
+                errors.append(f"Component '{component_id}' takes input from unknown component '{origin}'")
+                continue
+            downstream[origin].append(component_id)
+            origin_provider = by_id[origin].get("provider")
+            emitted = OUTPUT_LANES.get(origin_provider)
+            if emitted is not None and lane not in emitted:
+                errors.append(f"'{origin}' ({origin_provider}) does not emit lane '{lane}' used by '{component_id}'")
+            accepted = INPUT_LANES.get(provider)
+            if accepted is not None and lane not in accepted:
+                errors.append(f"'{component_id}' ({provider}) does not accept lane '{lane}' from '{origin}'")
+
+    # Kahn's algorithm: whatever cannot be ordered sits on a cycle
+    indegree = {component_id: 0 for component_id in by_id}
+    for consumers in downstream.values():
+        for consumer in consumers:
+            indegree[consumer] += 1
+    ready = [component_id for component_id, degree in indegree.items() if degree == 0]
+    while ready:
+        for consumer in downstream[ready.pop()]:
+            indegree[consumer] -= 1
+            if indegree[consumer] == 0:
+                ready.append(consumer)
+    cyclic = [component_id for component_id, degree in indegree.items() if degree > 0]
+    if cyclic:
+        errors.append("Cycle between components: " + ", ".join(cyclic))
+
+    if roots:
+        reached = set(roots)
+        pending = list(roots)
+        while pending:
+            for consumer in downstream[pending.pop()]:
+                if consumer not in reached:
+                    reached.add(consumer)
+                    pending.append(consumer)
+        for component_id in by_id:
+            if component_id not in reached:
+                errors.append(f"Component '{component_id}' is not connected to the source")
+
+    for component_id, component in by_id.items():
+        provider = component.get("provider")
+        if OUTPUT_LANES.get(provider) and not downstream[component_id]:
+            warnings.append(f"Output of '{component_id}' ({provider}) is not used")
+
+    return ValidationResult(errors=tuple(errors), warnings=tuple(warnings))
+
+
+@dataclass
+class PipelineCacheStats:
+    """Pipeline cache statistics."""
+    size: int
+    hits: int = 0
+    misses: int = 0
+    expired: int = 0
+    evictions: int = 0
+
+
+@dataclass
+class _CachedPipeline:
+    token: str
+    created_at: float
+    checked_at: float
+
+
+class PipelineCache:
+    """
+    Reuses server pipelines for identical configurations.
+
+    Tokens are keyed by config_hash(), so configs that differ only in key
+    order or ``ui`` blocks share a pipeline. Entries older than ``ttl`` are
+    replaced, and when more than ``max_size`` pipelines are cached the least
+    recently used one is deleted on the server. Concurrent requests for the
+    same config wait for a single creation.
+
+    With a liveness check, an entry reported dead is deleted on the server
+    and replaced; one whose check raises a 404 or 410 is dropped; one whose
+    check fails otherwise (a transient error) is kept and checked again on
+    the next request.
+
+    Example:
+        >>> with PipelineCache(client, ttl=3600) as pipelines:
+        ...     token = pipelines.get(config)
+        ...     client.upload_files(token, ["document.pdf"])
+    """
+
+    def __init__(
+        self,
+        client: "DTCApiClient",
+        ttl: float = 3600.0,
+        max_size: int = 32,
+        is_alive: Optional[LivenessCheck] = None,
+        check_interval: float = 60.0
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            client: Client used to create and delete pipelines
+            ttl: Seconds a pipeline is reused before it is replaced
+            max_size: Maximum number of cached pipelines
+            is_alive: Optional liveness check for cached tokens; returning
+                    False marks the pipeline dead, raising a DTCApiError with
+                    status 404 or 410 marks it gone
+            check_interval: Minimum seconds between liveness checks of a token
+        """
+        if max_size < 1:
+            raise ValueError("Cache size must be at least 1")
+
+        self.client = client
+        self.ttl = ttl
+        self.max_size = max_size
+        self.is_alive = is_alive
+        self.check_interval = check_interval
+
+        self._entries: "OrderedDict[str, _CachedPipeline]" = OrderedDict()
+        self._creating: Set[str] = set()
+        self._condition = threading.Condition()
+        self._stats = PipelineCacheStats(size=0)
+
+    def __enter__(self) -> "PipelineCache":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def get(self, config: Union[PipelineConfig, CompiledPipeline, Dict[str, Any]], name: str = None) -> str:
+        """
+        Return a pipeline token for a configuration, creating it if needed.
+
+        Args:
+            config: Pipeline configuration
+            name: Optional name used if a pipeline has to be created
+
+        Returns:
+            Pipeline token
+        """
+        key = config_hash(config)
+        while True:
+            with self._condition:
+                entry = self._entries.get(key)
+                if entry is None and key in self._creating:
+                    self._condition.wait()
+                    continue
+                now = time.monotonic()
+                if entry is not None and now - entry.created_at > self.ttl:
+                    del self._entries[key]
+                    self._stats.expired += 1
+                    expired, entry = entry, None
+                else:
+                    expired = None
+                if entry is not None and not self._needs_check(entry, now):
+                    self._entries.move_to_end(key)
+                    self._stats.hits += 1
+                    return entry.token
+                if entry is None:
+                    self._creating.add(key)
+                    self._stats.misses += 1
+
+            if expired is not None:
+                self._delete(expired.token)
+            if entry is None:
+                return self._create(key, config, name)
+            status = self._check(entry)
+            if status in (_ALIVE, _UNKNOWN):
+                with self._condition:
+                    if status == _ALIVE:
+                        entry.checked_at = time.monotonic()
+                    if self._entries.get(key) is entry:
+                        self._entries.move_to_end(key)
+                    self._stats.hits += 1
+                return entry.token
+            with self._condition:
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+            if status == _DEAD:
+                # Not usable, but possibly still running; do not leak it
+                self._delete(entry.token)
+
+    def invalidate(self, config: Union[PipelineConfig, CompiledPipeline, Dict[str, Any]], delete: bool = True) -> bool:
+        """
+        Drop a configuration's cached pipeline, for example after it failed.
+
+        Args:
+            config: Pipeline configuration
+            delete: Also delete the pipeline on the server
+
+        Returns:
+            True if a pipeline was cached for the configuration
+        """
+        with self._condition:
+            entry = self._entries.pop(config_hash(config), None)
+        if entry is not None and delete:
+            self._delete(entry.token)
+        return entry is not None
+
+    def stats(self) -> PipelineCacheStats:
+        """Return a snapshot of the cache statistics."""
+        with self._condition:
+            return PipelineCacheStats(
+                size=len(self._entries),
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                expired=self._stats.expired,
+                evictions=self._stats.evictions
+            )
+
+    def close(self, delete: bool = True) -> None:
+        """
+        Empty the cache.
+
+        Args:
+            delete: Delete the cached pipelines on the server
+        """
+        with self._condition:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        if delete:
+            for entry in entries:
+                self._delete(entry.token)
+
+    def _needs_check(self, entry: _CachedPipeline, now: float) -> bool:
+        return self.is_alive is not None and now - entry.checked_at >= self.check_interval
+
+    def _check(self, entry: _CachedPipeline) -> str:
+        try:
+            return _ALIVE if self.is_alive(entry.token) else _DEAD
+        except DTCApiError as e:
+            if e.status_code in GONE_STATUS_CODES:
+                return _GONE
+            logger.warning("Liveness check failed for pipeline %s, keeping it: %s", entry.token, e)
+            return _UNKNOWN
+
+    def _create(self, key: str, config: Union[PipelineConfig, CompiledPipeline, Dict[str, Any]], name: str) -> str:
+        try:
+            token = self.client.create_pipeline(config, name=name)
+        except BaseException:
+            with self._condition:
+                self._creating.discard(key)
+                self._condition.notify_all()
+            raise
+
+        now = time.monotonic()
+        with self._condition:
+            self._creating.discard(key)
+            self._entries[key] = _CachedPipeline(token=token, created_at=now, checked_at=now)
+            evicted = []
+            while len(self._entries) > self.max_size:
+                evicted.append(self._entries.popitem(last=False)[1])
+                self._stats.evictions += 1
+            self._condition.notify_all()
+
+        for entry in evicted:
+            self._delete(entry.token)
+        return token
+
+    def _delete(self, token: str) -> None:
+        try:
+            self.client.delete_pipeline(token)
+        except DTCApiError as e:
+            logger.warning("Failed to delete cached pipeline %s: %s", token, e)
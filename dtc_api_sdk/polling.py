@@ -0,0 +1,271 @@
+"""
+Task polling for the DTC API SDK.
+
+Provides the adaptive poll policy used when waiting on tasks, poll metrics,
+and a shared scheduler that polls many task tokens, each on its own backoff
+schedule, yielding every task as soon as it reaches a terminal state.
+"""
+
+import heapq
+import time
+import random
+import threading
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .models import TaskInfo, TaskStatus
+from .exceptions import DTCApiError, NetworkError
+
+TERMINAL_STATUSES = (TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED)
+
+
+@dataclass
+class PollPolicy:
+    """
+    Adaptive polling schedule for waiting on a task.
+
+    Polls start ``initial_interval`` apart and back off by ``backoff`` after
+    every poll, up to ``max_interval``. Each delay is randomized by
+    +/- ``jitter`` so that many waiters do not poll in lockstep. When the
+    task's progress shows it nearing the end, the next poll is pulled in to
+    the estimated completion time.
+    """
+    initial_interval: float = 0.5
+    max_interval: float = 15.0
+    backoff: float = 1.6
+    jitter: float = 0.1
+
+    @classmethod
+    def fixed(cls, interval: float) -> "PollPolicy":
+        """Policy that polls every ``interval`` seconds without backoff or jitter."""
+        return cls(initial_interval=interval, max_interval=interval, backoff=1.0, jitter=0.0)
+
+    def next_interval(self, interval: float, eta: Optional[float] = None) -> float:
+        """
+        Compute the interval following ``interval``.
+
+        Args:
+            interval: The interval used before the latest poll
+            eta: Estimated seconds until the task completes, if known
+
+        Returns:
+            Seconds to wait before the next poll (before jitter)
+        """
+        interval = min(interval * self.backoff, self.max_interval)
+        if eta is not None:
+            # Poll again around the time the task should finish
+            interval = min(interval, max(self.initial_interval, eta))
+        return interval
+
+    def jittered(self, interval: float) -> float:
+        """Apply random jitter to an interval."""
+        if not self.jitter:
+            return interval
+        return max(0.0, interval * random.uniform(1 - self.jitter, 1 + self.jitter))
+
+
+@dataclass
+class PollStats:
+    """
+    Task polling statistics.
+
+    A poll is counted as wasted when it finds a task that is still running
+    with no change in status or progress since the previous poll.
+    """
+    polls: int = 0
+    wasted_polls: int = 0
+    tasks_finished: int = 0
+
+    @property
+    def wasted_ratio(self) -> float:
+        """Fraction of polls that observed no change."""
+        if not self.polls:
+            return 0.0
+        return self.wasted_polls / self.polls
+
+
+class PollMetrics:
+    """Thread-safe accumulator of PollStats shared by every waiter of a client."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = PollStats()
+
+    def record(self, wasted: bool = False, finished: bool = False) -> None:
+        """Record one poll."""
+        with self._lock:
+            self._stats.polls += 1
+            self._stats.wasted_polls += int(wasted)
+            self._stats.tasks_finished += int(finished)
+
+    def snapshot(self) -> PollStats:
+        """Return a copy of the current statistics."""
+        with self._lock:
+            return PollStats(
+                polls=self._stats.polls,
+                wasted_polls=self._stats.wasted_polls,
+                tasks_finished=self._stats.tasks_finished
+            )
+
+
+class PollTracker:
+    """
+    Adaptive polling state for a single task.
+
+    Feed every TaskInfo to observe(); read the delay before the next poll
+    from next_delay().
+    """
+
+    def __init__(self, policy: PollPolicy):
+        self.policy = policy
+        self.interval = policy.initial_interval
+        self._last_state = None
+        self._last_progress: Optional[float] = None
+        self._last_time: Optional[float] = None
+
+    def observe(self, task_info: TaskInfo, now: float = None) -> bool:
+        """
+        Record a poll result and adapt the interval.
+
+        Returns:
+            True if the status or progress changed since the previous poll
+        """
+        now = time.monotonic() if now is None else now
+        state = (task_info.status, task_info.progress)
+        if task_info.snapshot is not None:
+            snapshot = task_info.snapshot
+            state += (snapshot.completed_count, snapshot.completed_size, snapshot.current_object)
+        changed = state != self._last_state
+
+        eta = None
+        if task_info.snapshot is not None:
+            eta = task_info.snapshot.eta_seconds()
+        if eta is None:
+            eta = self._estimate_eta(task_info.progress, now)
+        if self._last_state is not None:
+            # The first poll keeps the initial interval; later ones back off
+            self.interval = self.policy.next_interval(self.interval, eta)
+        if task_info.progress is not None:
+            self._last_progress = task_info.progress
+            self._last_time = now
+        self._last_state = state
+        return changed
+
+    def next_delay(self) -> float:
+        """Seconds to wait before the next poll."""
+        return self.policy.jittered(self.interval)
+
+    def _estimate_eta(self, progress: Optional[float], now: float) -> Optional[float]:
+        # Extrapolate from the progress made since the previous poll
+        if progress is None or self._last_progress is None or progress <= self._last_progress:
+            return None
+        velocity = (progress - self._last_progress) / max(now - self._last_time, 1e-6)
+        return max(0.0, 1.0 - progress) / velocity
+
+
+class TaskPoller:
+    """
+    Polls many tasks from one scheduler with per-token adaptive intervals.
+
+    Each token gets its own PollTracker, so tasks back off independently and
+    are polled sooner when their progress shows them nearing the end. Up to
+    ``max_workers`` status requests run concurrently.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str], TaskInfo],
+        policy: PollPolicy = None,
+        max_workers: int = 8,
+        metrics: PollMetrics = None
+    ):
+        """
+        Initialize the poller.
+
+        Args:
+            fetch: Callable returning the current TaskInfo for a token
+            policy: Polling schedule applied to every token
+            max_workers: Maximum number of status requests in flight
+            metrics: Optional accumulator for poll statistics
+        """
+        self.fetch = fetch
+        self.policy = policy or PollPolicy()
+        self.max_workers = max_workers
+        self.metrics = metrics or PollMetrics()
+
+    def as_completed(self, tokens: Iterable[str], timeout: float = None) -> Iterator[TaskInfo]:
+        """
+        Yield each task's final TaskInfo as soon as it completes, fails or is cancelled.
+
+        Args:
+            tokens: Task tokens to wait for
+            timeout: Maximum seconds to wait for all tasks
+
+        Yields:
+            Terminal TaskInfo objects in completion order; a token whose status
+            request fails with a non-network API error is yielded as FAILED
+            with the error as ``error_message`` and is not polled again
+
+        Raises:
+            TimeoutError: If some tasks are still running when the timeout expires
+        """
+        tokens = list(dict.fromkeys(tokens))
+        start = time.monotonic()
+        deadline = None if timeout is None else start + timeout
+
+        trackers: Dict[str, PollTracker] = {token: PollTracker(self.policy) for token in tokens}
+        schedule: List[Tuple[float, int, str]] = [(start, i, token) for i, token in enumerate(tokens)]
+        heapq.heapify(schedule)
+        sequence = len(schedule)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            in_flight = {}
+
+            while schedule or in_flight:
+                now = time.monotonic()
+                if deadline is not None and now >= deadline:
+                    pending = len(schedule) + len(in_flight)
+                    raise TimeoutError(f"{pending} task(s) did not complete within {timeout} seconds")
+
+                # Dispatch every poll that is due, up to the worker limit
+                while schedule and schedule[0][0] <= now and len(in_flight) < self.max_workers:
+                    _, _, token = heapq.heappop(schedule)
+                    in_flight[executor.submit(self.fetch, token)] = token
+
+                # Sleep until a poll finishes or the next one falls due
+                wake_at = schedule[0][0] if schedule and len(in_flight) < self.max_workers else None
+                if deadline is not None:
+                    wake_at = deadline if wake_at is None else min(wake_at, deadline)
+                wait_for = None if wake_at is None else max(0.0, wake_at - time.monotonic())
+
+                if not in_flight:
+                    time.sleep(wait_for or 0)
+                    continue
+
+                done, _ = wait(in_flight, timeout=wait_for, return_when=FIRST_COMPLETED)
+                for future in done:
+                    token = in_flight.pop(future)
+                    tracker = trackers[token]
+                    try:
+                        task_info = future.result()
+                    except NetworkError:
+                        # Transient failure: try again on the normal schedule
+                        task_info = None
+                    except DTCApiError as e:
+                        # This token cannot be polled; report it and keep polling the rest
+                        del trackers[token]
+                        self.metrics.record(wasted=False, finished=True)
+                        yield TaskInfo(token=token, status=TaskStatus.FAILED, error_message=str(e))
+                        continue
+
+                    if task_info is not None:
+                        changed = tracker.observe(task_info)
+                        finished = task_info.status in TERMINAL_STATUSES
+                        self.metrics.record(wasted=not (changed or finished), finished=finished)
+                        if finished:
+                            yield task_info
+                            continue
+
+                    sequence += 1
+                    heapq.heappush(schedule, (time.monotonic() + tracker.next_delay(), sequence, token))
@@ -0,0 +1,218 @@
+"""
+Client-side rate limiting for the DTC API SDK.
+
+Paces requests with one token bucket per endpoint group (task creation,
+uploads, status polls, everything else), shared by every thread using a
+client. Buckets adapt to server feedback: a 429 or an overloaded 5xx cuts the
+rate multiplicatively, and successful responses raise it again additively up
+to the configured limit, so a fleet of workers settles just under the real
+quota instead of overshooting it and being throttled.
+"""
+
+import time
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+
+# Endpoint groups with their own bucket; everything else is "default"
+ENDPOINT_GROUPS: Dict[Tuple[str, str], str] = {
+    ("PUT", "/task"): "task_create",
+    ("PUT", "/webhook"): "upload",
+    ("PUT", "/pipe/process"): "upload",
+    ("GET", "/task"): "status",
+}
+
+# Statuses that always signal the server is over capacity
+THROTTLE_STATUS_CODES = (429, 503)
+
+
+def endpoint_group(method: str, endpoint: str) -> str:
+    """Return the rate limit group of a request."""
+    return ENDPOINT_GROUPS.get((method.upper(), endpoint), "default")
+
+
+@dataclass
+class RateLimit:
+    """
+    Rate limit for one endpoint group.
+
+    Attributes:
+        rate: Maximum requests per second.
+        burst: Requests that may be sent back-to-back after an idle period.
+            Defaults to ``rate`` (at least 1).
+        min_rate: Floor the adaptive rate never drops below. Defaults to 5%
+            of ``rate``.
+        decrease: Factor applied to the rate when the server pushes back.
+        increase: Requests per second added back per successful response.
+            Defaults to 5% of ``rate``.
+        slow_error_seconds: 5xx responses slower than this are treated as
+            overload rather than a plain error.
+        cooldown: Minimum seconds between two rate cuts, so a burst of 429s
+            from requests already in flight counts once.
+    """
+    rate: float
+    burst: Optional[float] = None
+    min_rate: Optional[float] = None
+    decrease: float = 0.5
+    increase: Optional[float] = None
+    slow_error_seconds: float = 2.0
+    cooldown: float = 1.0
+
+
+@dataclass
+class RateLimitStats:
+    """Usage statistics for one endpoint group."""
+    rate: float
+    max_rate: float
+    requests: int = 0
+    throttles: int = 0
+    waited_seconds: float = 0.0
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket with additive-increase/multiplicative-decrease.
+
+    reserve() takes a token immediately and returns how long the caller must
+    wait before using it, which works for both blocking and asyncio callers.
+    """
+
+    def __init__(self, limit: RateLimit):
+        if limit.rate <= 0:
+            raise ValueError("Rate must be positive")
+        self.limit = limit
+        self.max_rate = float(limit.rate)
+        self.rate = self.max_rate
+        self.burst = float(limit.burst if limit.burst is not None else max(1.0, limit.rate))
+        self.min_rate = limit.min_rate if limit.min_rate is not None else self.max_rate * 0.05
+        self.increase = limit.increase if limit.increase is not None else self.max_rate * 0.05
+
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._last_decrease = float("-inf")
+        self._stats = RateLimitStats(rate=self.rate, max_rate=self.max_rate)
+
+    def reserve(self, now: float = None) -> float:
+        """
+        Take a token.
+
+        Returns:
+            Seconds to wait before sending the request
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._refill(now)
+            self._tokens -= 1
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            delay = max(delay, self._paused_until - now)
+            self._stats.requests += 1
+            self._stats.waited_seconds += delay
+            return delay
+
+    def throttle(self, retry_after: float = None, now: float = None) -> None:
+        """Cut the rate after the server pushed back, pausing for ``retry_after`` if given."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._refill(now)
+            if retry_after:
+                self._paused_until = max(self._paused_until, now + retry_after)
+            if now - self._last_decrease < self.limit.cooldown:
+                return
+            self._last_decrease = now
+            self.rate = max(self.min_rate, self.rate * self.limit.decrease)
+            # Drop saved-up burst so the lower rate takes effect right away
+            self._tokens = min(self._tokens, 0.0)
+            self._stats.throttles += 1
+
+    def recover(self) -> None:
+        """Raise the rate after a successful response."""
+        with self._lock:
+            if self.rate < self.max_rate:
+                self._refill(time.monotonic())
+                self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def stats(self) -> RateLimitStats:
+        """Return a snapshot of this bucket's statistics."""
+        with self._lock:
+            return RateLimitStats(
+                rate=self.rate,
+                max_rate=self.max_rate,
+                requests=self._stats.requests,
+                throttles=self._stats.throttles,
+                waited_seconds=self._stats.waited_seconds
+            )
+
+    def _refill(self, now: float) -> None:
+        # Accrue tokens at the rate in force since the last update
+        elapsed = max(0.0, now - self._updated)
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+
+class RateLimiter:
+    """
+    Per-endpoint-group request pacing shared by all threads of a client.
+
+    Groups without a configured limit are not paced.
+
+    Example:
+        >>> limiter = RateLimiter({
+        ...     "task_create": RateLimit(rate=2),
+        ...     "upload": RateLimit(rate=5),
+        ...     "status": RateLimit(rate=20),
+        ... })
+        >>> client = DTCApiClient(rate_limiter=limiter)
+    """
+
+    def __init__(self, limits: Dict[str, RateLimit]):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            limits: Mapping of endpoint group ("task_create", "upload",
+                    "status", "default") to its RateLimit
+        """
+        self.buckets: Dict[str, TokenBucket] = {group: TokenBucket(limit) for group, limit in limits.items()}
+
+    def reserve(self, method: str, endpoint: str) -> float:
+        """
+        Take a token for a request.
+
+        Returns:
+            Seconds to wait before sending it
+        """
+        bucket = self.buckets.get(endpoint_group(method, endpoint))
+        return bucket.reserve() if bucket else 0.0
+
+    def feedback(
+        self,
+        method: str,
+        endpoint: str,
+        status: int,
+        elapsed: float,
+        retry_after: float = None
+    ) -> None:
+        """
+        Adapt the request's bucket to a response.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint path
+            status: Response status code
+            elapsed: Seconds the request took
+            retry_after: Seconds requested by a Retry-After header
+        """
+        bucket = self.buckets.get(endpoint_group(method, endpoint))
+        if bucket is None:
+            return
+        if status in THROTTLE_STATUS_CODES or (status >= 500 and elapsed >= bucket.limit.slow_error_seconds):
+            bucket.throttle(retry_after)
+        elif status < 500:
+            bucket.recover()
+
+    def stats(self) -> Dict[str, RateLimitStats]:
+        """Return statistics for every configured group."""
+        return {group: bucket.stats() for group, bucket in self.buckets.items()}
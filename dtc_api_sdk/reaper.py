@@ -0,0 +1,280 @@
+"""
+Leaked-resource tracking for the DTC API SDK.
+
+The client records every task and pipeline it creates in a TokenRegistry
+until it cancels or deletes them. A Reaper periodically cancels tasks and
+deletes pipelines that have gone unused for longer than a TTL, or whose
+owning process has died, so crashed or careless callers do not leave
+engines running on the server.
+"""
+
+import os
+import time
+import socket
+import logging
+import threading
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from .exceptions import DTCApiError
+
+if TYPE_CHECKING:  # pragma: no cover - the client imports this module
+    from .client import DTCApiClient
+
+logger = logging.getLogger(__name__)
+
+TASK = "task"
+PIPELINE = "pipeline"
+
+# Token states; a registry only reaps RUNNING resources
+RUNNING = "running"
+RELEASED = "released"
+
+HOSTNAME = socket.gethostname()
+
+# Cleanup responses meaning the resource no longer exists
+GONE_STATUS_CODES = (404, 410)
+
+
+def pid_alive(pid: int) -> bool:
+    """
+    Check whether a process exists on this machine.
+
+    Always True on Windows, where probing a process with ``os.kill`` would
+    terminate it; only the TTL applies there.
+    """
+    if pid == os.getpid() or os.name == "nt":
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+@dataclass
+class TrackedToken:
+    """A server resource created by the SDK and not yet cleaned up."""
+    token: str
+    kind: str
+    name: Optional[str] = None
+    config_hash: Optional[str] = None
+    pid: Optional[int] = field(default_factory=os.getpid)  # None: not owned by a process
+    host: str = HOSTNAME
+    state: str = RUNNING
+    created: float = field(default_factory=time.time)
+    last_used: float = 0.0
+
+    def __post_init__(self):
+        if not self.last_used:
+            self.last_used = self.created
+
+    def idle_seconds(self, now: float = None) -> float:
+        """Seconds since the resource was created or last used."""
+        return (now if now is not None else time.time()) - self.last_used
+
+    def owner_alive(self) -> bool:
+        """False only if the owning process is known to have exited."""
+        return self.pid is None or self.host != HOSTNAME or pid_alive(self.pid)
+
+
+class TokenRegistry:
+    """
+    In-memory registry of live task and pipeline tokens.
+
+    Every request carrying a token marks that token as used, so the reaper
+    TTL counts idle time rather than age.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tokens: Dict[str, TrackedToken] = {}
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    def __contains__(self, token: str) -> bool:
+        return token in self._tokens
+
+    def register(self, token: str, kind: str, name: str = None, config_hash: str = None) -> TrackedToken:
+        """Start tracking a newly created resource."""
+        tracked = TrackedToken(token=token, kind=kind, name=name, config_hash=config_hash)
+        with self._lock:
+            self._tokens[token] = tracked
+        return tracked
+
+    def touch(self, token: str) -> None:
+        """Mark a resource as used now; unknown tokens are ignored."""
+        tracked = self._tokens.get(token)
+        if tracked is not None:
+            tracked.last_used = time.time()
+
+    def unregister(self, token: str) -> bool:
+        """Stop tracking a resource; returns True if it was tracked."""
+        with self._lock:
+            return self._tokens.pop(token, None) is not None
+
+    def detach(self, token: str) -> None:
+        """Let a resource outlive its creating process; only the TTL applies to it."""
+        tracked = self._tokens.get(token)
+        if tracked is not None:
+            tracked.pid = None
+
+    def get(self, token: str) -> Optional[TrackedToken]:
+        """Return the record of a tracked resource, or None."""
+        return self._tokens.get(token)
+
+    def tokens(self, kind: str = None) -> List[TrackedToken]:
+        """Tracked resources, optionally of one kind, oldest first."""
+        with self._lock:
+            tracked = list(self._tokens.values())
+        return sorted((t for t in tracked if kind is None or t.kind == kind), key=lambda t: t.created)
+
+    def stale(self, ttl: float, now: float = None) -> List[TrackedToken]:
+        """Resources idle for longer than ``ttl`` seconds or owned by a dead process."""
+        now = now if now is not None else time.time()
+        alive: Dict[Optional[int], bool] = {}
+        stale = []
+        for tracked in self.tokens():
+            if tracked.pid not in alive:
+                alive[tracked.pid] = tracked.owner_alive()
+            if not alive[tracked.pid] or tracked.idle_seconds(now) > ttl:
+                stale.append(tracked)
+        return stale
+
+
+@dataclass
+class ReapReport:
+    """Outcome of one reaper pass."""
+    cancelled: List[str] = field(default_factory=list)
+    deleted: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def reaped(self) -> int:
+        """Number of resources cleaned up."""
+        return len(self.cancelled) + len(self.deleted)
+
+
+class Reaper:
+    """
+    Cancels leaked tasks and deletes leaked pipelines.
+
+    Each pass collects the stale entries of the client's registry and cleans
+    them up concurrently on a thread pool. Resources the server no longer
+    knows are dropped from the registry; other failures are retried on the
+    next pass.
+
+    Example:
+        >>> with Reaper(client, ttl=900, interval=60):
+        ...     run_batch_jobs(client)
+    """
+
+    def __init__(
+        self,
+        client: "DTCApiClient",
+        ttl: float = 3600.0,
+        interval: float = 60.0,
+        max_workers: int = 8
+    ):
+        """
+        Initialize the reaper. Call start() to run it in the background.
+
+        Args:
+            client: Client whose registry is reaped and whose connections are
+                    used for the cleanup calls
+            ttl: Seconds a resource may sit unused before it is cleaned up
+            interval: Seconds between background passes
+            max_workers: Concurrent cleanup calls per pass
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+
+        self.client = client
+        self.registry = client.registry
+        self.ttl = ttl
+        self.interval = interval
+        self.max_workers = max_workers
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "Reaper":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def start(self) -> "Reaper":
+        """Start the background thread."""
+        if self._thread is None:
+            # A previous close() leaves the event set
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="dtc-reaper", daemon=True)
+            self._thread.start()
+        return self
+
+    def close(self) -> None:
+        """Stop the background thread without cleaning up remaining resources."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def reap(self, ttl: float = None) -> ReapReport:
+        """
+        Run one pass now.
+
+        Args:
+            ttl: Override the idle TTL for this pass; 0 cleans up everything
+                    in the registry
+
+        Returns:
+            ReapReport listing what was cleaned up and what failed
+        """
+        stale = self.registry.stale(self.ttl if ttl is None else ttl)
+        report = ReapReport()
+        if not stale:
+            return report
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(stale)), thread_name_prefix="dtc-reap") as pool:
+            outcomes = list(pool.map(self._clean, stale))
+
+        for tracked, error in zip(stale, outcomes):
+            if error is not None:
+                report.failed[tracked.token] = error
+            elif tracked.kind == PIPELINE:
+                report.deleted.append(tracked.token)
+            else:
+                report.cancelled.append(tracked.token)
+        if report.reaped or report.failed:
+            logger.info(
+                "Reaper cleaned up %d resources, %d failed", report.reaped, len(report.failed)
+            )
+        return report
+
+    def _clean(self, tracked: TrackedToken) -> Optional[str]:
+        try:
+            if tracked.kind == PIPELINE:
+                self.client.delete_pipeline(tracked.token)
+            else:
+                self.client.cancel_task(tracked.token)
+        except DTCApiError as e:
+            if e.status_code in GONE_STATUS_CODES:
+                self.registry.unregister(tracked.token)
+                return None
+            logger.warning("Failed to clean up %s %s: %s", tracked.kind, tracked.token, e)
+            return str(e)
+        # The client unregisters on success; make sure a refusal cannot loop forever
+        self.registry.unregister(tracked.token)
+        return None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.reap()
+            except Exception:  # pragma: no cover - keep the reaper alive
+                logger.exception("Reaper pass failed")
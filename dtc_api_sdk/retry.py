@@ -0,0 +1,242 @@
+"""
+Request retries for the DTC API SDK.
+
+Classifies every endpoint by how safe it is to send twice, decides whether a
+failed attempt may be retried and how long to wait (honoring ``Retry-After``),
+replays request bodies by rewinding rather than rebuilding them, and keeps a
+per-client retry budget so that retries cannot snowball into a retry storm
+when the service is overloaded.
+"""
+
+import time
+import random
+import threading
+from enum import Enum
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional, Tuple
+
+from .streaming import MappedFileBody
+
+
+# Status codes that may be retried, and the methods urllib3-style retries
+# treat as idempotent
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+RETRY_METHODS = ("HEAD", "GET", "OPTIONS")
+
+# Statuses meaning the server refused the request without processing it
+REFUSED_STATUS_CODES = (429, 503)
+
+
+class EndpointSafety(str, Enum):
+    """How safe it is to send a request to an endpoint more than once."""
+    IDEMPOTENT = "idempotent"  # Repeating has no extra effect: retry any transient failure
+    UNSAFE = "unsafe"          # Repeating may duplicate work: retry only if it was never processed
+    NEVER = "never"            # Never retry
+
+
+# Endpoints whose safety differs from the default for their method
+ENDPOINT_SAFETY: Dict[Tuple[str, str], EndpointSafety] = {
+    ("POST", "/pipe/validate"): EndpointSafety.IDEMPOTENT,
+    ("DELETE", "/pipe"): EndpointSafety.IDEMPOTENT,
+    ("DELETE", "/task"): EndpointSafety.IDEMPOTENT,
+    ("POST", "/pipe"): EndpointSafety.UNSAFE,
+    ("PUT", "/pipe/process"): EndpointSafety.UNSAFE,
+    ("PUT", "/task"): EndpointSafety.UNSAFE,
+    ("PUT", "/webhook"): EndpointSafety.UNSAFE,
+}
+
+
+def parse_retry_after(value: Optional[str], now: float = None) -> Optional[float]:
+    """
+    Parse a ``Retry-After`` header into seconds.
+
+    Args:
+        value: Header value, either delta-seconds or an HTTP date
+        now: Current epoch time, for HTTP dates
+
+    Returns:
+        Seconds to wait (never negative), or None if absent or malformed
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+    return max(0.0, when - (time.time() if now is None else now))
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Retry settings for a client.
+
+    Attributes:
+        max_retries: Maximum retries per request (attempts = max_retries + 1).
+        backoff_base: Backoff ceiling in seconds for the first retry; doubles
+            on every retry. The actual delay is drawn uniformly below it.
+        backoff_max: Upper bound on the backoff ceiling.
+        max_retry_after: Give up instead of waiting when the server asks for a
+            longer ``Retry-After`` than this.
+        retry_statuses: Statuses that may be retried.
+        budget_ratio: Retry tokens earned per request sent. 0.1 allows retries
+            to add at most ~10% load once the initial reserve is spent.
+        budget_reserve: Retry tokens available up front, and the cap on
+            tokens saved up.
+        safety: Per ``(method, endpoint)`` overrides of ENDPOINT_SAFETY.
+    """
+    max_retries: int = 3
+    backoff_base: float = 0.5
+    backoff_max: float = 30.0
+    max_retry_after: float = 60.0
+    retry_statuses: Tuple[int, ...] = RETRY_STATUS_CODES
+    budget_ratio: float = 0.1
+    budget_reserve: float = 10.0
+    safety: Dict[Tuple[str, str], EndpointSafety] = field(default_factory=dict)
+
+    def classify(self, method: str, endpoint: str) -> EndpointSafety:
+        """Return the retry safety of a request."""
+        key = (method.upper(), endpoint)
+        if key in self.safety:
+            return self.safety[key]
+        if key in ENDPOINT_SAFETY:
+            return ENDPOINT_SAFETY[key]
+        return EndpointSafety.IDEMPOTENT if key[0] in RETRY_METHODS else EndpointSafety.UNSAFE
+
+    def backoff(self, attempt: int) -> float:
+        """Jittered exponential backoff before retry number ``attempt + 1``."""
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+
+@dataclass
+class RetryStats:
+    """Retry statistics for a client."""
+    requests: int = 0
+    retries: int = 0
+    budget_exhausted: int = 0
+    budget_tokens: float = 0.0
+
+
+class RetryEngine:
+    """
+    Per-client retry decisions and retry budget.
+
+    Call begin() once per logical request, then next_delay() after every
+    failed attempt; a delay of None means the failure must be surfaced.
+    """
+
+    def __init__(self, policy: RetryPolicy = None):
+        self.policy = policy or RetryPolicy()
+        self._lock = threading.Lock()
+        self._tokens = self.policy.budget_reserve
+        self._stats = RetryStats()
+
+    def begin(self) -> None:
+        """Record a new logical request, earning retry budget."""
+        with self._lock:
+            self._stats.requests += 1
+            self._tokens = min(self.policy.budget_reserve, self._tokens + self.policy.budget_ratio)
+
+    def next_delay(
+        self,
+        method: str,
+        endpoint: str,
+        attempt: int,
+        status: int = None,
+        sent: bool = True,
+        retry_after: float = None,
+        replayable: bool = True
+    ) -> Optional[float]:
+        """
+        Decide whether a failed attempt is retried.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint path
+            attempt: Number of retries already made for this request
+            status: Response status, or None for a network error
+            sent: False if the request provably never reached the server
+                    (connection could not be established)
+            retry_after: Seconds requested by a Retry-After header
+            replayable: Whether the request body can be sent again
+
+        Returns:
+            Seconds to wait before retrying, or None to give up
+        """
+        policy = self.policy
+        if attempt >= policy.max_retries:
+            return None
+        if sent and not replayable:
+            return None
+
+        safety = policy.classify(method, endpoint)
+        if safety == EndpointSafety.NEVER:
+            return None
+        if status is not None:
+            if status not in policy.retry_statuses:
+                return None
+            if safety == EndpointSafety.UNSAFE and status not in REFUSED_STATUS_CODES:
+                return None
+        elif safety == EndpointSafety.UNSAFE and sent:
+            # The server may have acted on it before the connection failed
+            return None
+
+        if retry_after is not None and retry_after > policy.max_retry_after:
+            return None
+
+        with self._lock:
+            if self._tokens < 1:
+                self._stats.budget_exhausted += 1
+                return None
+            self._tokens -= 1
+            self._stats.retries += 1
+
+        return retry_after if retry_after is not None else policy.backoff(attempt)
+
+    def stats(self) -> RetryStats:
+        """Return a snapshot of the retry statistics."""
+        with self._lock:
+            return RetryStats(
+                requests=self._stats.requests,
+                retries=self._stats.retries,
+                budget_exhausted=self._stats.budget_exhausted,
+                budget_tokens=self._tokens
+            )
+
+
+class ReplayableBody:
+    """
+    Wraps a request body so it can be rewound between attempts.
+
+    In-memory bodies are resent as-is, streaming bodies are reset, seekable
+    files are seeked back to where the first attempt started, and
+    memory-mapped bodies are simply mapped again. Other iterables (such as
+    generators) cannot be replayed.
+    """
+
+    def __init__(self, body: Any):
+        self.body = body
+        self._position = None
+        if body is None or isinstance(body, (bytes, bytearray, memoryview, str, dict, list, tuple, MappedFileBody)):
+            self.replayable = True
+        elif hasattr(body, "reset"):
+            self.replayable = True
+        elif getattr(body, "seekable", lambda: False)():
+            self._position = body.tell()
+            self.replayable = True
+        else:
+            self.replayable = False
+
+    def rewind(self) -> None:
+        """Prepare the body to be sent again."""
+        if self._position is not None:
+            self.body.seek(self._position)
+        elif hasattr(self.body, "reset"):
+            self.body.reset()
@@ -0,0 +1,322 @@
+"""
+Streaming request bodies for the DTC API SDK.
+
+Provides a multipart/form-data encoder that streams files from disk one part
+at a time, so uploading a large batch keeps memory flat and holds at most one
+file descriptor open, a JSON body that base64-encodes a file on the fly
+for webhook payloads, and a memory-mapped body for zero-copy raw uploads.
+"""
+
+import json
+import mmap
+import uuid
+import base64
+import asyncio
+import mimetypes
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+# Called as progress(filename, bytes_sent, part_size) while a part streams
+ProgressCallback = Callable[[str, int, int], None]
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# Bytes of a memory-mapped file handed to the socket per send
+MMAP_WINDOW_SIZE = 4 * 1024 * 1024
+
+
+def _guess_content_type(file_path: Path) -> str:
+    """Guess the MIME type of a file, defaulting to ``application/octet-stream``."""
+    content_type, _ = mimetypes.guess_type(str(file_path))
+    return content_type or "application/octet-stream"
+
+
+# HTML5 form encoding of header parameters, as urllib3 and browsers do it;
+# a raw CR or LF in a filename would otherwise start a new header line
+_HEADER_PARAM_ESCAPES = str.maketrans({"\r": "%0D", "\n": "%0A", '"': "%22"})
+
+
+def _quote_header_param(value: str) -> str:
+    """Escape a Content-Disposition parameter value for use inside double quotes."""
+    return value.translate(_HEADER_PARAM_ESCAPES)
+
+
+class _Part:
+    """One file part of a multipart body."""
+
+    __slots__ = ("path", "header", "size")
+
+    def __init__(self, field_name: str, path: Path, boundary: str):
+        self.path = path
+        self.size = path.stat().st_size
+        name = _quote_header_param(field_name)
+        filename = _quote_header_param(path.name)
+        self.header = (
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+            f"Content-Type: {_guess_content_type(path)}\r\n"
+            "\r\n"
+        ).encode("utf-8")
+
+    def __len__(self) -> int:
+        return len(self.header) + self.size + 2  # trailing CRLF
+
+
+class _StreamingBody:
+    """
+    Base for request bodies generated on the fly with a known length.
+
+    Subclasses implement ``__iter__`` and set ``_length``. The body can be
+    passed to requests (file-like ``read()``) or httpx (async iteration).
+    """
+
+    _length = 0
+    _chunks: Optional[Iterator[bytes]] = None
+    _buffer = b""
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[bytes]:
+        raise NotImplementedError
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        # Disk reads happen on the default executor so the event loop never blocks
+        loop = asyncio.get_running_loop()
+        chunks = iter(self)
+        while True:
+            chunk = await loop.run_in_executor(None, next, chunks, None)
+            if chunk is None:
+                break
+            yield chunk
+
+    def read(self, size: int = -1) -> bytes:
+        """Read up to ``size`` bytes of the encoded body (file-like interface)."""
+        if self._chunks is None:
+            self._chunks = iter(self)
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        if size < 0:
+            data, self._buffer = self._buffer, b""
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def reset(self) -> None:
+        """Rewind the body so it can be sent again."""
+        if self._chunks is not None:
+            self._chunks.close()
+        self._chunks = None
+        self._buffer = b""
+
+
+class MultipartEncoder(_StreamingBody):
+    """
+    Streaming multipart/form-data body for file uploads.
+
+    The total length is computed up front from file sizes, so the request is
+    sent with a Content-Length rather than chunked. Each file is opened only
+    while its own part is being sent.
+
+    Example:
+        >>> encoder = MultipartEncoder(["a.pdf", "b.pdf"])
+        >>> requests.put(url, data=encoder, headers={"Content-Type": encoder.content_type})
+    """
+
+    def __init__(
+        self,
+        files: Sequence[Union[str, Path, Tuple[str, Union[str, Path]]]],
+        boundary: str = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        progress: Optional[ProgressCallback] = None
+    ):
+        """
+        Initialize the encoder.
+
+        Args:
+            files: File paths, or ``(field_name, path)`` pairs. Bare paths get
+                    the field names ``file_0``, ``file_1``, ...
+            boundary: Multipart boundary; a random one is generated by default
+            chunk_size: Bytes read from disk at a time
+            progress: Optional callback invoked after every chunk of a part
+
+        Raises:
+            FileNotFoundError: If any file does not exist
+        """
+        self.boundary = boundary or uuid.uuid4().hex
+        self.chunk_size = chunk_size
+        self.progress = progress
+
+        self.parts: List[_Part] = []
+        for i, item in enumerate(files):
+            field_name, file_path = item if isinstance(item, tuple) else (f"file_{i}", item)
+            file_path = Path(file_path)
+            if not file_path.is_file():
+                raise FileNotFoundError(f"File not found: {file_path}")
+            self.parts.append(_Part(field_name, file_path, self.boundary))
+
+        self._closing = f"--{self.boundary}--\r\n".encode("utf-8")
+        self._length = sum(len(part) for part in self.parts) + len(self._closing)
+
+    @property
+    def content_type(self) -> str:
+        """Content-Type header value including the boundary."""
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __iter__(self) -> Iterator[bytes]:
+        for part in self.parts:
+            yield part.header
+            sent = 0
+            with open(part.path, "rb") as file:
+                while True:
+                    chunk = file.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    sent += len(chunk)
+                    yield chunk
+                    if self.progress:
+                        self.progress(part.path.name, sent, part.size)
+            if sent != part.size:
+                raise IOError(f"File changed size during upload: {part.path}")
+            yield b"\r\n"
+        yield self._closing
+
+
+class Base64JSONBody(_StreamingBody):
+    """
+    Streaming JSON webhook payload carrying a base64-encoded file.
+
+    Produces ``{"filename": ..., "content_type": ..., "size": ..., "data": "<base64>"}``
+    without ever holding the file or its encoding in memory: the file is read
+    in chunks whose size is a multiple of 3, so each chunk encodes to
+    standalone base64 without padding.
+    """
+
+    def __init__(
+        self,
+        file_path: Union[str, Path],
+        fields: Dict[str, Any] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        progress: Optional[ProgressCallback] = None
+    ):
+        """
+        Initialize the body.
+
+        Args:
+            file_path: File to encode
+            fields: Extra JSON fields placed before ``data``; they override the
+                    default ``filename``/``content_type``/``size`` fields
+            chunk_size: Approximate bytes read from disk at a time
+            progress: Optional callback invoked after every chunk
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+        """
+        self.path = Path(file_path)
+        if not self.path.is_file():
+            raise FileNotFoundError(f"File not found: {self.path}")
+        self.size = self.path.stat().st_size
+        self.chunk_size = max(3, chunk_size - chunk_size % 3)
+        self.progress = progress
+
+        header = {
+            "filename": self.path.name,
+            "content_type": _guess_content_type(self.path),
+            "size": self.size,
+        }
+        header.update(fields or {})
+        header.pop("data", None)
+        # Serialize the metadata and splice the data field in before the closing brace
+        prefix = json.dumps(header, separators=(",", ":"))[:-1]
+        self._prefix = (prefix + ("," if header else "") + '"data":"').encode("utf-8")
+        self._suffix = b'"}'
+        self._length = len(self._prefix) + 4 * ((self.size + 2) // 3) + len(self._suffix)
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield self._prefix
+        sent = 0
+        with open(self.path, "rb") as file:
+            while True:
+                chunk = file.read(self.chunk_size)
+                if not chunk:
+                    break
+                sent += len(chunk)
+                yield base64.b64encode(chunk)
+                if self.progress:
+                    self.progress(self.path.name, sent, self.size)
+        if sent != self.size:
+            raise IOError(f"File changed size during upload: {self.path}")
+        yield self._suffix
+
+
+class MappedFileBody:
+    """
+    Raw file upload body backed by a read-only memory map.
+
+    Iterating yields ``memoryview`` windows over the mapping, which the HTTP
+    stack passes straight to ``socket.sendall()`` without reading the file
+    into Python buffers. Pages already sent are dropped from the process
+    (``MADV_DONTNEED``) so resident memory stays bounded by the window size.
+
+    Each iteration maps the file independently, so several uploads of the
+    same file can run concurrently; they share the kernel's page cache.
+    Deliberately not file-like: urllib3 would otherwise copy it through
+    ``read()``.
+    """
+
+    def __init__(
+        self,
+        file_path: Union[str, Path],
+        window_size: int = MMAP_WINDOW_SIZE,
+        progress: Optional[ProgressCallback] = None
+    ):
+        """
+        Initialize the body.
+
+        Args:
+            file_path: File to upload
+            window_size: Bytes handed to the socket per send
+            progress: Optional callback invoked after every window
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+        """
+        self.path = Path(file_path)
+        if not self.path.is_file():
+            raise FileNotFoundError(f"File not found: {self.path}")
+        self.size = self.path.stat().st_size
+        # Windows must start on a page boundary for madvise()
+        self.window_size = max(mmap.PAGESIZE, window_size - window_size % mmap.PAGESIZE)
+        self.progress = progress
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self) -> Iterator[memoryview]:
+        if not self.size:
+            # Empty files cannot be mapped
+            return
+        with open(self.path, "rb") as file:
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapping)
+        try:
+            if hasattr(mapping, "madvise"):
+                mapping.madvise(mmap.MADV_SEQUENTIAL)
+            for start in range(0, self.size, self.window_size):
+                end = min(start + self.window_size, self.size)
+                with view[start:end] as window:
+                    yield window
+                if hasattr(mapping, "madvise"):
+                    mapping.madvise(mmap.MADV_DONTNEED, start, end - start)
+                if self.progress:
+                    self.progress(self.path.name, end, self.size)
+        finally:
+            view.release()
+            try:
+                mapping.close()
+            except BufferError:
+                # A consumer still holds a window; the mapping closes once it is released
+                pass
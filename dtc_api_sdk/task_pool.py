@@ -0,0 +1,343 @@
+"""
+Warm task pool for the DTC API SDK.
+
+Launching a webhook task costs several seconds while the engine loads its
+requirements. A TaskPool launches tasks ahead of time, waits until each one
+reports it can accept webhook data, and leases ready tasks to callers so that
+cold-start latency stays off the critical path.
+"""
+
+import time
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Union
+
+from .client import DTCApiClient, is_task_ready, _task_exited
+from .models import PipelineConfig, CompiledPipeline
+from .pipeline import config_hash, _config_to_dict
+from .reaper import GONE_STATUS_CODES
+from .exceptions import DTCApiError
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TaskLease:
+    """A ready task handed out by a TaskPool. The caller owns the token."""
+    token: str
+    config_key: str
+    created_at: float
+    ready_at: float
+
+    @property
+    def startup_seconds(self) -> float:
+        """Seconds the engine took to become ready."""
+        return self.ready_at - self.created_at
+
+
+@dataclass
+class _PendingTask:
+    token: str
+    created_at: float
+    ready_at: Optional[float] = None
+    checked_at: Optional[float] = None  # Last status probe that found it ready
+
+
+@dataclass
+class _ConfigPool:
+    config: Union[CompiledPipeline, Dict[str, Any]]
+    starting: List[_PendingTask] = field(default_factory=list)
+    ready: Deque[_PendingTask] = field(default_factory=deque)
+    waiters: int = 0
+    last_used: float = field(default_factory=time.monotonic)  # Last warm() or lease()
+
+
+class TaskPool:
+    """
+    Keeps a number of ready webhook tasks per pipeline configuration.
+
+    A background thread launches tasks with ``execute_task``, polls ``GET /task``
+    until each one is ready, tops the pool back up after every lease and
+    cancels tasks that sit idle longer than ``idle_ttl``. A configuration
+    that nobody has warmed or leased for ``idle_ttl`` is no longer topped
+    up; its pool is dropped once its tasks are gone. A task that has been
+    ready for a while is probed again before it is leased out.
+
+    Example:
+        >>> with TaskPool(client, size=4) as pool:
+        ...     lease = pool.lease(pipeline_config)
+        ...     result = client.upload_file_to_webhook(lease.token, "document.pdf")
+    """
+
+    def __init__(
+        self,
+        client: DTCApiClient,
+        size: int = 2,
+        idle_ttl: float = 600.0,
+        ready_timeout: float = 120.0,
+        poll_interval: float = 0.5,
+        ready_object_prefix: str = "webhook://",
+        name_prefix: str = "task_pool",
+        threads: int = None
+    ):
+        """
+        Initialize the task pool.
+
+        Args:
+            client: Client used to launch, poll and cancel tasks
+            size: Number of ready (or starting) tasks to keep per configuration
+            idle_ttl: Seconds a ready task may wait for a lease before it is cancelled
+            ready_timeout: Seconds a task may take to become ready before it is cancelled
+            poll_interval: Seconds between background maintenance passes
+            ready_object_prefix: ``currentObject`` prefix signalling readiness
+            name_prefix: Prefix for the names of launched tasks
+            threads: Optional engine thread count passed to execute_task
+        """
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+
+        self.client = client
+        self.size = size
+        self.idle_ttl = idle_ttl
+        self.ready_timeout = ready_timeout
+        self.poll_interval = poll_interval
+        self.ready_object_prefix = ready_object_prefix
+        self.name_prefix = name_prefix
+        self.threads = threads
+
+        self._pools: Dict[str, _ConfigPool] = {}
+        self._condition = threading.Condition()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._launched = 0
+        self._thread = threading.Thread(target=self._run, name="dtc-task-pool", daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "TaskPool":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def warm(self, config: Union[PipelineConfig, CompiledPipeline, Dict[str, Any]]) -> str:
+        """
+        Start keeping ready tasks for a configuration without leasing one.
+
+        Returns:
+            Key identifying the configuration's pool
+        """
+        # Configs differing only in key order or ui blocks share a pool
+        key = config_hash(config)
+        with self._condition:
+            self._pool(key, config).last_used = time.monotonic()
+        self._wakeup.set()
+        return key
+
+    def lease(self, config: Union[PipelineConfig, CompiledPipeline, Dict[str, Any]], timeout: float = None) -> TaskLease:
+        """
+        Take a ready task for a configuration, waiting for one if necessary.
+
+        Args:
+            config: Task configuration (as passed to execute_task)
+            timeout: Maximum seconds to wait; defaults to ``ready_timeout``
+
+        Returns:
+            TaskLease whose token is ready to accept webhook uploads
+
+        Raises:
+            TimeoutError: If no task becomes ready in time
+        """
+        key = config_hash(config)
+        deadline = time.monotonic() + (self.ready_timeout if timeout is None else timeout)
+
+        while True:
+            with self._condition:
+                pool = self._pool(key, config)
+                pool.last_used = time.monotonic()
+                pool.waiters += 1
+                self._wakeup.set()
+                try:
+                    while not pool.ready:
+                        remaining = deadline - time.monotonic()
+                        if self._closed:
+                            raise RuntimeError("TaskPool is closed")
+                        if remaining <= 0:
+                            raise TimeoutError("No ready task became available in time")
+                        self._condition.wait(remaining)
+                    task = pool.ready.popleft()
+                    pool.last_used = time.monotonic()
+                finally:
+                    pool.waiters -= 1
+
+            # Replace the leased task right away
+            self._wakeup.set()
+            if self._still_ready(task):
+                return TaskLease(
+                    token=task.token,
+                    config_key=key,
+                    created_at=task.created_at,
+                    ready_at=task.ready_at
+                )
+            self._cancel(task.token)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get pool statistics.
+
+        Returns:
+            Dictionary with launched task count and per-config ready/starting counts
+        """
+        with self._condition:
+            return {
+                "launched": self._launched,
+                "pools": {
+                    key: {"ready": len(pool.ready), "starting": len(pool.starting)}
+                    for key, pool in self._pools.items()
+                }
+            }
+
+    def close(self, cancel_idle: bool = True) -> None:
+        """
+        Stop the background thread and cancel tasks that were never leased.
+
+        Args:
+            cancel_idle: Cancel ready and starting tasks still held by the pool
+        """
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+
+        # Let an in-progress maintenance pass finish before collecting tasks
+        self._wakeup.set()
+        self._thread.join()
+
+        with self._condition:
+            leftovers = [
+                task.token
+                for pool in self._pools.values()
+                for task in list(pool.ready) + pool.starting
+            ]
+            self._pools.clear()
+
+        if cancel_idle:
+            for token in leftovers:
+                self._cancel(token)
+
+    def _pool(self, key: str, config: Union[PipelineConfig, CompiledPipeline, Dict[str, Any]]) -> _ConfigPool:
+        """Return the pool for a configuration, creating it; call with the condition held."""
+        if self._closed:
+            raise RuntimeError("TaskPool is closed")
+        pool = self._pools.get(key)
+        if pool is None:
+            # Compiled pipelines are kept as-is so launches skip JSON encoding
+            pool = self._pools[key] = _ConfigPool(
+                config=config if isinstance(config, CompiledPipeline) else _config_to_dict(config)
+            )
+        return pool
+
+    def _still_ready(self, task: _PendingTask) -> bool:
+        """Probe a task that has sat ready since its last check; it may have exited server-side."""
+        if task.checked_at is not None and time.monotonic() - task.checked_at < self.poll_interval:
+            return True
+        try:
+            data = self.client._get_task_data(task.token)
+        except DTCApiError as e:
+            if e.status_code in GONE_STATUS_CODES:
+                return False
+            # Unknown rather than gone; let the caller find out on upload
+            logger.warning("Status probe failed for pooled task %s: %s", task.token, e)
+            return True
+        return is_task_ready(data, self.ready_object_prefix)
+
+    # Background maintenance
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+            if self._closed:
+                break
+            try:
+                self._maintain()
+            except Exception:  # pragma: no cover - keep the pool alive
+                logger.exception("Task pool maintenance failed")
+
+    def _maintain(self) -> None:
+        with self._condition:
+            pools = list(self._pools.items())
+
+        for key, pool in pools:
+            self._expire_idle(pool)
+            self._check_starting(pool)
+            with self._condition:
+                unused = not pool.waiters and time.monotonic() - pool.last_used > self.idle_ttl
+                if unused and not pool.ready and not pool.starting and self._pools.get(key) is pool:
+                    # Nobody wants this configuration any more; free the slot
+                    del self._pools[key]
+            if not unused:
+                self._top_up(pool)
+
+    def _expire_idle(self, pool: _ConfigPool) -> None:
+        now = time.monotonic()
+        with self._condition:
+            expired = [task for task in pool.ready if now - task.ready_at > self.idle_ttl]
+            for task in expired:
+                pool.ready.remove(task)
+        for task in expired:
+            self._cancel(task.token)
+
+    def _check_starting(self, pool: _ConfigPool) -> None:
+        with self._condition:
+            starting = list(pool.starting)
+
+        for task in starting:
+            try:
+                data = self.client._get_task_data(task.token)
+            except DTCApiError as e:
+                logger.warning("Readiness check failed for task %s: %s", task.token, e)
+                continue
+
+            now = time.monotonic()
+            if is_task_ready(data, self.ready_object_prefix):
+                task.ready_at = task.checked_at = now
+                with self._condition:
+                    pool.starting.remove(task)
+                    pool.ready.append(task)
+                    self._condition.notify_all()
+            elif _task_exited(data) or now - task.created_at > self.ready_timeout:
+                # Exited during startup or never came up: discard and replace
+                with self._condition:
+                    pool.starting.remove(task)
+                self._cancel(task.token)
+
+    def _top_up(self, pool: _ConfigPool) -> None:
+        with self._condition:
+            missing = self.size - len(pool.ready) - len(pool.starting)
+            # Waiting callers beyond the target size get their own task
+            missing = max(missing, pool.waiters - len(pool.starting))
+
+        for _ in range(missing):
+            if self._closed:
+                return
+            try:
+                token = self.client.execute_task(
+                    pool.config,
+                    name=f"{self.name_prefix}_{int(time.time() * 1000)}",
+                    threads=self.threads
+                )
+            except DTCApiError as e:
+                logger.warning("Task pool failed to launch a task: %s", e)
+                return
+            with self._condition:
+                self._launched += 1
+                pool.starting.append(_PendingTask(token=token, created_at=time.monotonic()))
+
+    def _cancel(self, token: str) -> None:
+        try:
+            self.client.cancel_task(token)
+        except DTCApiError as e:
+            logger.warning("Failed to cancel pooled task %s: %s", token, e)
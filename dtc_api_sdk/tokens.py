@@ -0,0 +1,252 @@
+"""
+Persistent token store for the DTC API SDK.
+
+A SQLite-backed drop-in for the in-memory TokenRegistry. Every task and
+pipeline a client creates is appended as one row, indexed by name, state,
+configuration hash and creation time, so CLIs, reapers and batch jobs in
+different processes can share one history and query it cheaply. The
+database runs in WAL mode: readers never block the writer, and concurrent
+writers wait on a busy timeout instead of failing.
+"""
+
+import os
+import time
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from .models import PipelineConfig, CompiledPipeline
+from .pipeline import config_hash as _config_hash
+from .reaper import RUNNING, RELEASED, HOSTNAME, TrackedToken
+
+DEFAULT_TOKEN_STORE = "~/.dtc_tokens.db"
+
+_COLUMNS = "token, kind, name, config_hash, pid, host, state, created, last_used"
+
+
+def _row_to_token(row: tuple) -> TrackedToken:
+    token, kind, name, config_hash, pid, host, state, created, last_used = row
+    return TrackedToken(
+        token=token, kind=kind, name=name, config_hash=config_hash,
+        pid=pid, host=host, state=state, created=created, last_used=last_used
+    )
+
+
+class TokenStore:
+    """
+    Task and pipeline tokens persisted in SQLite.
+
+    Pass a store as the client's ``registry`` to record every token the
+    client creates. Released tokens stay in the store with state
+    ``"released"``, so the history can be listed and queried later.
+
+    Example:
+        >>> store = TokenStore()
+        >>> client = DTCApiClient(registry=store)
+        >>> running = store.find(kind="task", state="running", config=pipeline_config)
+    """
+
+    def __init__(self, path: Union[str, Path] = None, touch_interval: float = 1.0, busy_timeout: float = 30.0):
+        """
+        Open or create a token store.
+
+        Args:
+            path: SQLite database file; defaults to ``~/.dtc_tokens.db``
+            touch_interval: Minimum seconds between last-used writes for one
+                    token, so busy tokens do not cost a write per request
+            busy_timeout: Seconds to wait for another process's write lock
+        """
+        self.path = os.path.expanduser(str(path if path is not None else DEFAULT_TOKEN_STORE))
+        self.touch_interval = touch_interval
+
+        self._lock = threading.Lock()
+        self._touched: Dict[str, float] = {}
+        self._connection = sqlite3.connect(
+            self.path, timeout=busy_timeout, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS tokens ("
+            "token TEXT PRIMARY KEY, kind TEXT NOT NULL, name TEXT, config_hash TEXT, "
+            "pid INTEGER, host TEXT NOT NULL, state TEXT NOT NULL, "
+            "created REAL NOT NULL, last_used REAL NOT NULL, released REAL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS tokens_name ON tokens (name)")
+        self._connection.execute("CREATE INDEX IF NOT EXISTS tokens_state ON tokens (state, kind)")
+        self._connection.execute("CREATE INDEX IF NOT EXISTS tokens_config ON tokens (config_hash, state)")
+        self._connection.execute("CREATE INDEX IF NOT EXISTS tokens_created ON tokens (created)")
+
+    def __enter__(self) -> "TokenStore":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        """Number of running resources."""
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM tokens WHERE state = ?", (RUNNING,)).fetchone()[0]
+
+    def __contains__(self, token: str) -> bool:
+        """True if the token is running."""
+        with self._lock:
+            row = self._connection.execute("SELECT state FROM tokens WHERE token = ?", (token,)).fetchone()
+        return row is not None and row[0] == RUNNING
+
+    # TokenRegistry interface
+
+    def register(self, token: str, kind: str, name: str = None, config_hash: str = None) -> TrackedToken:
+        """Record a newly created resource as running."""
+        tracked = TrackedToken(token=token, kind=kind, name=name, config_hash=config_hash)
+        with self._lock:
+            self._connection.execute(
+                f"INSERT OR REPLACE INTO tokens ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (tracked.token, tracked.kind, tracked.name, tracked.config_hash, tracked.pid,
+                 tracked.host, tracked.state, tracked.created, tracked.last_used)
+            )
+            self._touched[token] = tracked.last_used
+        return tracked
+
+    def touch(self, token: str) -> None:
+        """Mark a resource as used now, at most once per ``touch_interval``."""
+        now = time.time()
+        with self._lock:
+            last = self._touched.get(token)
+            if last is not None and now - last < self.touch_interval:
+                return
+            updated = self._connection.execute(
+                "UPDATE tokens SET last_used = ? WHERE token = ? AND state = ?", (now, token, RUNNING)
+            ).rowcount
+            # Only running tokens are throttled, so unknown or released ones cannot pile up here
+            if updated:
+                self._touched[token] = now
+            else:
+                self._touched.pop(token, None)
+
+    def unregister(self, token: str) -> bool:
+        """Mark a resource released; returns True if it was running."""
+        return self.set_state(token, RELEASED)
+
+    def detach(self, token: str) -> None:
+        """Let a resource outlive its creating process; only the TTL applies to it."""
+        with self._lock:
+            self._connection.execute("UPDATE tokens SET pid = NULL WHERE token = ?", (token,))
+
+    def get(self, token: str) -> Optional[TrackedToken]:
+        """Return the record of a token in any state, or None."""
+        with self._lock:
+            row = self._connection.execute(f"SELECT {_COLUMNS} FROM tokens WHERE token = ?", (token,)).fetchone()
+        return _row_to_token(row) if row else None
+
+    def tokens(self, kind: str = None) -> List[TrackedToken]:
+        """Running resources, optionally of one kind, oldest first."""
+        return self.find(kind=kind, state=RUNNING)
+
+    def stale(self, ttl: float, now: float = None) -> List[TrackedToken]:
+        """Running resources idle for longer than ``ttl`` seconds or owned by a dead process on this host."""
+        cutoff = (now if now is not None else time.time()) - ttl
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT {_COLUMNS} FROM tokens WHERE state = ? AND last_used < ? ORDER BY created",
+                (RUNNING, cutoff)
+            ).fetchall()
+            owned = self._connection.execute(
+                f"SELECT {_COLUMNS} FROM tokens WHERE state = ? AND last_used >= ? "
+                "AND pid IS NOT NULL AND host = ? ORDER BY created",
+                (RUNNING, cutoff, HOSTNAME)
+            ).fetchall()
+        stale = [_row_to_token(row) for row in rows]
+        alive: Dict[int, bool] = {}
+        for tracked in map(_row_to_token, owned):
+            if tracked.pid not in alive:
+                alive[tracked.pid] = tracked.owner_alive()
+            if not alive[tracked.pid]:
+                stale.append(tracked)
+        return stale
+
+    # Queries
+
+    def set_state(self, token: str, state: str) -> bool:
+        """
+        Record a new state for a token, e.g. ``"completed"`` once a task finishes.
+
+        Returns:
+            True if the token was running
+        """
+        released = None if state == RUNNING else time.time()
+        with self._lock:
+            self._touched.pop(token, None)
+            row = self._connection.execute("SELECT state FROM tokens WHERE token = ?", (token,)).fetchone()
+            if row is None:
+                return False
+            self._connection.execute(
+                "UPDATE tokens SET state = ?, released = ? WHERE token = ?", (state, released, token)
+            )
+        return row[0] == RUNNING
+
+    def find(
+        self,
+        kind: str = None,
+        state: str = None,
+        name: str = None,
+        config: Union[PipelineConfig, CompiledPipeline, Dict[str, Any]] = None,
+        config_hash: str = None,
+        since: float = None,
+        limit: int = None,
+        newest_first: bool = False
+    ) -> List[TrackedToken]:
+        """
+        Query tokens.
+
+        Args:
+            kind: ``"task"`` or ``"pipeline"``
+            state: e.g. ``"running"`` or ``"released"``
+            name: Exact name given at creation
+            config: Configuration the resource was created from
+            config_hash: Hash of that configuration, if already known
+            since: Only tokens created at or after this Unix time
+            limit: Maximum number of tokens returned
+            newest_first: Order by creation time descending
+
+        Returns:
+            Matching tokens ordered by creation time
+        """
+        if config is not None:
+            config_hash = _config_hash(config)
+        clauses, params = [], []
+        for column, value in (("kind", kind), ("state", state), ("name", name), ("config_hash", config_hash)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            clauses.append("created >= ?")
+            params.append(since)
+        query = f"SELECT {_COLUMNS} FROM tokens"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY created DESC" if newest_first else " ORDER BY created"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._connection.execute(query, params).fetchall()
+        return [_row_to_token(row) for row in rows]
+
+    def purge(self, older_than: float) -> int:
+        """
+        Delete released tokens created more than ``older_than`` seconds ago.
+
+        Returns:
+            Number of rows deleted
+        """
+        with self._lock:
+            return self._connection.execute(
+                "DELETE FROM tokens WHERE state != ? AND created < ?", (RUNNING, time.time() - older_than)
+            ).rowcount
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,210 @@
+"""
+HTTP transport helpers for the DTC API SDK.
+
+Provides transport profiles for sizing connection pools, connection-pooling
+adapters that expose reuse metrics, and a helper for building sessions that
+share an adapter but carry different auth headers.
+"""
+
+import time
+import threading
+from dataclasses import dataclass
+from typing import Dict, Any, Callable, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.poolmanager import PoolManager
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+
+# Endpoints whose traffic goes through the data-plane pool; everything else
+# (task creation, status polls, health checks) uses the control-plane pool
+DATA_PLANE_ENDPOINTS = ("/webhook", "/pipe/process")
+
+
+@dataclass
+class TransportProfile:
+    """
+    Connection pool settings for one traffic plane.
+    
+    Attributes:
+        pool_connections: Number of per-host pools to cache.
+        pool_maxsize: Maximum connections kept per host. Size this to the
+            number of threads sharing the client.
+        pool_block: Block callers when all connections are in use instead of
+            opening extra, non-reusable connections.
+        keepalive_idle_timeout: Reconnect pooled connections that have been
+            idle for longer than this many seconds when they are next checked
+            out, before the server closes them under us. ``None`` keeps them
+            indefinitely.
+    """
+    pool_connections: int = 10
+    pool_maxsize: int = 10
+    pool_block: bool = False
+    keepalive_idle_timeout: Optional[float] = None
+    
+    def build_adapter(self, max_retries: Any = 0) -> "PooledHTTPAdapter":
+        """Create an adapter configured with this profile."""
+        return PooledHTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+            max_retries=max_retries,
+            idle_timeout=self.keepalive_idle_timeout
+        )
+
+
+@dataclass
+class PoolStats:
+    """Connection pool usage statistics for one adapter."""
+    requests: int = 0
+    connections_opened: int = 0
+    idle_connections: int = 0
+    pools: int = 0
+    idle_resets: int = 0  # Idle connections reconnected on checkout
+
+    @property
+    def reuse_ratio(self) -> float:
+        """Fraction of requests served over an already-open connection."""
+        if not self.requests:
+            return 0.0
+        return max(0.0, 1.0 - self.connections_opened / self.requests)
+
+
+class _IdleExpiringPool:
+    """Connection pool mixin that reconnects connections idle past ``idle_timeout`` on checkout."""
+
+    idle_timeout: Optional[float] = None
+    on_idle_reset: Optional[Callable[[], None]] = None
+
+    def _get_conn(self, timeout: Optional[float] = None) -> Any:
+        conn = super()._get_conn(timeout)
+        idle_since = getattr(conn, "_dtc_idle_since", None)
+        if (
+            self.idle_timeout is not None
+            and idle_since is not None
+            and time.monotonic() - idle_since > self.idle_timeout
+        ):
+            # Likely closed server-side; urllib3 reopens a closed connection
+            # on its next request. Other connections are left alone.
+            conn.close()
+            conn._dtc_idle_since = None
+            if self.on_idle_reset is not None:
+                self.on_idle_reset()
+        return conn
+
+    def _put_conn(self, conn: Any) -> None:
+        if conn is not None:
+            conn._dtc_idle_since = time.monotonic()
+        super()._put_conn(conn)
+
+
+class _IdleExpiringHTTPConnectionPool(_IdleExpiringPool, HTTPConnectionPool):
+    pass
+
+
+class _IdleExpiringHTTPSConnectionPool(_IdleExpiringPool, HTTPSConnectionPool):
+    pass
+
+
+class _IdleExpiringPoolManager(PoolManager):
+    """PoolManager whose pools track each connection's idle time."""
+
+    def __init__(
+        self,
+        *args: Any,
+        idle_timeout: Optional[float] = None,
+        on_idle_reset: Optional[Callable[[], None]] = None,
+        **kwargs: Any
+    ):
+        super().__init__(*args, **kwargs)
+        self.idle_timeout = idle_timeout
+        self.on_idle_reset = on_idle_reset
+        self.pool_classes_by_scheme = {
+            "http": _IdleExpiringHTTPConnectionPool,
+            "https": _IdleExpiringHTTPSConnectionPool,
+        }
+
+    def _new_pool(self, scheme: str, host: str, port: int, request_context: Optional[Dict[str, Any]] = None) -> Any:
+        pool = super()._new_pool(scheme, host, port, request_context=request_context)
+        pool.idle_timeout = self.idle_timeout
+        pool.on_idle_reset = self.on_idle_reset
+        return pool
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that counts requests and reports urllib3 pool statistics.
+
+    A single adapter instance can be mounted on several sessions; they then
+    share its keep-alive connections. When ``idle_timeout`` is set, each
+    pooled connection records when it was returned to the pool, and one
+    that has been idle for longer is reconnected when it is next checked
+    out; connections in use and recently used ones are unaffected.
+    """
+
+    def __init__(self, *args: Any, idle_timeout: Optional[float] = None, **kwargs: Any):
+        self._stats_lock = threading.Lock()
+        self._requests_sent = 0
+        self._idle_resets = 0
+        self.idle_timeout = idle_timeout
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, connections: int, maxsize: int, block: bool = False, **pool_kwargs: Any) -> None:
+        if self.idle_timeout is None:
+            super().init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+            return
+        # Saved as HTTPAdapter.init_poolmanager does, for pickling
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+        self.poolmanager = _IdleExpiringPoolManager(
+            num_pools=connections,
+            maxsize=maxsize,
+            block=block,
+            idle_timeout=self.idle_timeout,
+            on_idle_reset=self._count_idle_reset,
+            **pool_kwargs
+        )
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        with self._stats_lock:
+            self._requests_sent += 1
+        return super().send(request, **kwargs)
+
+    def _count_idle_reset(self) -> None:
+        with self._stats_lock:
+            self._idle_resets += 1
+
+    def pool_stats(self) -> PoolStats:
+        """Return a snapshot of this adapter's connection pool usage."""
+        stats = PoolStats(requests=self._requests_sent, idle_resets=self._idle_resets)
+        container = self.poolmanager.pools
+        for key in container.keys():
+            try:
+                pool = container[key]
+            except KeyError:
+                # Evicted between keys() and lookup
+                continue
+            stats.pools += 1
+            stats.connections_opened += pool.num_connections
+            stats.idle_connections += sum(1 for conn in list(pool.pool.queue) if conn is not None)
+        return stats
+
+
+def build_session(adapter: HTTPAdapter, headers: Dict[str, str]) -> requests.Session:
+    """
+    Create a session that sends all traffic through ``adapter``.
+
+    Args:
+        adapter: Adapter owning the connection pool
+        headers: Default headers for every request on this session
+
+    Returns:
+        Configured requests.Session
+    """
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(headers)
+    return session
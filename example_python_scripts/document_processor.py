@@ -107,6 +107,30 @@ class DocumentProcessor:
         
         return response.json()["data"]["token"]
     
+    def _wait_until_ready(self, task_token: str, deadline: float = 60) -> None:
+        """Poll the task status until the webhook source accepts data."""
+        end_time = time.time() + deadline
+        interval = 0.25
+        
+        while time.time() < end_time:
+            response = requests.get(
+                f"{self.base_url}/task",
+                params={"token": task_token},
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                timeout=30
+            )
+            status = response.json().get("data") or {}
+            
+            if status.get("serviceUp") and str(status.get("currentObject", "")).startswith("webhook://"):
+                return
+            if status.get("completed") or status.get("exitCode"):
+                raise Exception(f"Task exited during startup: {status.get('exitMsg')}")
+            
+            time.sleep(interval)
+            interval = min(interval * 2, 2.0)
+        
+        raise Exception(f"Task was not ready within {deadline} seconds")
+    
     def _get_content_type(self, file_path: str) -> str:
         """Get the appropriate content type for the file."""
         file_path = Path(file_path)
@@ -127,10 +151,6 @@ class DocumentProcessor:
         """Send file to webhook endpoint using the working curl format."""
         file_path = Path(file_path)
         
-        # Read file as binary data
-        with open(file_path, 'rb') as f:
-            file_data = f.read()
-        
         # Webhook parameters (exact format from working curl command)
         webhook_params = {
             "type": "cpu",
@@ -144,14 +164,15 @@ class DocumentProcessor:
             "Content-Type": self._get_content_type(str(file_path))
         }
         
-        # Send webhook request
-        response = requests.put(
-            f"{self.base_url}/webhook",
-            params=webhook_params,
-            headers=webhook_headers,
-            data=file_data,  # Upload file as request body (like curl -T)
-            timeout=120
-        )
+        # Send webhook request, streaming the file rather than reading it into memory
+        with open(file_path, 'rb') as f:
+            response = requests.put(
+                f"{self.base_url}/webhook",
+                params=webhook_params,
+                headers=webhook_headers,
+                data=f,  # Upload file as request body (like curl -T)
+                timeout=120
+            )
         
         if response.status_code != 200:
             raise Exception(f"Webhook failed: {response.text}")
@@ -224,7 +245,7 @@ class DocumentProcessor:
         
         # Step 2: Wait for task to be ready
         print("2️⃣ Waiting for task initialization...")
-        time.sleep(5)
+        self._wait_until_ready(task_token)
         
         # Step 3: Send file via webhook
         print("3️⃣ Sending file for processing...")
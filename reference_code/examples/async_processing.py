@@ -47,31 +47,17 @@ class BatchProcessor:
     
     def wait_for_completion(self, timeout: int = 300) -> Dict[str, TaskInfo]:
         """Wait for all tasks to complete."""
-        start_time = time.time()
         completed_tasks = {}
         
-        while self.active_tasks and (time.time() - start_time) < timeout:
-            print(f"⏳ Monitoring {len(self.active_tasks)} active tasks...")
-            
-            # Get current status of all tasks
-            status_map = self.get_all_task_status()
-            
-            # Check for completed tasks
-            completed_tokens = []
-            for token, task_info in status_map.items():
-                task_name = self.active_tasks[token]
+        print(f"⏳ Monitoring {len(self.active_tasks)} active tasks...")
+        try:
+            # One scheduler polls every task and reports each as soon as it finishes
+            for task_info in self.client.as_completed(list(self.active_tasks), timeout=timeout):
+                task_name = self.active_tasks.pop(task_info.token)
                 print(f"  {task_name}: {task_info.status.value}")
-                
-                if task_info.status.value in ["completed", "failed", "cancelled"]:
-                    completed_tasks[token] = task_info
-                    completed_tokens.append(token)
-            
-            # Remove completed tasks from active list
-            for token in completed_tokens:
-                del self.active_tasks[token]
-            
-            if self.active_tasks:
-                time.sleep(10)  # Wait before next check
+                completed_tasks[task_info.token] = task_info
+        except TimeoutError:
+            pass
         
         # Handle remaining tasks (timeout or incomplete)
         if self.active_tasks:
@@ -16,7 +16,7 @@ import sys
 from pathlib import Path
 from typing import List, Optional
 
-from dtc_api_sdk import DTCApiClient, PipelineConfig
+from dtc_api_sdk import DTCApiClient, PipelineConfig, TokenStore
 from dtc_api_sdk.exceptions import DTCApiError
 
 
@@ -24,7 +24,9 @@ class DTCCli:
     """Command-line interface for the DTC API SDK."""
     
     def __init__(self):
-        self.client = DTCApiClient()
+        # Every created token is recorded in ~/.dtc_tokens.db
+        self.tokens = TokenStore()
+        self.client = DTCApiClient(registry=self.tokens)
     
     def check_status(self) -> None:
         """Check API status and version."""
@@ -94,8 +96,8 @@ class DTCCli:
             print(f"  Name: {name or 'Unnamed'}")
             print(f"  Threads: {threads}")
             
-            # Save token for later use
-            self._save_token(token, name)
+            # Keep the task out of reach of dead-process cleanup once we exit
+            self.tokens.detach(token)
             
         except DTCApiError as e:
             print(f"✗ Error: {e}")
@@ -175,8 +177,8 @@ class DTCCli:
             print(f"  Token: {token}")
             print(f"  Name: {name or 'Unnamed'}")
             
-            # Save token for later use
-            self._save_token(token, name, pipeline=True)
+            # Keep the pipeline out of reach of dead-process cleanup once we exit
+            self.tokens.detach(token)
             
         except DTCApiError as e:
             print(f"✗ Error: {e}")
@@ -210,52 +212,17 @@ class DTCCli:
             sys.exit(1)
     
     def list_tokens(self) -> None:
-        """List saved tokens."""
-        token_file = Path.home() / ".dtc_tokens.json"
-        if not token_file.exists():
+        """List recently created tokens."""
+        tokens = self.tokens.find(limit=10, newest_first=True)
+        if not tokens:
             print("No saved tokens found")
             return
         
-        try:
-            with open(token_file, 'r') as f:
-                tokens = json.load(f)
-            
-            print(f"Saved Tokens ({len(tokens)}):")
-            for token_info in tokens:
-                print(f"  - {token_info['token'][:8]}... "
-                      f"({token_info.get('name', 'Unnamed')}) "
-                      f"[{'Pipeline' if token_info.get('pipeline') else 'Task'}]")
-        
-        except (json.JSONDecodeError, KeyError):
-            print("✗ Error reading saved tokens")
-    
-    def _save_token(self, token: str, name: Optional[str] = None, pipeline: bool = False) -> None:
-        """Save token to file for later use."""
-        token_file = Path.home() / ".dtc_tokens.json"
-        
-        # Load existing tokens
-        tokens = []
-        if token_file.exists():
-            try:
-                with open(token_file, 'r') as f:
-                    tokens = json.load(f)
-            except json.JSONDecodeError:
-                tokens = []
-        
-        # Add new token
-        tokens.append({
-            "token": token,
-            "name": name,
-            "pipeline": pipeline,
-            "created_at": str(Path.cwd())
-        })
-        
-        # Keep only last 10 tokens
-        tokens = tokens[-10:]
-        
-        # Save tokens
-        with open(token_file, 'w') as f:
-            json.dump(tokens, f, indent=2)
+        print(f"Saved Tokens ({len(tokens)}):")
+        for token_info in tokens:
+            print(f"  - {token_info.token[:8]}... "
+                  f"({token_info.name or 'Unnamed'}) "
+                  f"[{token_info.kind.capitalize()}, {token_info.state}]")
 
 
 def create_sample_config(filename: str = "sample_config.json") -> None:
@@ -27,7 +27,7 @@ import mimetypes
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 
-from dtc_api_sdk import DTCApiClient
+from dtc_api_sdk import DTCApiClient, BatchRunner
 from dtc_api_sdk.exceptions import DTCApiError, AuthenticationError, NetworkError
 
 
@@ -164,25 +164,21 @@ def robust_webhook_processing(
             )
             print(f"✅ Task created: {task_token}")
             
-            # Prepare file data
-            with open(file_path, 'rb') as f:
-                file_content = f.read()
-            
-            webhook_data = {
-                "filename": file_path.name,
-                "content_type": get_mime_type(str(file_path)),
-                "size": len(file_content),
-                "data": base64.b64encode(file_content).decode('utf-8')
-            }
-            
+            # Stream the base64 payload from disk instead of loading the file
             print(f"📤 Sending webhook data...")
-            response = client.send_webhook(task_token, webhook_data)
+            response = client.send_webhook_file(
+                task_token,
+                file_path,
+                fields={"content_type": get_mime_type(str(file_path))}
+            )
             
             # Restore original timeout
             client.timeout = original_timeout
             
             print(f"✅ Processing completed successfully!")
-            return parse_webhook_response(response)
+            results = parse_webhook_response(response)
+            print_processing_summary(results)
+            return results
             
         except (NetworkError, ConnectionError, TimeoutError) as e:
             print(f"❌ Attempt {attempt + 1} failed: {e}")
@@ -217,6 +213,9 @@ def parse_webhook_response(response: Dict[str, Any]) -> Dict[str, Any]:
     """
     Parse webhook response and extract structured data.
     
+    Prints nothing, so it is safe to use as a BatchRunner ``parse``
+    callback running on worker threads.
+    
     Args:
         response: Raw webhook response
         
@@ -234,20 +233,13 @@ def parse_webhook_response(response: Dict[str, Any]) -> Dict[str, Any]:
         "raw_response": response
     }
     
-    print(f"📊 Processing completed:")
-    print(f"   Objects requested: {results['processing_stats']['objects_requested']}")
-    print(f"   Objects completed: {results['processing_stats']['objects_completed']}")
-    
     if 'objects' in response and response['objects']:
-        print(f"🔍 Analyzing {len(response['objects'])} processed objects...")
+        results['processing_stats']['objects'] = list(response['objects'])
         
         for obj_id, obj_data in response['objects'].items():
-            print(f"   📦 Object: {obj_id}")
-            
             # Extract metadata
             if 'metadata' in obj_data:
                 results['metadata'] = obj_data['metadata']
-                print(f"   📋 Metadata: {obj_data['metadata']}")
             
             # Extract text content
             if 'text' in obj_data and obj_data['text']:
@@ -275,7 +267,6 @@ def parse_webhook_response(response: Dict[str, Any]) -> Dict[str, Any]:
                                 
                                 if readable_lines:
                                     results['extracted_text'] = '\n'.join(readable_lines[:50])  # First 50 lines
-                                    print(f"   📄 Extracted {len(readable_lines)} text lines")
                                 
                             except Exception:
                                 # If decoding fails, use the JSON content as text
@@ -289,12 +280,23 @@ def parse_webhook_response(response: Dict[str, Any]) -> Dict[str, Any]:
                 
                 elif isinstance(text_content, str):
                     results['extracted_text'] = text_content
-                
-                print(f"   📄 Text content: {len(results['extracted_text'])} characters")
     
     return results
 
 
+def print_processing_summary(results: Dict[str, Any]) -> None:
+    """Print the statistics, objects and metadata of parsed webhook results."""
+    stats = results['processing_stats']
+    print(f"📊 Processing completed:")
+    print(f"   Objects requested: {stats['objects_requested']}")
+    print(f"   Objects completed: {stats['objects_completed']}")
+    for obj_id in stats.get('objects', []):
+        print(f"   📦 Object: {obj_id}")
+    if results['metadata']:
+        print(f"   📋 Metadata: {results['metadata']}")
+    print(f"   📄 Text content: {len(results['extracted_text'])} characters")
+
+
 def save_results(results: Dict[str, Any], output_file: str) -> None:
     """Save processing results to JSON file."""
     with open(output_file, 'w', encoding='utf-8') as f:
@@ -302,25 +304,32 @@ def save_results(results: Dict[str, Any], output_file: str) -> None:
     print(f"💾 Results saved to: {output_file}")
 
 
-def process_multiple_files(file_paths: List[str]) -> Dict[str, Any]:
-    """Process multiple documents in batch."""
+def process_multiple_files(file_paths: List[str], max_workers: int = 4) -> Dict[str, Any]:
+    """Process multiple documents in parallel, each worker reusing a warm task."""
     client = DTCApiClient()
+    # upload_file_to_webhook() returns {status, data: {objects, ...}, metrics};
+    # parsing runs on the worker threads, printing and saving stay in this loop
+    runner = BatchRunner(
+        client, create_webhook_pipeline(),
+        max_workers=max_workers,
+        parse=lambda response: parse_webhook_response(response.get("data") or {})
+    )
     results = {}
     
-    print(f"📦 Batch processing {len(file_paths)} files...")
+    print(f"📦 Batch processing {len(file_paths)} files with {max_workers} workers...")
     
-    for i, file_path in enumerate(file_paths, 1):
-        print(f"\n[{i}/{len(file_paths)}] Processing: {file_path}")
-        
-        try:
-            result = robust_webhook_processing(client, file_path)
-            results[file_path] = result
-            print(f"✅ Completed: {file_path}")
-            
-        except Exception as e:
-            print(f"❌ Failed: {file_path} - {e}")
-            results[file_path] = {"error": str(e)}
+    for i, result in enumerate(runner.iter_results(file_paths), 1):
+        if result.ok:
+            print(f"[{i}/{len(file_paths)}] ✅ Completed: {result.path} ({result.seconds:.1f}s)")
+            print_processing_summary(result.result)
+            save_results(result.result, f"results_{Path(result.path).stem}.json")
+            results[str(result.path)] = result.result
+        else:
+            print(f"[{i}/{len(file_paths)}] ❌ Failed: {result.path} - {result.error}")
+            results[str(result.path)] = {"error": result.error}
     
+    stats = runner.stats()
+    print(f"\n⚡ {stats.files_per_second:.2f} files/s, {stats.bytes_per_second / 1024:.0f} KB/s")
     return results
 
 
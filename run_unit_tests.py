@@ -50,7 +50,25 @@ class UnitTestRunner:
             "unit_tests.test_task_execute_endpoint",
             "unit_tests.test_webhook_endpoint",
             "unit_tests.test_chat_endpoint",
-            "unit_tests.test_dropper_endpoint"
+            "unit_tests.test_dropper_endpoint",
+            "unit_tests.test_async_client",
+            "unit_tests.test_transport",
+            "unit_tests.test_task_pool",
+            "unit_tests.test_task_polling",
+            "unit_tests.test_task_snapshot",
+            "unit_tests.test_streaming_upload",
+            "unit_tests.test_retry",
+            "unit_tests.test_ratelimit",
+            "unit_tests.test_concurrency",
+            "unit_tests.test_pipeline_cache",
+            "unit_tests.test_pipeline_graph",
+            "unit_tests.test_result_cache",
+            "unit_tests.test_batch",
+            "unit_tests.test_journal",
+            "unit_tests.test_reaper",
+            "unit_tests.test_token_store",
+            "unit_tests.test_cli",
+            "unit_tests.test_daemon"
         ]
         
         self.results = []
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Local mock of the DTC API for offline unit tests
+
+Serves canned JSON responses per (method, path) from a background thread and
+records every request it receives, so client behaviour can be tested without
+a DTC_API_KEY or network access.
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+
+class RecordedRequest:
+    """A request captured by the mock server"""
+    def __init__(self, method, path, query, headers, body):
+        self.method = method
+        self.path = path
+        self.query = query
+        self.headers = headers
+        self.body = body
+
+    def json(self):
+        return json.loads(self.body.decode("utf-8"))
+
+
+class MockDTCServer:
+    """
+    Minimal threaded HTTP server standing in for the DTC API.
+
+    Routes map ``(method, path)`` to either a ``(status, payload)`` tuple or a
+    callable taking the RecordedRequest and returning one. A third tuple item
+    may hold extra response headers. Payloads that are not bytes are JSON
+    encoded.
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        self.connections = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately; avoid Nagle/delayed-ACK stalls
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def log_message(self, format, *args):
+                pass
+
+            def _read_body(self):
+                if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+                    chunks = []
+                    while True:
+                        size = int(self.rfile.readline().strip(), 16)
+                        if size == 0:
+                            self.rfile.readline()
+                            break
+                        chunks.append(self.rfile.read(size))
+                        self.rfile.readline()
+                    return b"".join(chunks)
+                length = int(self.headers.get("Content-Length") or 0)
+                return self.rfile.read(length) if length else b""
+
+            def _handle(self):
+                parsed = urlparse(self.path)
+                request = RecordedRequest(
+                    self.command,
+                    parsed.path,
+                    {k: v[0] for k, v in parse_qs(parsed.query).items()},
+                    dict(self.headers),
+                    self._read_body()
+                )
+                with server._lock:
+                    server.requests.append(request)
+
+                route = server.routes.get((self.command, parsed.path), (404, {"status": "Error", "error": {"message": "not found"}}))
+                status, payload, *extra = route(request) if callable(route) else route
+                body = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+
+                self.send_response(status)
+                for name, value in (extra[0] if extra else {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = do_PUT = do_POST = do_DELETE = _handle
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, args=(0.05,), daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+def ok(data):
+    """Wrap data in the standard DTC success envelope"""
+    return 200, {"status": "OK", "data": data}
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Unit tests for AsyncDTCApiClient
+
+Runs the async client against the local mock server:
+- Method and signature parity with DTCApiClient
+- Streaming and memory-mapped webhook uploads with the raw-key Authorization header
+- Scoped tasks, process_directory and bounded status polling
+- Many concurrent requests over one pooled client
+"""
+
+import asyncio
+import inspect
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+# Add the parent directory to Python path to import dtc_api_sdk
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dtc_api_sdk import DTCApiClient, AsyncDTCApiClient, ResultCache, RetryPolicy
+from dtc_api_sdk.exceptions import AuthenticationError, NetworkError, TaskError
+from unit_tests.mock_server import MockDTCServer, ok
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+@unittest.skipUnless(httpx, "httpx is not installed")
+class TestAsyncClient(unittest.TestCase):
+    """Test cases for the asyncio client"""
+
+    def setUp(self):
+        self.server = MockDTCServer().start()
+        self.server.routes[("GET", "/version")] = ok("1.2.3")
+        self.server.routes[("PUT", "/task")] = ok({"token": "task-123"})
+        self.server.routes[("GET", "/task")] = ok({"status": "completed", "name": "t"})
+        self.server.routes[("PUT", "/webhook")] = ok({"objectsCompleted": 1})
+        self.server.routes[("POST", "/pipe")] = (401, {"status": "Error", "error": {"message": "bad key"}})
+
+    def tearDown(self):
+        self.server.stop()
+
+    def _run(self, coro):
+        return asyncio.run(coro)
+
+    def test_method_parity(self):
+        """Every endpoint method of the sync client has an async counterpart"""
+        endpoint_methods = [
+            "get_version", "get_status", "get_services",
+            "create_pipeline", "delete_pipeline", "validate_pipeline", "upload_files",
+            "execute_task", "get_task_status", "get_task_snapshot", "cancel_task", "wait_for_task",
+            "send_webhook", "send_webhook_file", "upload_file_to_webhook", "get_chat_url", "get_dropper_url",
+            "as_completed", "wait_for_tasks", "task", "pipeline", "process_file", "process_webhook",
+            "process_directory",
+        ]
+        for name in endpoint_methods:
+            self.assertTrue(hasattr(DTCApiClient, name), name)
+            self.assertTrue(hasattr(AsyncDTCApiClient, name), name)
+        for name in ("as_completed", "upload_file_to_webhook", "process_file", "process_webhook"):
+            sync_params = set(inspect.signature(getattr(DTCApiClient, name)).parameters)
+            async_params = set(inspect.signature(getattr(AsyncDTCApiClient, name)).parameters)
+            self.assertEqual(sync_params, async_params, name)
+
+    def test_execute_task_and_status(self):
+        """execute_task and get_task_status parse the standard envelope"""
+        async def scenario():
+            async with AsyncDTCApiClient(api_key="key", base_url=self.server.base_url) as client:
+                token = await client.execute_task({"pipeline": {}}, name="doc")
+                info = await client.wait_for_task(token, poll_interval=0)
+                return token, info
+
+        token, info = self._run(scenario())
+        self.assertEqual(token, "task-123")
+        self.assertEqual(info.name, "t")
+        request = self.server.requests[0]
+        self.assertEqual(request.query["name"], "doc")
+        self.assertEqual(request.headers["Authorization"], "Bearer key")
+        self.assertEqual(request.json(), {"pipeline": {}})
+
+    def test_upload_file_to_webhook_streams_file(self):
+        """Direct uploads send the file bytes with the raw API key"""
+        with tempfile.NamedTemporaryFile(suffix=".txt", delete=False) as handle:
+            handle.write(b"x" * 300000)
+        self.addCleanup(os.unlink, handle.name)
+
+        async def scenario():
+            async with AsyncDTCApiClient(api_key="key", base_url=self.server.base_url) as client:
+                return await client.upload_file_to_webhook("task-123", handle.name)
+
+        result = self._run(scenario())
+        self.assertEqual(result["data"]["objectsCompleted"], 1)
+        request = self.server.requests[0]
+        self.assertEqual(request.headers["Authorization"], "key")
+        self.assertEqual(request.headers["Content-Type"], "text/plain")
+        self.assertEqual(len(request.body), 300000)
+
+    def test_upload_from_memory_map(self):
+        """use_mmap uploads send the same bytes"""
+        with tempfile.NamedTemporaryFile(suffix=".txt", delete=False) as handle:
+            handle.write(b"y" * 300000)
+        self.addCleanup(os.unlink, handle.name)
+
+        async def scenario():
+            async with AsyncDTCApiClient(api_key="key", base_url=self.server.base_url) as client:
+                return await client.upload_file_to_webhook("task-123", handle.name, use_mmap=True)
+
+        self._run(scenario())
+        self.assertEqual(self.server.requests[0].body, b"y" * 300000)
+
+    def test_task_context_and_process_directory(self):
+        """task() cancels its task; process_directory reuses one task per worker"""
+        self.server.routes[("GET", "/task")] = ok(
+            {"status": "Running", "serviceUp": 1, "currentObject": "webhook://WebHook", "exitCode": 0}
+        )
+        self.server.routes[("DELETE", "/task")] = ok(None)
+        self.server.routes[("PUT", "/webhook")] = lambda request: ok({"text": request.body.decode()})
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        for n in range(6):
+            Path(root, f"{n}.txt").write_text(f"document {n}")
+        results = []
+
+        async def scenario():
+            async with AsyncDTCApiClient(api_key="key", base_url=self.server.base_url) as client:
+                async with client.task({"pipeline": {}}) as token:
+                    self.assertEqual(token, "task-123")
+                return await client.process_directory(
+                    {"pipeline": {}}, root, max_workers=2, sink=results.append,
+                    parse=lambda response: response["data"]["text"]
+                )
+
+        stats = self._run(scenario())
+        self.assertEqual((stats.files, stats.succeeded), (6, 6))
+        self.assertEqual(sorted(result.result for result in results), [f"document {n}" for n in range(6)])
+        launched = [r for r in self.server.requests if (r.method, r.path) == ("PUT", "/task")]
+        cancelled = [r for r in self.server.requests if (r.method, r.path) == ("DELETE", "/task")]
+        self.assertLessEqual(len(launched), 3)
+        self.assertEqual(len(cancelled), len(launched))
+
+    def test_process_webhook_uses_cache(self):
+        """process_webhook sends data to a scoped task and caches the result"""
+        self.server.routes[("GET", "/task")] = ok(
+            {"status": "Running", "serviceUp": 1, "currentObject": "webhook://WebHook", "exitCode": 0}
+        )
+        self.server.routes[("DELETE", "/task")] = ok(None)
+        self.server.routes[("PUT", "/webhook")] = lambda request: ok({"echo": request.json()})
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+
+        async def scenario(cache):
+            async with AsyncDTCApiClient(api_key="key", base_url=self.server.base_url) as client:
+                first = await client.process_webhook({"pipeline": {}}, {"text": "hi"}, cache=cache)
+                second = await client.process_webhook({"pipeline": {}}, {"text": "hi"}, cache=cache)
+                return first, second
+
+        with ResultCache(Path(root) / "cache.db") as cache:
+            first, second = self._run(scenario(cache))
+        self.assertEqual(first, second)
+        self.assertEqual(len([r for r in self.server.requests if r.path == "/webhook"]), 1)
+        self.assertEqual(len([r for r in self.server.requests if r.method == "DELETE"]), 1)
+
+    def test_wait_for_task_raises_network_errors(self):
+        """wait_for_task does not retry network errors indefinitely"""
+        async def scenario():
+            async with AsyncDTCApiClient(api_key="key", base_url="http://127.0.0.1:9",
+                                         retry_policy=RetryPolicy(max_retries=0)) as client:
+                await client.wait_for_task("task-123", poll_interval=0, timeout=5)
+
+        with self.assertRaises(NetworkError):
+            self._run(scenario())
+
+    def test_error_mapping(self):
+        """HTTP errors map to the same exception types as the sync client"""
+        async def scenario():
+            async with AsyncDTCApiClient(api_key="key", base_url=self.server.base_url) as client:
+                await client.create_pipeline({"source": "x"})
+
+        with self.assertRaises(AuthenticationError):
+            self._run(scenario())
+
+    def test_failed_task_raises(self):
+        """wait_for_task raises TaskError for failed tasks"""
+        self.server.routes[("GET", "/task")] = ok({"status": "failed", "error_message": "boom"})
+
+        async def scenario():
+            async with AsyncDTCApiClient(api_key="key", base_url=self.server.base_url) as client:
+                await client.wait_for_task("task-123", poll_interval=0)
+
+        with self.assertRaises(TaskError):
+            self._run(scenario())
+
+    def test_as_completed(self):
+        """as_completed yields every task once it reports a terminal state"""
+        self.server.routes[("GET", "/task")] = ok({"completed": True, "exitCode": 0})
+
+        async def scenario():
+            async with AsyncDTCApiClient(api_key="key", base_url=self.server.base_url) as client:
+                return await client.wait_for_tasks(["a", "b", "c"], timeout=5, min_interval=0.01)
+
+        results = self._run(scenario())
+        self.assertEqual(sorted(results), ["a", "b", "c"])
+
+    def test_as_completed_bounds_status_requests(self):
+        """max_workers bounds the status requests in flight"""
+        lock = threading.Lock()
+        counts = {"in_flight": 0, "peak": 0}
+
+        def status(request):
+            with lock:
+                counts["in_flight"] += 1
+                counts["peak"] = max(counts["peak"], counts["in_flight"])
+            time.sleep(0.02)
+            with lock:
+                counts["in_flight"] -= 1
+            return ok({"completed": True, "exitCode": 0})
+
+        self.server.routes[("GET", "/task")] = status
+
+        async def scenario():
+            async with AsyncDTCApiClient(api_key="key", base_url=self.server.base_url) as client:
+                return await client.wait_for_tasks([str(n) for n in range(8)], timeout=5, max_workers=2)
+
+        self.assertEqual(len(self._run(scenario())), 8)
+        self.assertLessEqual(counts["peak"], 2)
+
+    def test_concurrent_requests_share_pool(self):
+        """Many concurrent calls complete over a bounded set of connections"""
+        async def scenario():
+            async with AsyncDTCApiClient(api_key="key", base_url=self.server.base_url,
+                                         max_connections=5) as client:
+                return await asyncio.gather(*(client.get_version() for _ in range(50)))
+
+        versions = self._run(scenario())
+        self.assertEqual(versions, ["1.2.3"] * 50)
+        self.assertLessEqual(self.server.connections, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Unit tests for batch processing
+
+Runs scan_files and BatchRunner against temporary directories and the
+local mock server:
+- Directory scans filter by extension and size
+- At most max_workers tasks are launched and each is reused, then cancelled
+- Results stream to the sink; failures and cache hits are reported
+"""
+
+import io
+import itertools
+import json
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+# Add the parent directory to Python path to import dtc_api_sdk
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dtc_api_sdk import DTCApiClient, BatchRunner, JsonLinesSink, ResultCache, TaskPool, scan_files
+from unit_tests.mock_server import MockDTCServer, ok
+
+READY = {"status": "Running", "serviceUp": 1, "currentObject": "webhook://WebHook", "exitCode": 0, "completed": False}
+
+
+class TempTreeCase(unittest.TestCase):
+    """Base case with a small directory tree"""
+
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.root)
+        (self.root / "sub" / "deeper").mkdir(parents=True)
+        self._file("a.pdf", b"a" * 10)
+        self._file("b.TXT", b"b" * 100)
+        self._file("sub/c.pdf", b"c" * 1000)
+        self._file("sub/deeper/d.docx", b"d" * 50)
+
+    def _file(self, name, data):
+        path = self.root / name
+        path.write_bytes(data)
+        return path
+
+    def _names(self, paths):
+        return sorted(path.name for path in paths)
+
+
+class TestScanFiles(TempTreeCase):
+    """Test cases for scan_files()"""
+
+    def test_recursive(self):
+        """All files in the tree are found"""
+        self.assertEqual(self._names(scan_files(self.root)), ["a.pdf", "b.TXT", "c.pdf", "d.docx"])
+
+    def test_filters(self):
+        """Extension and size filters apply; recursion can be disabled"""
+        self.assertEqual(self._names(scan_files(self.root, extensions=["pdf", ".txt"])), ["a.pdf", "b.TXT", "c.pdf"])
+        self.assertEqual(self._names(scan_files(self.root, min_size=50, max_size=100)), ["b.TXT", "d.docx"])
+        self.assertEqual(self._names(scan_files(self.root, recursive=False)), ["a.pdf", "b.TXT"])
+
+
+class TestBatchRunner(TempTreeCase):
+    """Test cases for BatchRunner"""
+
+    def setUp(self):
+        super().setUp()
+        for n in range(8):
+            self._file(f"sub/file{n}.txt", f"document {n}".encode())
+        self.server = MockDTCServer().start()
+        self.addCleanup(self.server.stop)
+        self.counter = itertools.count(1)
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.peak = 0
+        self.server.routes[("PUT", "/task")] = lambda request: ok({"token": f"task-{next(self.counter)}"})
+        self.server.routes[("GET", "/task")] = ok(READY)
+        self.server.routes[("DELETE", "/task")] = ok(None)
+        self.server.routes[("PUT", "/webhook")] = self._upload
+        self.client = DTCApiClient(api_key="key", base_url=self.server.base_url)
+        self.addCleanup(self.client.close)
+        self.config = {"pipeline": {"source": "webhook_1", "components": []}}
+
+    def _upload(self, request):
+        with self.lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(0.02)
+        with self.lock:
+            self.in_flight -= 1
+        return ok({"text": request.body.decode()})
+
+    def _requests(self, method, path):
+        return [r for r in self.server.requests if (r.method, r.path) == (method, path)]
+
+    def test_bounded_and_reused_tasks(self):
+        """Workers reuse their tasks, which are all cancelled at the end"""
+        results = []
+        stats = BatchRunner(self.client, self.config, max_workers=3).run(scan_files(self.root), sink=results.append)
+
+        self.assertEqual(stats.files, 12)
+        self.assertEqual(stats.succeeded, 12)
+        self.assertEqual(stats.bytes, sum(result.size for result in results))
+        self.assertGreater(stats.files_per_second, 0)
+        self.assertEqual(len(results), 12)
+        self.assertTrue(all(result.ok for result in results))
+
+        launched = self._requests("PUT", "/task")
+        self.assertLessEqual(len(launched), 3)
+        self.assertLessEqual(self.peak, 3)
+        cancelled = sorted(r.query["token"] for r in self._requests("DELETE", "/task"))
+        self.assertEqual(cancelled, sorted(f"task-{n}" for n in range(1, len(launched) + 1)))
+
+    def test_parse_and_jsonl_sink(self):
+        """parse transforms results; the JSONL sink writes one line per file"""
+        stream = io.StringIO()
+        runner = BatchRunner(self.client, self.config, max_workers=2, parse=lambda response: response["data"]["text"])
+        runner.run(scan_files(self.root, extensions=["pdf"]), sink=JsonLinesSink(stream))
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual(sorted(line["result"] for line in lines), ["a" * 10, "c" * 1000])
+        self.assertTrue(all(line["error"] is None for line in lines))
+
+    def test_failure_replaces_task(self):
+        """A failed upload is reported and its task replaced"""
+        self.server.routes[("PUT", "/webhook")] = (500, {"status": "Error"})
+        results = list(BatchRunner(self.client, self.config, max_workers=1).iter_results(
+            [self.root / "a.pdf", self.root / "b.TXT", self.root / "missing.pdf"]
+        ))
+        self.assertEqual([result.ok for result in results], [False, False, False])
+        self.assertIn("FileNotFoundError", results[2].error)
+        self.assertEqual(len(self._requests("PUT", "/task")), 2)
+        self.assertEqual(len(self._requests("DELETE", "/task")), 2)
+
+    def test_string_error_is_reported(self):
+        """A webhook error given as a plain string fails only that file"""
+        self.server.routes[("PUT", "/webhook")] = (200, {"status": "Error", "error": "Unsupported format"})
+        results = list(BatchRunner(self.client, self.config, max_workers=1).iter_results([self.root / "a.pdf"]))
+        self.assertEqual(results[0].error, "Unsupported format")
+
+    def test_local_error_keeps_task(self):
+        """A local failure during upload checks the task back in for the next file"""
+        runner = BatchRunner(self.client, self.config, max_workers=1)
+        upload = self.client.upload_file_to_webhook
+        calls = itertools.count()
+
+        def flaky(token, path, **kwargs):
+            if next(calls) == 0:
+                raise OSError("disk read failed")
+            return upload(token, path, **kwargs)
+
+        self.client.upload_file_to_webhook = flaky
+        results = list(runner.iter_results([self.root / "a.pdf", self.root / "b.TXT"]))
+        self.assertEqual([result.ok for result in results], [False, True])
+        self.assertIn("disk read failed", results[0].error)
+        self.assertEqual(len(self._requests("PUT", "/task")), 1)
+        self.assertEqual(len(self._requests("DELETE", "/task")), 1)
+
+    def test_unexpected_error_fails_file_only(self):
+        """An unexpected exception, e.g. from a closed pool, fails each file instead of the run"""
+        pool = TaskPool(self.client)
+        pool.close()
+        results = list(BatchRunner(self.client, self.config, max_workers=2, task_pool=pool).iter_results(
+            [self.root / "a.pdf", self.root / "b.TXT"]
+        ))
+        self.assertEqual(len(results), 2)
+        self.assertTrue(all("RuntimeError" in result.error for result in results))
+
+    def test_cache_hits(self):
+        """Identical files are uploaded once"""
+        self._file("copy.pdf", b"a" * 10)
+        with ResultCache(self.root / "cache.db") as cache:
+            runner = BatchRunner(self.client, self.config, max_workers=1, cache=cache)
+            stats = runner.run([self.root / "a.pdf", self.root / "copy.pdf"])
+        self.assertEqual(stats.cached, 1)
+        self.assertEqual(len(self._requests("PUT", "/webhook")), 1)
+
+    def test_process_directory(self):
+        """The client helper scans and processes a directory"""
+        stats = self.client.process_directory(self.config, self.root / "sub", extensions=[".txt"], max_workers=4)
+        self.assertEqual((stats.files, stats.succeeded), (8, 8))
+
+
+if __name__ == "__main__":
+    unittest.main()
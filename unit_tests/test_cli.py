@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the dtc-cli command-line interface
+
+Runs ``dtc_api_sdk.cli.main`` against the local mock server:
+- Inputs expand from files, directories and glob patterns, each file once
+- ``process`` writes JSONL results and resumes from a journal
+- Importing the CLI does not import the HTTP stack
+"""
+
+import io
+import json
+import itertools
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+
+# Add the parent directory to Python path to import dtc_api_sdk
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dtc_api_sdk.cli import main, expand_inputs
+from unit_tests.mock_server import MockDTCServer, ok
+
+READY = {"status": "Running", "serviceUp": 1, "currentObject": "webhook://WebHook", "exitCode": 0, "completed": False}
+PIPELINE = {"source": "webhook_1", "components": [{"id": "webhook_1", "provider": "webhook", "config": {}}]}
+
+
+class CliCase(unittest.TestCase):
+    """Base case with a small directory tree and a pipeline file"""
+
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.root)
+        (self.root / "docs" / "sub").mkdir(parents=True)
+        for name in ("docs/a.pdf", "docs/b.txt", "docs/sub/c.pdf", "d.pdf"):
+            (self.root / name).write_bytes(name.encode())
+        self.config = self.root / "pipeline.json"
+        self.config.write_text(json.dumps(PIPELINE))
+
+
+class TestExpandInputs(CliCase):
+    """Test cases for expand_inputs()"""
+
+    def _names(self, *inputs, **kwargs):
+        return sorted(path.name for path in expand_inputs([str(self.root / i) for i in inputs], **kwargs))
+
+    def test_directories_globs_and_files(self):
+        """Each kind of input expands, and overlapping inputs yield a file once"""
+        self.assertEqual(self._names("docs"), ["a.pdf", "b.txt", "c.pdf"])
+        self.assertEqual(self._names("docs", extensions=["pdf"], recursive=False), ["a.pdf"])
+        self.assertEqual(self._names("**/*.pdf"), ["a.pdf", "c.pdf", "d.pdf"])
+        self.assertEqual(self._names("d.pdf", "*.pdf", "docs/a.pdf", "docs"), ["a.pdf", "b.txt", "c.pdf", "d.pdf"])
+
+    def test_lazy_imports(self):
+        """Importing the CLI leaves requests and sqlite3 unloaded"""
+        code = "import sys, dtc_api_sdk.cli; print('requests' in sys.modules, 'sqlite3' in sys.modules)"
+        output = subprocess.run(
+            [sys.executable, "-c", code], cwd=str(Path(__file__).parent.parent),
+            capture_output=True, text=True, check=True
+        ).stdout
+        self.assertEqual(output.split(), ["False", "False"])
+
+
+class TestProcessCommand(CliCase):
+    """Test cases for ``dtc-cli process``"""
+
+    def setUp(self):
+        super().setUp()
+        self.server = MockDTCServer().start()
+        self.addCleanup(self.server.stop)
+        counter = itertools.count(1)
+        self.server.routes[("PUT", "/task")] = lambda request: ok({"token": f"task-{next(counter)}"})
+        self.server.routes[("GET", "/task")] = ok(READY)
+        self.server.routes[("DELETE", "/task")] = ok(None)
+        self.server.routes[("PUT", "/webhook")] = self._upload
+        self.fail_names = set()
+
+    def _upload(self, request):
+        text = request.body.decode()
+        if text in self.fail_names:
+            return 500, {"status": "Error", "error": {"message": "failed"}}
+        return ok({"text": text})
+
+    def _run(self, *args):
+        stdout, stderr = io.StringIO(), io.StringIO()
+        argv = ["--api-key", "key", "--base-url", self.server.base_url, "process", "-c", str(self.config), *args]
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            code = main(argv)
+        return code, stdout.getvalue(), stderr.getvalue()
+
+    def test_jsonl_to_stdout(self):
+        """Results go to stdout as JSONL and a summary to stderr"""
+        code, stdout, stderr = self._run("-j", "2", str(self.root / "docs"))
+        lines = [json.loads(line) for line in stdout.splitlines()]
+        self.assertEqual(code, 0)
+        self.assertEqual(sorted(line["result"]["data"]["text"] for line in lines),
+                         ["docs/a.pdf", "docs/b.txt", "docs/sub/c.pdf"])
+        self.assertIn("3 files, 0 failed", stderr)
+
+    def test_resume(self):
+        """A rerun with the same journal only processes what failed and appends"""
+        output = self.root / "results.jsonl"
+        journal = self.root / "job.journal"
+        self.fail_names = {"d.pdf"}
+        code, _, _ = self._run("-q", "-o", str(output), "--resume", str(journal), str(self.root / "docs"), str(self.root / "d.pdf"))
+        self.assertEqual(code, 1)
+
+        self.fail_names = set()
+        code, _, stderr = self._run("-o", str(output), "--resume", str(journal), str(self.root / "docs"), str(self.root / "d.pdf"))
+        self.assertEqual(code, 0)
+        self.assertIn("3 skipped", stderr)
+        lines = [json.loads(line) for line in output.read_text().splitlines()]
+        self.assertEqual(len(lines), 5)
+        self.assertEqual([line["error"] is None for line in lines if line["path"].endswith("d.pdf")], [False, True])
+
+    def test_usage_errors(self):
+        """Bad arguments exit with a usage error; API errors return 1"""
+        with redirect_stderr(io.StringIO()):
+            with self.assertRaises(SystemExit) as raised:
+                main(["process", "-c", str(self.config), "-j", "0", "x"])
+        self.assertEqual(raised.exception.code, 2)
+        self.server.routes[("PUT", "/task")] = (500, {"status": "Error", "error": {"message": "no engines"}})
+        code, stdout, _ = self._run("-q", str(self.root / "d.pdf"))
+        self.assertEqual(code, 1)
+        self.assertIn("no engines", stdout)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the adaptive concurrency limiter
+
+Drives ConcurrencyLimiter directly and through DTCApiClient:
+- The limit grows while latency is flat and the limit is in full use
+- Latency spikes, failures and throttling cut it once per congestion event
+- Uploads and task launches never exceed the limit in flight, for the
+  sync and async clients and BatchRunner
+"""
+
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+# Add the parent directory to Python path to import dtc_api_sdk
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dtc_api_sdk import DTCApiClient, AsyncDTCApiClient, BatchRunner, ConcurrencyLimiter, RetryPolicy
+from dtc_api_sdk.concurrency import body_units
+from dtc_api_sdk.exceptions import DTCApiError
+from unit_tests.mock_server import MockDTCServer, ok
+
+
+class TestConcurrencyLimiter(unittest.TestCase):
+    """Test cases for the AIMD limit"""
+
+    def _round(self, limiter, latency, dropped=False):
+        """Fill every slot, then complete them all"""
+        slots = [limiter.acquire() for _ in range(limiter.limit)]
+        for slot in slots:
+            limiter.release(slot, latency=latency, dropped=dropped)
+
+    def test_grows_while_latency_flat(self):
+        """Additive increase of about one slot per full round"""
+        limiter = ConcurrencyLimiter(initial_limit=2, max_limit=10)
+        for _ in range(5):
+            self._round(limiter, latency=0.1)
+        self.assertGreaterEqual(limiter.limit, 5)
+        for _ in range(50):
+            self._round(limiter, latency=0.1)
+        self.assertEqual(limiter.limit, 10)
+
+    def test_unsaturated_does_not_grow(self):
+        """A limit that is not in full use is not raised"""
+        limiter = ConcurrencyLimiter(initial_limit=4)
+        for _ in range(20):
+            limiter.release(limiter.acquire(), latency=0.1)
+        self.assertEqual(limiter.limit, 4)
+
+    def test_latency_rise_cuts_limit(self):
+        """Latency well above the baseline backs the limit off"""
+        limiter = ConcurrencyLimiter(initial_limit=10, backoff=0.5, smoothing=1.0)
+        self._round(limiter, latency=0.1)
+        before = limiter.limit
+        limiter.release(limiter.acquire(), latency=1.0)
+        self.assertLess(limiter.limit, before)
+
+    def test_failures_cut_once_per_event(self):
+        """Requests already in flight at a cut do not cut again"""
+        limiter = ConcurrencyLimiter(initial_limit=8, backoff=0.5)
+        slots = [limiter.acquire() for _ in range(8)]
+        for slot in slots:
+            limiter.release(slot, dropped=True)
+        self.assertEqual(limiter.limit, 4)
+        self.assertEqual(limiter.stats().decreases, 1)
+        self._round(limiter, latency=0.1, dropped=True)
+        self.assertEqual(limiter.limit, 2)
+
+    def test_latency_normalized_by_units(self):
+        """Large uploads taking longer are not mistaken for congestion"""
+        limiter = ConcurrencyLimiter(initial_limit=2, smoothing=1.0)
+        limiter.release(limiter.acquire(), latency=0.1, units=1)
+        limiter.release(limiter.acquire(), latency=10.0, units=100)
+        self.assertEqual(limiter.stats().decreases, 0)
+
+    def test_acquire_timeout(self):
+        """acquire() gives up when every slot stays busy"""
+        limiter = ConcurrencyLimiter(initial_limit=1)
+        limiter.acquire()
+        with self.assertRaises(TimeoutError):
+            limiter.acquire(timeout=0.05)
+
+    def test_async_acquire(self):
+        """Coroutines wait for a slot released by another thread, or time out"""
+        limiter = ConcurrencyLimiter(initial_limit=1)
+        held = limiter.acquire()
+
+        async def main():
+            with self.assertRaises(TimeoutError):
+                await limiter.acquire_async(timeout=0.05)
+            threading.Timer(0.05, limiter.release, args=(held,)).start()
+            slot = await limiter.acquire_async(timeout=5)
+            limiter.release(slot)
+
+        asyncio.run(main())
+        self.assertEqual(limiter.stats().in_flight, 0)
+
+    def test_body_units(self):
+        """Body sizes are measured in MiB, at least one unit"""
+        self.assertEqual(body_units(None), 1.0)
+        self.assertEqual(body_units({"a": 1}), 1.0)
+        self.assertEqual(body_units(b"x" * (3 * 1024 * 1024)), 3.0)
+        with tempfile.TemporaryFile() as handle:
+            handle.write(b"x" * (2 * 1024 * 1024))
+            handle.seek(0)
+            self.assertEqual(body_units(handle), 2.0)
+
+
+class TestClientConcurrency(unittest.TestCase):
+    """Test cases for concurrency limiting in DTCApiClient"""
+
+    def setUp(self):
+        self.server = MockDTCServer().start()
+        self.addCleanup(self.server.stop)
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.peak = 0
+        self.server.routes[("PUT", "/webhook")] = self._slow_upload
+        self.server.routes[("GET", "/version")] = ok("1.0")
+
+    def _slow_upload(self, request):
+        with self.lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(0.05)
+        with self.lock:
+            self.in_flight -= 1
+        return ok({"objectsCompleted": 1})
+
+    def test_uploads_bounded_by_limit(self):
+        """Concurrent uploads never exceed the limiter's limit"""
+        with tempfile.NamedTemporaryFile(suffix=".txt", delete=False) as handle:
+            handle.write(b"data")
+        self.addCleanup(os.unlink, handle.name)
+        limiter = ConcurrencyLimiter(initial_limit=2, max_limit=2)
+        client = DTCApiClient(api_key="key", base_url=self.server.base_url, concurrency_limiter=limiter)
+        self.addCleanup(client.close)
+
+        threads = [
+            threading.Thread(target=client.upload_file_to_webhook, args=("t", handle.name))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.peak, 2)
+        self.assertEqual(limiter.stats().completed, 8)
+
+    def test_async_uploads_bounded_by_limit(self):
+        """The async client holds a slot around each upload"""
+        with tempfile.NamedTemporaryFile(suffix=".txt", delete=False) as handle:
+            handle.write(b"data")
+        self.addCleanup(os.unlink, handle.name)
+        limiter = ConcurrencyLimiter(initial_limit=2, max_limit=2)
+
+        async def main():
+            async with AsyncDTCApiClient(api_key="key", base_url=self.server.base_url,
+                                         concurrency_limiter=limiter) as client:
+                await asyncio.gather(*(client.upload_file_to_webhook("t", handle.name) for _ in range(6)))
+
+        asyncio.run(main())
+        self.assertEqual(self.peak, 2)
+        self.assertEqual(limiter.stats().completed, 6)
+
+    def test_batch_runner_creates_limiter(self):
+        """Without a client limiter, BatchRunner bounds uploads with its own"""
+        self.server.routes[("PUT", "/task")] = ok({"token": "t"})
+        self.server.routes[("GET", "/task")] = ok({"status": "Running", "serviceUp": 1, "currentObject": "webhook://WebHook", "exitCode": 0})
+        self.server.routes[("DELETE", "/task")] = ok(None)
+        root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, root)
+        for n in range(6):
+            (root / f"{n}.txt").write_bytes(b"data")
+        client = DTCApiClient(api_key="key", base_url=self.server.base_url)
+        self.addCleanup(client.close)
+
+        runner = BatchRunner(client, {"pipeline": {}}, max_workers=4,
+                             concurrency_limiter=ConcurrencyLimiter(initial_limit=1, max_limit=1))
+        stats = runner.run(sorted(root.iterdir()))
+        self.assertEqual(stats.succeeded, 6)
+        self.assertEqual(self.peak, 1)
+        self.assertEqual(runner.concurrency_limiter.stats().completed, 6)
+        self.assertEqual(BatchRunner(client, {"pipeline": {}}, max_workers=3).concurrency_limiter.limit, 3)
+
+    def test_throttled_launch_cuts_limit(self):
+        """A 503 from PUT /task counts as congestion"""
+        self.server.routes[("PUT", "/task")] = (503, {"status": "Error", "error": {"message": "busy"}})
+        limiter = ConcurrencyLimiter(initial_limit=8, backoff=0.5)
+        client = DTCApiClient(api_key="key", base_url=self.server.base_url, concurrency_limiter=limiter,
+                              retry_policy=RetryPolicy(max_retries=0))
+        self.addCleanup(client.close)
+
+        with self.assertRaises(DTCApiError):
+            client.execute_task({"pipeline": {}})
+        client.get_version()
+        stats = limiter.stats()
+        self.assertEqual(stats.limit, 4)
+        self.assertEqual(stats.completed, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
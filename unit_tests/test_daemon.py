@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the processing daemon
+
+Runs DaemonServer, DaemonClient and the ``daemon``/``submit`` commands on a
+temporary Unix socket against the local mock server:
+- Requests on one connection reuse the daemon's warm tasks
+- Malformed and unknown requests get error responses
+- Stale socket files are replaced; live daemons are not
+"""
+
+import io
+import json
+import itertools
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from unittest import mock
+
+# Add the parent directory to Python path to import dtc_api_sdk
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dtc_api_sdk import DTCApiClient, BatchRunner
+from dtc_api_sdk.cli import main
+from dtc_api_sdk.daemon import DaemonClient, DaemonError, DaemonServer
+from unit_tests.mock_server import MockDTCServer, ok
+
+READY = {"status": "Running", "serviceUp": 1, "currentObject": "webhook://WebHook", "exitCode": 0, "completed": False}
+PIPELINE = {"source": "webhook_1", "components": [{"id": "webhook_1", "provider": "webhook", "config": {}}]}
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "Unix domain sockets are not available")
+class DaemonCase(unittest.TestCase):
+    """Base case with a mock server, files and a socket path"""
+
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.root)
+        self.socket_path = str(self.root / "dtc.sock")
+        self.files = []
+        for n in range(4):
+            path = self.root / f"file{n}.txt"
+            path.write_bytes(f"document {n}".encode())
+            self.files.append(path)
+        self.server = MockDTCServer().start()
+        self.addCleanup(self.server.stop)
+        counter = itertools.count(1)
+        self.server.routes[("PUT", "/task")] = lambda request: ok({"token": f"task-{next(counter)}"})
+        self.server.routes[("GET", "/task")] = ok(READY)
+        self.server.routes[("DELETE", "/task")] = ok(None)
+        self.server.routes[("PUT", "/webhook")] = lambda request: ok({"text": request.body.decode()})
+
+    def _requests(self, method, path):
+        return [r for r in self.server.requests if (r.method, r.path) == (method, path)]
+
+    def _serve(self, max_workers=2):
+        client = DTCApiClient(api_key="key", base_url=self.server.base_url)
+        self.addCleanup(client.close)
+        runner = BatchRunner(client, {"pipeline": PIPELINE}, max_workers=max_workers)
+        self.addCleanup(runner.close)
+        daemon = DaemonServer(runner, self.socket_path)
+        thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+        thread.start()
+
+        def stop():
+            daemon.shutdown()
+            thread.join()
+            daemon.close()
+
+        self.addCleanup(stop)
+        return runner
+
+
+class TestDaemonServer(DaemonCase):
+    """Test cases for DaemonServer and DaemonClient"""
+
+    def test_process_reuses_warm_tasks(self):
+        """Sequential requests share one warm task; warm() launches ahead of time"""
+        runner = self._serve()
+        self.assertEqual(runner.warm(1), 1)
+        with DaemonClient(self.socket_path) as daemon:
+            self.assertTrue(daemon.ping())
+            responses = [daemon.process(path) for path in self.files]
+            stats = daemon.stats()
+
+        self.assertTrue(all(response["ok"] for response in responses))
+        self.assertEqual(responses[2]["result"]["data"]["text"], "document 2")
+        self.assertEqual(responses[0]["id"], 2)
+        self.assertEqual(stats["files"], 4)
+        self.assertEqual(len(self._requests("PUT", "/task")), 1)
+        self.assertEqual(os.stat(self.socket_path).st_mode & 0o077, 0)
+
+    def test_socket_created_owner_only(self):
+        """The socket is never accessible to others, even under a permissive umask"""
+        modes = []
+        real_bind = socket.socket.bind
+
+        def bind(sock, address):
+            real_bind(sock, address)
+            if address == self.socket_path:
+                modes.append(os.stat(address).st_mode & 0o077)
+
+        previous = os.umask(0)
+        try:
+            with mock.patch("socket.socket.bind", bind):
+                self._serve()
+            self.assertEqual(os.umask(0), 0)
+        finally:
+            os.umask(previous)
+        self.assertEqual(modes, [0])
+
+    def test_bad_requests(self):
+        """Malformed, unknown and failing requests get error responses"""
+        self._serve()
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(self.socket_path)
+            sock.sendall(b'not json\n{"op": "nope"}\n{"op": "process"}\n')
+            reader = sock.makefile("rb")
+            errors = [json.loads(reader.readline())["error"] for _ in range(3)]
+        self.assertIn("Invalid request", errors[0])
+        self.assertIn("Unknown op", errors[1])
+        self.assertIn("path", errors[2])
+
+        with DaemonClient(self.socket_path) as daemon:
+            response = daemon.process(self.root / "missing.pdf")
+        self.assertFalse(response["ok"])
+        self.assertIn("FileNotFoundError", response["error"])
+
+    def test_socket_files(self):
+        """A stale socket file is replaced, a live daemon is refused"""
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(self.socket_path)
+        stale.close()
+        runner = self._serve()
+        with self.assertRaises(DaemonError):
+            DaemonServer(runner, self.socket_path)
+        with self.assertRaises(DaemonError):
+            DaemonClient(str(self.root / "none.sock")).ping()
+
+
+class TestDaemonCommands(DaemonCase):
+    """Test cases for ``dtc-cli daemon`` and ``dtc-cli submit``"""
+
+    def _cli(self, *argv):
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            code = main(list(argv))
+        return code, stdout.getvalue()
+
+    def test_daemon_and_submit(self):
+        """submit sends files in parallel; --shutdown stops the daemon and cancels its tasks"""
+        config = self.root / "pipeline.json"
+        config.write_text(json.dumps(PIPELINE))
+        argv = ["--api-key", "key", "--base-url", self.server.base_url, "daemon", "-c", str(config),
+                "--socket", self.socket_path, "-j", "2", "--warm", "2"]
+        codes = []
+        thread = threading.Thread(target=lambda: codes.append(main(argv)), daemon=True)
+        with redirect_stderr(io.StringIO()):
+            thread.start()
+            deadline = time.monotonic() + 10
+            while not os.path.exists(self.socket_path) and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            code, output = self._cli("submit", "--socket", self.socket_path, "-j", "2", str(self.root / "*.txt"))
+            lines = [json.loads(line) for line in output.splitlines()]
+            self.assertEqual(code, 0)
+            self.assertEqual(len(lines), 4)
+            self.assertEqual(sorted(line["result"]["data"]["text"] for line in lines),
+                             [f"document {n}" for n in range(4)])
+
+            code, output = self._cli("submit", "--socket", self.socket_path, "--stats")
+            self.assertEqual(json.loads(output)["files"], 4)
+            self.assertEqual(self._cli("submit", "--socket", self.socket_path, "--shutdown")[0], 0)
+            thread.join(10)
+
+        self.assertEqual(codes, [0])
+        self.assertFalse(os.path.exists(self.socket_path))
+        self.assertEqual(len(self._requests("PUT", "/task")), 2)
+        self.assertEqual(len(self._requests("DELETE", "/task")), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the job journal
+
+Runs JobJournal on its own and with BatchRunner against the local mock
+server:
+- File states and task records persist across reopening the journal
+- Files are keyed by absolute path, whatever the working directory
+- Files interrupted in flight are queued again on recovery
+- A resumed batch skips finished files, reclaims ready tasks and cancels
+  the rest
+"""
+
+import itertools
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add the parent directory to Python path to import dtc_api_sdk
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dtc_api_sdk import DTCApiClient, BatchRunner, JobJournal, FileState
+from unit_tests.mock_server import MockDTCServer, ok
+
+READY = {"status": "Running", "serviceUp": 1, "currentObject": "webhook://WebHook", "exitCode": 0, "completed": False}
+EXITED = {"status": "Completed", "serviceUp": 0, "currentObject": "", "exitCode": 0, "completed": True}
+
+
+class JournalCase(unittest.TestCase):
+    """Base case with a temporary directory"""
+
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.root)
+        self.path = self.root / "job.journal"
+
+    def _open(self):
+        journal = JobJournal(self.path)
+        self.addCleanup(journal.close)
+        return journal
+
+
+class TestJobJournal(JournalCase):
+    """Test cases for JobJournal"""
+
+    def test_states_persist(self):
+        """States, results and task records survive reopening"""
+        with JobJournal(self.path) as journal:
+            self.assertTrue(journal.enqueue("a.pdf"))
+            self.assertTrue(journal.enqueue("b.pdf"))
+            journal.mark("a.pdf", FileState.TASK_CREATED, token="task-1")
+            journal.mark("a.pdf", FileState.UPLOADED)
+            journal.mark("a.pdf", FileState.DONE, result={"text": "a"})
+            journal.mark("b.pdf", FileState.FAILED, error="boom")
+            journal.task_started("task-1")
+            journal.task_started("task-2")
+            journal.task_finished("task-2")
+
+        journal = self._open()
+        self.assertEqual(journal.state("a.pdf"), FileState.DONE)
+        self.assertEqual(journal.result("a.pdf"), {"text": "a"})
+        self.assertIsNone(journal.state("c.pdf"))
+        self.assertEqual(list(journal.results()), [(os.path.abspath("a.pdf"), {"text": "a"})])
+        self.assertEqual(journal.open_tasks(), ["task-1"])
+        self.assertEqual(journal.summary()["failed"], 1)
+
+        self.assertFalse(journal.enqueue("a.pdf"))
+        self.assertFalse(journal.enqueue("b.pdf", retry_failed=False))
+        self.assertTrue(journal.enqueue("b.pdf"))
+        self.assertEqual(journal.state("b.pdf"), FileState.QUEUED)
+
+    def test_paths_are_absolute(self):
+        """x, ./x and the absolute path from another directory are one file"""
+        journal = self._open()
+        data = self.root.resolve() / "data"
+        data.mkdir()
+        cwd = os.getcwd()
+        self.addCleanup(os.chdir, cwd)
+        os.chdir(data)
+        self.assertTrue(journal.enqueue("x.pdf"))
+        journal.mark("./x.pdf", FileState.DONE, result={"text": "x"})
+        os.chdir(self.root)
+        self.assertFalse(journal.enqueue(data / "x.pdf"))
+        self.assertEqual(journal.result("data/x.pdf"), {"text": "x"})
+        self.assertEqual(journal.summary()["done"], 1)
+
+    def test_recover(self):
+        """Files in flight are queued again and open tasks are returned"""
+        journal = self._open()
+        for name in ("queued", "created", "uploaded", "done"):
+            journal.enqueue(name)
+        journal.mark("created", FileState.TASK_CREATED, token="task-1")
+        journal.mark("uploaded", FileState.TASK_CREATED, token="task-1")
+        journal.mark("uploaded", FileState.UPLOADED)
+        journal.mark("done", FileState.DONE, result=None)
+        journal.task_started("task-1")
+
+        self.assertEqual(journal.recover(), ["task-1"])
+        self.assertEqual(journal.summary(), {"queued": 3, "task_created": 0, "uploaded": 0, "done": 1, "failed": 0})
+
+
+class TestResume(JournalCase):
+    """Test cases for resuming a BatchRunner with a journal"""
+
+    def setUp(self):
+        super().setUp()
+        self.files = []
+        for n in range(4):
+            path = self.root / f"file{n}.txt"
+            path.write_bytes(f"document {n}".encode())
+            self.files.append(path)
+        self.server = MockDTCServer().start()
+        self.addCleanup(self.server.stop)
+        self.counter = itertools.count(1)
+        self.server.routes[("PUT", "/task")] = lambda request: ok({"token": f"task-{next(self.counter)}"})
+        self.server.routes[("GET", "/task")] = ok(READY)
+        self.server.routes[("DELETE", "/task")] = ok(None)
+        self.server.routes[("PUT", "/webhook")] = lambda request: ok({"text": request.body.decode()})
+        self.client = DTCApiClient(api_key="key", base_url=self.server.base_url)
+        self.addCleanup(self.client.close)
+        self.config = {"pipeline": {"source": "webhook_1", "components": []}}
+
+    def _requests(self, method, path):
+        return [r for r in self.server.requests if (r.method, r.path) == (method, path)]
+
+    def _crashed_run(self, journal):
+        """Journal state left by a run that died while uploading file1"""
+        for path in self.files[:2]:
+            journal.enqueue(path)
+        journal.task_started("orphan-1")
+        journal.task_started("orphan-2")
+        journal.mark(self.files[0], FileState.TASK_CREATED, token="orphan-1")
+        journal.mark(self.files[0], FileState.UPLOADED)
+        journal.mark(self.files[0], FileState.DONE, result={"text": "document 0"})
+        journal.mark(self.files[1], FileState.TASK_CREATED, token="orphan-1")
+
+    def test_resume_skips_done_and_reclaims_task(self):
+        """Finished files are skipped and a ready orphaned task is reused"""
+        journal = self._open()
+        self._crashed_run(journal)
+
+        uploaded = []
+        runner = BatchRunner(self.client, self.config, max_workers=1, journal=journal)
+        for result in runner.iter_results(self.files):
+            uploaded.append(result.path.name)
+        stats = runner.stats()
+
+        self.assertEqual(uploaded, ["file1.txt", "file2.txt", "file3.txt"])
+        self.assertEqual((stats.files, stats.skipped), (3, 1))
+        # One orphan is reclaimed for the single worker; the other is cancelled
+        self.assertEqual(self._requests("PUT", "/task"), [])
+        self.assertEqual({r.query["token"] for r in self._requests("PUT", "/webhook")}, {"orphan-1"})
+        cancelled = sorted(r.query["token"] for r in self._requests("DELETE", "/task"))
+        self.assertEqual(cancelled, ["orphan-1", "orphan-2"])
+        self.assertEqual(journal.open_tasks(), [])
+        self.assertEqual(journal.summary()["done"], 4)
+        self.assertEqual(journal.result(self.files[3]), {"status": "OK", "data": {"text": "document 3"}})
+
+    def test_exited_orphans_are_cancelled(self):
+        """Orphaned tasks that are no longer ready are cancelled, not reused"""
+        self.server.routes[("GET", "/task")] = lambda request: ok(
+            EXITED if request.query["token"].startswith("orphan") else READY
+        )
+        journal = self._open()
+        self._crashed_run(journal)
+
+        stats = BatchRunner(self.client, self.config, max_workers=2, journal=journal).run(self.files)
+
+        self.assertEqual(stats.succeeded, 3)
+        self.assertNotIn("orphan-1", {r.query["token"] for r in self._requests("PUT", "/webhook")})
+        cancelled = {r.query["token"] for r in self._requests("DELETE", "/task")}
+        self.assertTrue({"orphan-1", "orphan-2"} <= cancelled)
+
+    def test_failed_files_are_journaled(self):
+        """Failures are recorded and retried on the next run"""
+        self.server.routes[("PUT", "/webhook")] = (500, {"status": "Error"})
+        journal = self._open()
+        BatchRunner(self.client, self.config, max_workers=1, journal=journal).run(self.files[:1])
+        self.assertEqual(journal.state(self.files[0]), FileState.FAILED)
+
+        self.server.routes[("PUT", "/webhook")] = lambda request: ok({"text": "ok"})
+        stats = BatchRunner(self.client, self.config, max_workers=1, journal=journal).run(self.files[:1])
+        self.assertEqual((stats.succeeded, stats.skipped), (1, 0))
+        self.assertEqual(journal.state(self.files[0]), FileState.DONE)
+
+
+if __name__ == "__main__":
+    unittest.main()
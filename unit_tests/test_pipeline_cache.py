@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the pipeline token cache
+
+Runs PipelineCache against the local mock server:
+- Configs differing only in key order or ui blocks share a pipeline
+- Expired, dead, gone and least recently used pipelines are replaced
+- Evicted pipelines are deleted on the server; transient check failures keep them
+"""
+
+import copy
+import itertools
+import json
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+# Add the parent directory to Python path to import dtc_api_sdk
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dtc_api_sdk import DTCApiClient, PipelineCache
+from dtc_api_sdk.exceptions import DTCApiError, NetworkError
+from dtc_api_sdk.pipeline import canonicalize, config_hash
+from unit_tests.mock_server import MockDTCServer, ok
+
+SIMPLE_PARSER = Path(__file__).parent.parent / "example_pipelines" / "simpleparser.json"
+
+
+class TestConfigHash(unittest.TestCase):
+    """Test cases for canonicalization"""
+
+    def setUp(self):
+        self.config = json.loads(SIMPLE_PARSER.read_text())
+
+    def test_ui_blocks_removed(self):
+        """ui blocks are dropped without modifying the input"""
+        canonical = canonicalize(self.config)
+        self.assertTrue(all("ui" not in component for component in canonical["components"]))
+        self.assertIn("ui", self.config["components"][0])
+
+    def test_hash_ignores_key_order_and_ui(self):
+        """Equivalent configs hash the same; processing changes do not"""
+        moved = copy.deepcopy(self.config)
+        moved["components"][0]["ui"]["position"] = {"x": 0, "y": 0}
+        reordered = dict(reversed(list(moved.items())))
+        self.assertEqual(config_hash(self.config), config_hash(reordered))
+        self.assertEqual(config_hash({"pipeline": self.config}), config_hash({"pipeline": moved}))
+
+        changed = copy.deepcopy(self.config)
+        changed["components"][1]["config"] = {"mode": "fast"}
+        self.assertNotEqual(config_hash(self.config), config_hash(changed))
+
+
+class TestPipelineCache(unittest.TestCase):
+    """Test cases for PipelineCache"""
+
+    def setUp(self):
+        self.server = MockDTCServer().start()
+        self.addCleanup(self.server.stop)
+        self.counter = itertools.count(1)
+        self.server.routes[("POST", "/pipe")] = self._create
+        self.server.routes[("DELETE", "/pipe")] = ok(None)
+        self.client = DTCApiClient(api_key="key", base_url=self.server.base_url)
+        self.addCleanup(self.client.close)
+        self.config = json.loads(SIMPLE_PARSER.read_text())
+
+    def _create(self, request):
+        time.sleep(0.02)
+        return ok({"token": f"pipe-{next(self.counter)}"})
+
+    def _created(self):
+        return sum(1 for r in self.server.requests if r.method == "POST")
+
+    def _deleted(self):
+        return [r.query["token"] for r in self.server.requests if r.method == "DELETE"]
+
+    def _other_config(self, n):
+        config = copy.deepcopy(self.config)
+        config["components"][1]["config"] = {"n": n}
+        return config
+
+    def test_reuses_token(self):
+        """Equivalent configs get the same pipeline"""
+        cache = PipelineCache(self.client)
+        moved = copy.deepcopy(self.config)
+        moved["components"][0]["ui"] = {}
+        self.assertEqual(cache.get(self.config), cache.get(moved))
+        self.assertEqual(self._created(), 1)
+        self.assertEqual(cache.stats().hits, 1)
+
+    def test_concurrent_gets_create_once(self):
+        """Threads asking for the same config share one creation"""
+        cache = PipelineCache(self.client)
+        tokens = []
+        threads = [threading.Thread(target=lambda: tokens.append(cache.get(self.config))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(set(tokens)), 1)
+        self.assertEqual(self._created(), 1)
+
+    def test_ttl_replaces_pipeline(self):
+        """Expired pipelines are deleted and recreated"""
+        cache = PipelineCache(self.client, ttl=0.05)
+        first = cache.get(self.config)
+        time.sleep(0.1)
+        second = cache.get(self.config)
+        self.assertNotEqual(first, second)
+        self.assertEqual(self._deleted(), [first])
+        self.assertEqual(cache.stats().expired, 1)
+
+    def test_liveness_check(self):
+        """Tokens failing the liveness check are replaced"""
+        dead = set()
+        cache = PipelineCache(self.client, is_alive=lambda token: token not in dead, check_interval=0)
+        first = cache.get(self.config)
+        self.assertEqual(cache.get(self.config), first)
+        dead.add(first)
+        self.assertNotEqual(cache.get(self.config), first)
+        self.assertEqual(self._deleted(), [first])
+
+    def test_liveness_errors(self):
+        """Transient check failures keep the pipeline; 404 drops it without a delete"""
+        errors = []
+
+        def is_alive(token):
+            if errors:
+                raise errors.pop()
+            return True
+
+        cache = PipelineCache(self.client, is_alive=is_alive, check_interval=0)
+        first = cache.get(self.config)
+        errors.append(NetworkError("Connection error"))
+        self.assertEqual(cache.get(self.config), first)
+        errors.append(DTCApiError("Pipeline not found", status_code=404))
+        self.assertNotEqual(cache.get(self.config), first)
+        self.assertEqual(self._deleted(), [])
+        self.assertEqual(self._created(), 2)
+
+    def test_lru_eviction_deletes_pipeline(self):
+        """The least recently used pipeline is evicted and deleted"""
+        cache = PipelineCache(self.client, max_size=2)
+        first = cache.get(self._other_config(1))
+        cache.get(self._other_config(2))
+        cache.get(self._other_config(1))
+        cache.get(self._other_config(3))
+        self.assertEqual(len(self._deleted()), 1)
+        self.assertNotIn(first, self._deleted())
+        self.assertEqual(cache.get(self._other_config(1)), first)
+        self.assertEqual(cache.stats().evictions, 1)
+
+    def test_close_deletes_pipelines(self):
+        """Closing the cache deletes every cached pipeline"""
+        with PipelineCache(self.client) as cache:
+            token = cache.get(self.config)
+        self.assertEqual(self._deleted(), [token])
+        self.assertEqual(cache.stats().size, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Unit tests for PipelineGraph
+
+Checks pipeline compilation and validation offline and against the local
+mock server:
+- Compiled bodies drop designer ui blocks and are serialized once
+- Clients send compiled bodies as-is
+- The offline validator catches graph errors and skips /pipe/validate
+- optimize() prunes dead components and redundant edges
+"""
+
+import asyncio
+import copy
+import json
+import sys
+import unittest
+from pathlib import Path
+
+# Add the parent directory to Python path to import dtc_api_sdk
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dtc_api_sdk import DTCApiClient, AsyncDTCApiClient, PipelineGraph
+from dtc_api_sdk.pipeline import config_hash, validate_config
+from dtc_api_sdk.async_client import httpx
+from dtc_api_sdk.exceptions import ValidationError
+from unit_tests.mock_server import MockDTCServer, ok
+
+SIMPLE_PARSER = Path(__file__).parent.parent / "example_pipelines" / "simpleparser.json"
+
+
+class TestPipelineCompile(unittest.TestCase):
+    """Test cases for PipelineGraph.compile()"""
+
+    def setUp(self):
+        self.raw = json.loads(SIMPLE_PARSER.read_text())
+        self.graph = PipelineGraph.load(SIMPLE_PARSER)
+
+    def test_compile_strips_ui(self):
+        """The compiled body keeps every component but no ui block"""
+        compiled = self.graph.compile()
+        body = json.loads(compiled.body)
+        self.assertEqual([c["id"] for c in body["components"]], list(self.graph.components))
+        self.assertNotIn(b'"ui"', compiled.body)
+        self.assertLess(compiled.size, len(SIMPLE_PARSER.read_bytes()) / 2)
+        self.assertEqual(body["components"][1]["input"], self.raw["components"][1]["input"])
+
+    def test_compile_is_cached(self):
+        """A graph serializes once"""
+        self.assertIs(self.graph.compile(), self.graph.compile())
+
+    def test_as_task_hash(self):
+        """A compiled task hashes like the equivalent task config"""
+        task = self.graph.as_task().compile()
+        self.assertIn("pipeline", json.loads(task.body))
+        self.assertEqual(task.digest, config_hash({"pipeline": self.raw}))
+        task_graph = self.graph.as_task()
+        self.assertIs(task_graph.as_task(), task_graph)
+
+
+def _pipeline(*components, **extra):
+    """Build a bare pipeline from (id, provider, [(lane, from), ...]) tuples"""
+    pipeline = {"components": [
+        {"id": cid, "provider": provider, "config": {},
+         **({"input": [{"lane": lane, "from": origin} for lane, origin in inputs]} if inputs else {})}
+        for cid, provider, inputs in components
+    ]}
+    pipeline.update(extra)
+    return pipeline
+
+
+class TestOfflineValidation(unittest.TestCase):
+    """Test cases for validate_config()"""
+
+    def assertError(self, pipeline, fragment):
+        result = validate_config(pipeline)
+        self.assertFalse(result.valid)
+        self.assertTrue(any(fragment in error for error in result.errors), result.errors)
+
+    def test_example_pipeline_valid(self):
+        """The designer export validates, with or without a task wrapper"""
+        raw = json.loads(SIMPLE_PARSER.read_text())
+        self.assertEqual(validate_config(raw).errors, ())
+        self.assertTrue(validate_config({"pipeline": raw}).valid)
+
+    def test_source(self):
+        """An explicit source must exist; otherwise one must be inferable"""
+        self.assertError(_pipeline(("response_1", "response", []), source="webhook_1"), "Source 'webhook_1'")
+        self.assertError(_pipeline(("response_1", "response", [])), "no source")
+        self.assertError({"components": []}, "no components")
+        self.assertError({"components": "not a list"}, "no components")
+
+    def test_unknown_input(self):
+        """Inputs must come from existing components"""
+        pipeline = _pipeline(("webhook_1", "webhook", []), ("response_1", "response", [("text", "parse_1")]))
+        self.assertError(pipeline, "unknown component 'parse_1'")
+
+    def test_cycle(self):
+        """Cycles are reported"""
+        pipeline = _pipeline(
+            ("webhook_1", "webhook", []),
+            ("a", "custom", [("text", "webhook_1"), ("text", "b")]),
+            ("b", "custom", [("text", "a")]),
+            ("response_1", "response", [("text", "b")]),
+        )
+        self.assertError(pipeline, "Cycle between components: a, b")
+
+    def test_lane_compatibility(self):
+        """Known providers only emit and accept their own lanes"""
+        self.assertError(_pipeline(
+            ("webhook_1", "webhook", []),
+            ("parse_1", "parse", [("audio", "webhook_1")]),
+        ), "does not emit lane 'audio'")
+        self.assertError(_pipeline(
+            ("webhook_1", "webhook", []),
+            ("audio_1", "audio_transcribe", [("text", "webhook_1")]),
+        ), "does not accept lane 'text'")
+        self.assertTrue(validate_config(_pipeline(
+            ("webhook_1", "webhook", []),
+            ("parse_1", "parse", [("tags", "webhook_1")]),
+            ("audio_1", "audio_transcribe", [("audio", "parse_1")]),
+            ("llm_1", "llm_custom", [("text", "audio_1")]),
+            ("response_1", "response", [("answers", "llm_1")]),
+        )).valid)
+
+    def test_orphans(self):
+        """Components the source never reaches are errors; unused outputs are warnings"""
+        pipeline = _pipeline(
+            ("webhook_1", "webhook", []),
+            ("parse_1", "parse", [("tags", "webhook_1")]),
+            ("response_1", "response", [("text", "webhook_1")]),
+            ("stray", "custom", []),
+        )
+        result = validate_config(pipeline)
+        self.assertIn("Component 'stray' is not connected to the source", result.errors)
+        self.assertIn("Output of 'parse_1' (parse) is not used", result.warnings)
+
+    def test_memoized(self):
+        """Equivalent configs share one cached result"""
+        raw = json.loads(SIMPLE_PARSER.read_text())
+        moved = copy.deepcopy(raw)
+        moved["components"][0]["ui"] = {}
+        self.assertIs(validate_config(raw), validate_config(moved))
+        self.assertIs(PipelineGraph(raw).validate(), validate_config(raw))
+
+    def test_raise_for_errors(self):
+        """raise_for_errors lists the errors"""
+        with self.assertRaises(ValidationError) as context:
+            validate_config({"components": []}).raise_for_errors()
+        self.assertEqual(context.exception.response_data["errors"], ["Pipeline has no components"])
+
+
+class TestOptimize(unittest.TestCase):
+    """Test cases for PipelineGraph.optimize()"""
+
+    def test_prunes_dead_components(self):
+        """Components that never reach the sink are removed with their edges"""
+        graph = PipelineGraph(_pipeline(
+            ("webhook_1", "webhook", []),
+            ("parse_1", "parse", [("tags", "webhook_1")]),
+            ("audio_1", "audio_transcribe", [("audio", "parse_1")]),
+            ("response_1", "response", [("text", "parse_1"), ("text", "parse_1")]),
+        ))
+        report = graph.optimize()
+        self.assertEqual(report.removed_components, ["audio_1"])
+        self.assertEqual(report.removed_edges, 1)
+        self.assertEqual(list(report.graph.components), ["webhook_1", "parse_1", "response_1"])
+        self.assertEqual(report.graph.components["response_1"]["input"], [{"lane": "text", "from": "parse_1"}])
+        self.assertAlmostEqual(report.estimated_savings, 1 - 5 / 8)
+        self.assertLess(report.body_bytes_after, report.body_bytes_before)
+        self.assertTrue(report.graph.validate().valid)
+
+    def test_without_sink_keeps_components(self):
+        """Graphs without a known sink are not pruned"""
+        graph = PipelineGraph(_pipeline(("webhook_1", "webhook", []), ("store_1", "custom_store", [("text", "webhook_1")])))
+        self.assertEqual(graph.optimize().removed_components, [])
+
+    def test_shadowed_lanes_opt_in(self):
+        """simpleparser.json's raw text lane is only dropped on request"""
+        graph = PipelineGraph.load(SIMPLE_PARSER).as_task()
+        self.assertEqual(graph.optimize().estimated_savings, 0)
+
+        report = graph.optimize(collapse_shadowed_lanes=True)
+        self.assertEqual(report.removed_edges, 1)
+        self.assertEqual(report.removed_components, [])
+        self.assertEqual(report.graph.components["response_1"]["input"], [{"lane": "text", "from": "parse_1"}])
+        self.assertIn("pipeline", report.graph.config)
+        # The original graph is untouched
+        self.assertEqual(len(graph.components["response_1"]["input"]), 2)
+
+    def test_invalid_graph_rejected(self):
+        """Invalid graphs are not optimized"""
+        with self.assertRaises(ValidationError):
+            PipelineGraph({"components": []}).optimize()
+
+
+class TestCompiledSubmission(unittest.TestCase):
+    """Test cases for submitting compiled pipelines"""
+
+    def setUp(self):
+        self.server = MockDTCServer().start()
+        self.addCleanup(self.server.stop)
+        self.server.routes[("PUT", "/task")] = ok({"token": "task-1"})
+        self.server.routes[("POST", "/pipe")] = ok({"token": "pipe-1"})
+        self.server.routes[("POST", "/pipe/validate")] = ok(None)
+        self.graph = PipelineGraph.load(SIMPLE_PARSER)
+
+    def test_sync_client_sends_body(self):
+        """create_pipeline, validate_pipeline and execute_task send the compiled bytes"""
+        task = self.graph.as_task().compile()
+        with DTCApiClient(api_key="key", base_url=self.server.base_url) as client:
+            self.assertEqual(client.execute_task(task), "task-1")
+            self.assertEqual(client.create_pipeline(self.graph.compile()), "pipe-1")
+            self.assertTrue(client.validate_pipeline(self.graph.compile()))
+
+        bodies = [r.body for r in self.server.requests]
+        self.assertEqual(bodies, [task.body, self.graph.compile().body, self.graph.compile().body])
+        self.assertEqual(self.server.requests[0].headers["Content-Type"], "application/json")
+
+    def test_validate_pipeline_checks_locally(self):
+        """Invalid configs and offline checks never reach /pipe/validate"""
+        with DTCApiClient(api_key="key", base_url=self.server.base_url) as client:
+            self.assertFalse(client.validate_pipeline({"components": []}))
+            self.assertTrue(client.validate_pipeline(self.graph.compile(), offline=True))
+            self.assertEqual(self.server.requests, [])
+            self.assertTrue(client.validate_pipeline(self.graph.compile()))
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_validate_pipeline_logs_local_errors(self):
+        """The local check's errors are logged when validation fails"""
+        errors = validate_config({"components": []}).errors
+        with DTCApiClient(api_key="key", base_url=self.server.base_url) as client:
+            with self.assertLogs("dtc_api_sdk.client", level="WARNING") as logs:
+                self.assertFalse(client.validate_pipeline({"components": []}))
+        self.assertTrue(errors)
+        self.assertIn(errors[0], logs.output[0])
+
+    @unittest.skipIf(httpx is None, "httpx is not installed")
+    def test_async_validate_pipeline_logs_local_errors(self):
+        """The async client logs the local check's errors too"""
+        errors = validate_config({"components": []}).errors
+
+        async def run():
+            async with AsyncDTCApiClient(api_key="key", base_url=self.server.base_url) as client:
+                return await client.validate_pipeline({"components": []})
+
+        with self.assertLogs("dtc_api_sdk.async_client", level="WARNING") as logs:
+            self.assertFalse(asyncio.run(run()))
+        self.assertIn(errors[0], logs.output[0])
+
+    @unittest.skipIf(httpx is None, "httpx is not installed")
+    def test_async_client_sends_body(self):
+        """The async client sends the compiled bytes"""
+        task = self.graph.as_task().compile()
+
+        async def run():
+            async with AsyncDTCApiClient(api_key="key", base_url=self.server.base_url) as client:
+                return await client.execute_task(task)
+
+        self.assertEqual(asyncio.run(run()), "task-1")
+        self.assertEqual(self.server.requests[0].body, task.body)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Unit tests for client-side rate limiting
+
+Exercises the token buckets directly and through DTCApiClient:
+- Requests are paced per endpoint group, across threads
+- 429s and slow 5xx cut the rate; successes restore it
+- Retry-After pauses the bucket
+"""
+
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+# Add the parent directory to Python path to import dtc_api_sdk
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dtc_api_sdk import DTCApiClient, RateLimiter, RateLimit, RetryPolicy
+from dtc_api_sdk.exceptions import DTCApiError
+from dtc_api_sdk.ratelimit import TokenBucket, endpoint_group
+from unit_tests.mock_server import MockDTCServer, ok
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Test cases for the adaptive token bucket"""
+
+    def test_paces_after_burst(self):
+        """Reservations beyond the burst are spaced 1/rate apart"""
+        bucket = TokenBucket(RateLimit(rate=10, burst=2))
+        delays = [bucket.reserve(now=bucket._updated) for _ in range(5)]
+        self.assertEqual(delays[:2], [0.0, 0.0])
+        for actual, expected in zip(delays[2:], [0.1, 0.2, 0.3]):
+            self.assertAlmostEqual(actual, expected)
+
+    def test_refills_over_time(self):
+        """Idle time refills tokens up to the burst"""
+        bucket = TokenBucket(RateLimit(rate=10, burst=1))
+        start = bucket._updated
+        bucket.reserve(now=start)
+        self.assertAlmostEqual(bucket.reserve(now=start + 0.05), 0.05)
+        self.assertEqual(bucket.reserve(now=start + 10), 0.0)
+
+    def test_aimd(self):
+        """Throttling halves the rate once per cooldown; successes add it back"""
+        bucket = TokenBucket(RateLimit(rate=10, increase=1, cooldown=1.0))
+        now = time.monotonic()
+        bucket.throttle(now=now)
+        bucket.throttle(now=now + 0.5)
+        self.assertEqual(bucket.rate, 5.0)
+        bucket.throttle(now=now + 1.5)
+        self.assertEqual(bucket.rate, 2.5)
+        for _ in range(20):
+            bucket.recover()
+        self.assertEqual(bucket.rate, 10.0)
+        self.assertEqual(bucket.stats().throttles, 2)
+
+    def test_min_rate(self):
+        """The rate never drops below min_rate"""
+        bucket = TokenBucket(RateLimit(rate=10, min_rate=4, cooldown=0))
+        for _ in range(5):
+            bucket.throttle()
+        self.assertEqual(bucket.rate, 4)
+
+    def test_retry_after_pauses(self):
+        """Retry-After holds every reservation until it has passed"""
+        bucket = TokenBucket(RateLimit(rate=100))
+        now = time.monotonic()
+        bucket.throttle(retry_after=3, now=now)
+        self.assertAlmostEqual(bucket.reserve(now=now + 1), 2.0)
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Test cases for per-group limiting and client integration"""
+
+    def setUp(self):
+        self.server = MockDTCServer().start()
+        self.addCleanup(self.server.stop)
+        self.server.routes[("GET", "/task")] = ok({"completed": False, "exitCode": 0})
+        self.server.routes[("GET", "/version")] = ok("1.0")
+
+    def test_endpoint_groups(self):
+        """Requests map to task_create, upload, status or default"""
+        self.assertEqual(endpoint_group("PUT", "/task"), "task_create")
+        self.assertEqual(endpoint_group("put", "/webhook"), "upload")
+        self.assertEqual(endpoint_group("PUT", "/pipe/process"), "upload")
+        self.assertEqual(endpoint_group("GET", "/task"), "status")
+        self.assertEqual(endpoint_group("GET", "/version"), "default")
+
+    def test_feedback(self):
+        """429 and slow 5xx tighten; fast 5xx leaves the rate alone"""
+        limiter = RateLimiter({"status": RateLimit(rate=10, cooldown=0, slow_error_seconds=1.0)})
+        limiter.feedback("GET", "/task", 500, elapsed=0.1)
+        self.assertEqual(limiter.stats()["status"].rate, 10)
+        limiter.feedback("GET", "/task", 500, elapsed=1.5)
+        self.assertEqual(limiter.stats()["status"].rate, 5)
+        limiter.feedback("GET", "/task", 429, elapsed=0.1)
+        self.assertEqual(limiter.stats()["status"].rate, 2.5)
+        limiter.feedback("GET", "/version", 429, elapsed=0.1)
+        self.assertEqual(set(limiter.stats()), {"status"})
+
+    def test_client_paces_across_threads(self):
+        """Threads sharing a client share the group's bucket"""
+        limiter = RateLimiter({"status": RateLimit(rate=50, burst=1)})
+        client = DTCApiClient(api_key="key", base_url=self.server.base_url, rate_limiter=limiter)
+        self.addCleanup(client.close)
+
+        def worker():
+            for _ in range(5):
+                client.get_task_status("t")
+
+        start = time.monotonic()
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - start
+
+        # 20 requests at 50/s with no burst take at least 19 intervals
+        self.assertGreaterEqual(elapsed, 19 / 50 - 0.02)
+        self.assertEqual(limiter.stats()["status"].requests, 20)
+        # Other groups are not paced
+        start = time.monotonic()
+        for _ in range(20):
+            client.get_version()
+        self.assertLess(time.monotonic() - start, 19 / 50)
+
+    def test_client_tightens_on_429(self):
+        """Server throttling lowers the group's rate"""
+        self.server.routes[("PUT", "/task")] = (429, {"status": "Error", "error": {"message": "slow down"}})
+        limiter = RateLimiter({"task_create": RateLimit(rate=100)})
+        client = DTCApiClient(api_key="key", base_url=self.server.base_url, rate_limiter=limiter,
+                              retry_policy=RetryPolicy(max_retries=0))
+        self.addCleanup(client.close)
+
+        with self.assertRaises(DTCApiError):
+            client.execute_task({"pipeline": {}})
+        stats = limiter.stats()["task_create"]
+        self.assertEqual(stats.throttles, 1)
+        self.assertEqual(stats.rate, 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
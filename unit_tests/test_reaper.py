@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Unit tests for leaked-resource tracking
+
+Runs the token registry, the scoped context managers and the reaper against
+the local mock server:
+- Created tasks and pipelines are tracked until cancelled or deleted
+- client.task() and client.pipeline() clean up when the block exits
+- The reaper cleans up idle or orphaned resources concurrently
+"""
+
+import itertools
+import subprocess
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+# Add the parent directory to Python path to import dtc_api_sdk
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dtc_api_sdk import DTCApiClient, Reaper, TokenRegistry
+from dtc_api_sdk.reaper import TASK, PIPELINE, pid_alive
+from unit_tests.mock_server import MockDTCServer, ok
+
+READY = {"status": "Running", "serviceUp": 1, "currentObject": "webhook://WebHook", "exitCode": 0, "completed": False}
+
+
+def dead_pid():
+    """PID of a process that has exited"""
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+class ReaperCase(unittest.TestCase):
+    """Base case with a mock server handing out tokens"""
+
+    def setUp(self):
+        self.server = MockDTCServer().start()
+        self.addCleanup(self.server.stop)
+        self.counter = itertools.count(1)
+        self.server.routes[("PUT", "/task")] = lambda request: ok({"token": f"task-{next(self.counter)}"})
+        self.server.routes[("POST", "/pipe")] = lambda request: ok({"token": f"pipe-{next(self.counter)}"})
+        self.server.routes[("GET", "/task")] = ok(READY)
+        self.server.routes[("DELETE", "/task")] = ok(None)
+        self.server.routes[("DELETE", "/pipe")] = ok(None)
+        self.client = DTCApiClient(api_key="key", base_url=self.server.base_url)
+        self.addCleanup(self.client.close)
+        self.config = {"pipeline": {"source": "webhook_1", "components": []}}
+
+    def _cleaned(self, method, path):
+        return sorted(r.query["token"] for r in self.server.requests if (r.method, r.path) == (method, path))
+
+
+class TestRegistry(ReaperCase):
+    """Test cases for token tracking and scoped resources"""
+
+    def test_tracking(self):
+        """Tokens are tracked from creation until cleanup"""
+        task = self.client.execute_task(self.config, name="job")
+        pipe = self.client.create_pipeline(self.config)
+        tracked = self.client.registry.get(task)
+        self.assertEqual((tracked.kind, tracked.name), (TASK, "job"))
+        self.assertEqual(len(tracked.config_hash), 64)
+        self.assertEqual([t.token for t in self.client.registry.tokens(PIPELINE)], [pipe])
+
+        before = tracked.last_used
+        time.sleep(0.01)
+        self.client.get_task_status(task)
+        self.assertGreater(tracked.last_used, before)
+
+        self.client.cancel_task(task)
+        self.client.delete_pipeline(pipe)
+        self.assertEqual(len(self.client.registry), 0)
+
+    def test_task_context_manager(self):
+        """The task is cancelled when the block raises"""
+        with self.assertRaises(RuntimeError):
+            with self.client.task(self.config) as token:
+                self.assertIn(token, self.client.registry)
+                raise RuntimeError("boom")
+        self.assertEqual(self._cleaned("DELETE", "/task"), [token])
+        self.assertNotIn(token, self.client.registry)
+
+    def test_pipeline_context_manager(self):
+        """The pipeline is deleted when the block exits"""
+        with self.client.pipeline(self.config) as token:
+            pass
+        self.assertEqual(self._cleaned("DELETE", "/pipe"), [token])
+        self.assertEqual(len(self.client.registry), 0)
+
+    def test_stale(self):
+        """Idle and orphaned entries are stale; fresh live ones are not"""
+        registry = TokenRegistry()
+        registry.register("fresh", TASK)
+        registry.register("idle", TASK).last_used -= 100
+        registry.register("orphan", PIPELINE).pid = dead_pid()
+        self.assertFalse(pid_alive(registry.get("orphan").pid))
+        self.assertEqual(sorted(t.token for t in registry.stale(ttl=60)), ["idle", "orphan"])
+
+
+class TestReaper(ReaperCase):
+    """Test cases for Reaper"""
+
+    def test_reap_concurrently(self):
+        """Stale tasks and pipelines are cleaned up in parallel"""
+        lock = threading.Lock()
+        state = {"in_flight": 0, "peak": 0}
+
+        def slow_delete(request):
+            with lock:
+                state["in_flight"] += 1
+                state["peak"] = max(state["peak"], state["in_flight"])
+            time.sleep(0.05)
+            with lock:
+                state["in_flight"] -= 1
+            return ok(None)
+
+        self.server.routes[("DELETE", "/task")] = slow_delete
+        tasks = [self.client.execute_task(self.config) for _ in range(6)]
+        pipe = self.client.create_pipeline(self.config)
+
+        report = Reaper(self.client, max_workers=4).reap(ttl=0)
+
+        self.assertEqual(sorted(report.cancelled), sorted(tasks))
+        self.assertEqual(report.deleted, [pipe])
+        self.assertEqual(report.reaped, 7)
+        self.assertGreater(state["peak"], 1)
+        self.assertEqual(len(self.client.registry), 0)
+
+    def test_failures(self):
+        """Gone resources are dropped; other failures are kept for the next pass"""
+        self.server.routes[("DELETE", "/task")] = lambda request: (
+            (404, {"status": "Error", "error": {"message": "not found"}})
+            if request.query["token"] == "task-1" else
+            (500, {"status": "Error", "error": {"message": "busy"}})
+        )
+        self.client.execute_task(self.config)
+        self.client.execute_task(self.config)
+
+        report = Reaper(self.client).reap(ttl=0)
+
+        self.assertEqual(report.cancelled, ["task-1"])
+        self.assertEqual(list(report.failed), ["task-2"])
+        self.assertEqual([t.token for t in self.client.registry.tokens()], ["task-2"])
+
+    def test_ttl_and_dead_owner(self):
+        """Only resources past the TTL or owned by dead processes are reaped"""
+        fresh = self.client.execute_task(self.config)
+        orphan = self.client.execute_task(self.config)
+        self.client.registry.get(orphan).pid = dead_pid()
+
+        report = Reaper(self.client, ttl=3600).reap()
+
+        self.assertEqual(report.cancelled, [orphan])
+        self.assertIn(fresh, self.client.registry)
+
+    def test_background(self):
+        """The started reaper runs passes until the client is closed"""
+        token = self.client.execute_task(self.config)
+        self.client.registry.get(token).last_used -= 10
+        self.client.start_reaper(ttl=5, interval=0.05)
+
+        deadline = time.monotonic() + 5
+        while token in self.client.registry and time.monotonic() < deadline:
+            time.sleep(0.02)
+        self.assertNotIn(token, self.client.registry)
+        self.client.close()
+        self.assertIsNone(self.client._reaper)
+
+    def test_restart_after_close(self):
+        """A closed reaper runs passes again when restarted"""
+        reaper = Reaper(self.client, ttl=5, interval=0.05).start()
+        reaper.close()
+
+        token = self.client.execute_task(self.config)
+        self.client.registry.get(token).last_used -= 10
+        reaper.start()
+        self.addCleanup(reaper.close)
+
+        deadline = time.monotonic() + 5
+        while token in self.client.registry and time.monotonic() < deadline:
+            time.sleep(0.02)
+        self.assertNotIn(token, self.client.registry)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the result cache
+
+Checks ResultCache on disk and DTCApiClient.process_file/process_webhook
+against the local mock server:
+- Keys combine the document's SHA-256 with the canonical config hash
+- Least recently used results are evicted past the size limits
+- Cache hits return the stored result without creating a task
+"""
+
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add the parent directory to Python path to import dtc_api_sdk
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dtc_api_sdk import DTCApiClient, ResultCache
+from dtc_api_sdk.cache import file_digest, digest_files
+from unit_tests.mock_server import MockDTCServer, ok
+
+READY = {"status": "Running", "serviceUp": 1, "currentObject": "webhook://WebHook", "exitCode": 0, "completed": False}
+
+
+class TempDirCase(unittest.TestCase):
+    """Base case with a temporary directory"""
+
+    def setUp(self):
+        self.dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.dir)
+
+    def _file(self, name, data):
+        path = self.dir / name
+        path.write_bytes(data)
+        return path
+
+
+class TestResultCache(TempDirCase):
+    """Test cases for ResultCache"""
+
+    def test_file_digest(self):
+        """Files are hashed in chunks, concurrently if asked"""
+        data = os.urandom(300 * 1024)
+        path = self._file("a.bin", data)
+        self.assertEqual(file_digest(path, chunk_size=4096), hashlib.sha256(data).hexdigest())
+        other = self._file("b.bin", b"other")
+        self.assertEqual(digest_files([path, other], max_workers=2), {
+            path: hashlib.sha256(data).hexdigest(),
+            other: hashlib.sha256(b"other").hexdigest(),
+        })
+
+    def test_round_trip_persists(self):
+        """Results survive reopening the database"""
+        with ResultCache(self.dir / "cache.db") as cache:
+            key = cache.key({"pipeline": {}}, "abc")
+            self.assertIsNone(cache.get(key))
+            cache.put(key, {"objects": {"1": {"text": "hello"}}})
+        with ResultCache(self.dir / "cache.db") as cache:
+            self.assertEqual(cache.get(key), {"objects": {"1": {"text": "hello"}}})
+            self.assertEqual(cache.stats().hits, 1)
+
+    def test_key_uses_canonical_config(self):
+        """Equivalent configs share keys; different configs do not"""
+        key = ResultCache.key({"a": 1, "components": [{"id": "x", "ui": {}}]}, "abc")
+        self.assertEqual(key, ResultCache.key({"components": [{"id": "x"}], "a": 1}, "abc"))
+        self.assertNotEqual(key, ResultCache.key({"a": 2}, "abc"))
+
+    def test_lru_eviction(self):
+        """The least recently used entry goes first"""
+        with ResultCache(self.dir / "cache.db", max_entries=2) as cache:
+            cache.put("a", {"n": 1})
+            cache.put("b", {"n": 2})
+            cache.get("a")
+            cache.put("c", {"n": 3})
+            self.assertIsNotNone(cache.get("a"))
+            self.assertIsNone(cache.get("b"))
+            self.assertEqual(cache.stats().evictions, 1)
+
+    def test_size_eviction(self):
+        """Total stored bytes stay under max_bytes"""
+        with ResultCache(self.dir / "cache.db", max_bytes=250) as cache:
+            for n in range(5):
+                cache.put(str(n), {"text": "x" * 90})
+            stats = cache.stats()
+            self.assertLessEqual(stats.size_bytes, 250)
+            self.assertEqual(stats.entries, 2)
+            cache.put("big", {"text": "x" * 1000})
+            self.assertIsNone(cache.get("big"))
+
+
+    def test_running_totals(self):
+        """Entry and byte totals track puts, overwrites, deletes and batched evictions"""
+        path = self.dir / "cache.db"
+        with ResultCache(path) as cache:
+            for n in range(5):
+                cache.put(str(n), {"text": "x" * 90})
+            cache.put("0", {"text": "x" * 10})
+            cache.delete("1")
+            actual = cache._connection.execute("SELECT COUNT(*), SUM(size) FROM results").fetchone()
+            stats = cache.stats()
+            self.assertEqual((stats.entries, stats.size_bytes), actual)
+
+            # One put over the limit evicts several entries at once
+            cache.max_bytes = 150
+            cache.put("new", {"text": "x" * 90})
+            self.assertEqual(cache.stats().evictions, 3)
+            self.assertIsNotNone(cache.get("0"))
+            self.assertIsNotNone(cache.get("new"))
+
+        with ResultCache(path) as reopened:
+            stats = reopened.stats()
+            self.assertEqual(stats.entries, 2)
+            reopened.clear()
+            self.assertEqual((reopened.stats().entries, reopened.stats().size_bytes), (0, 0))
+
+class TestProcessFile(TempDirCase):
+    """Test cases for cached processing in DTCApiClient"""
+
+    def setUp(self):
+        super().setUp()
+        self.server = MockDTCServer().start()
+        self.addCleanup(self.server.stop)
+        self.server.routes[("PUT", "/task")] = ok({"token": "task-1"})
+        self.server.routes[("GET", "/task")] = ok(READY)
+        self.server.routes[("DELETE", "/task")] = ok(None)
+        self.server.routes[("PUT", "/webhook")] = ok({"objectsCompleted": 1})
+        self.client = DTCApiClient(api_key="key", base_url=self.server.base_url)
+        self.addCleanup(self.client.close)
+        self.cache = ResultCache(self.dir / "cache.db")
+        self.addCleanup(self.cache.close)
+        self.config = {"pipeline": {"source": "webhook_1", "components": []}}
+
+    def _launched(self):
+        return sum(1 for r in self.server.requests if (r.method, r.path) == ("PUT", "/task"))
+
+    def test_identical_files_processed_once(self):
+        """A byte-identical file is answered from the cache"""
+        first = self._file("a.txt", b"same contents")
+        second = self._file("b.txt", b"same contents")
+
+        result = self.client.process_file(self.config, first, cache=self.cache)
+        self.assertEqual(result["data"], {"objectsCompleted": 1})
+        self.assertEqual([r.method for r in self.server.requests], ["PUT", "GET", "PUT", "DELETE"])
+
+        self.assertEqual(self.client.process_file(self.config, second, cache=self.cache), result)
+        self.assertEqual(self._launched(), 1)
+
+        self.client.process_file({"pipeline": {"source": "other", "components": []}}, second, cache=self.cache)
+        self.assertEqual(self._launched(), 2)
+
+    def test_errors_not_cached(self):
+        """Error results are processed again next time"""
+        self.server.routes[("PUT", "/webhook")] = (200, {"status": "Error", "error": {"message": "failed"}})
+        path = self._file("a.txt", b"data")
+        self.client.process_file(self.config, path, cache=self.cache)
+        self.client.process_file(self.config, path, cache=self.cache)
+        self.assertEqual(self._launched(), 2)
+
+    def test_process_webhook(self):
+        """Webhook data is keyed independently of key order"""
+        first = self.client.process_webhook(self.config, {"a": 1, "b": 2}, cache=self.cache)
+        second = self.client.process_webhook(self.config, {"b": 2, "a": 1}, cache=self.cache)
+        self.assertEqual(first, second)
+        self.assertEqual(self._launched(), 1)
+
+    def test_missing_file(self):
+        """Missing files fail before a task is created"""
+        with self.assertRaises(FileNotFoundError):
+            self.client.process_file(self.config, self.dir / "missing.txt", cache=self.cache)
+        self.assertEqual(self.server.requests, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
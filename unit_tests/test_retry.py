@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the retry engine
+
+Runs requests against the local mock server with scripted failures:
+- Idempotent endpoints retry any transient failure
+- Unsafe endpoints (PUT /task, PUT /webhook) retry only refused requests
+- Request bodies are rewound and replayed in full
+- Retry-After is honored and the retry budget caps retries
+"""
+
+import asyncio
+import os
+import socket
+import sys
+import tempfile
+import unittest
+from email.utils import formatdate
+from pathlib import Path
+from unittest import mock
+
+# Add the parent directory to Python path to import dtc_api_sdk
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dtc_api_sdk import DTCApiClient, AsyncDTCApiClient, RetryPolicy
+from dtc_api_sdk.exceptions import DTCApiError, NetworkError
+from dtc_api_sdk.retry import EndpointSafety, ReplayableBody, parse_retry_after
+from unit_tests.mock_server import MockDTCServer, ok
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+FAST = RetryPolicy(backoff_base=0.001)
+
+
+def _failing(statuses, final, headers=None):
+    """Route failing with each status in turn, then returning ``final``"""
+    remaining = list(statuses)
+
+    def route(request):
+        if remaining:
+            return remaining.pop(0), {"status": "Error", "error": {"message": "busy"}}, headers or {}
+        return final
+    return route
+
+
+class TestRetryEngine(unittest.TestCase):
+    """Test cases for request retries"""
+
+    def setUp(self):
+        self.server = MockDTCServer().start()
+        self.addCleanup(self.server.stop)
+        self.client = DTCApiClient(api_key="key", base_url=self.server.base_url, retry_policy=FAST)
+        self.addCleanup(self.client.close)
+
+    def _paths(self):
+        return [(request.method, request.path) for request in self.server.requests]
+
+    def test_idempotent_get_retries_server_errors(self):
+        """GET is retried on 5xx until it succeeds"""
+        self.server.routes[("GET", "/version")] = _failing([500, 502], ok("1.0"))
+        self.assertEqual(self.client.get_version(), "1.0")
+        self.assertEqual(len(self.server.requests), 3)
+        self.assertEqual(self.client.get_retry_stats().retries, 2)
+
+    def test_unsafe_put_task_retries_only_refusals(self):
+        """PUT /task is retried on 429/503 but not on 500"""
+        self.server.routes[("PUT", "/task")] = _failing([429, 503], ok({"token": "t-1"}))
+        self.assertEqual(self.client.execute_task({"pipeline": {}}), "t-1")
+        self.assertEqual(len(self.server.requests), 3)
+
+        self.server.requests.clear()
+        self.server.routes[("PUT", "/task")] = _failing([500], ok({"token": "t-2"}))
+        with self.assertRaises(DTCApiError):
+            self.client.execute_task({"pipeline": {}})
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_webhook_upload_body_replayed(self):
+        """A refused file upload is resent in full from the rewound file"""
+        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as handle:
+            handle.write(os.urandom(200000))
+        self.addCleanup(os.unlink, handle.name)
+
+        for use_mmap in (False, True):
+            self.server.requests.clear()
+            self.server.routes[("PUT", "/webhook")] = _failing([503], ok({"objectsCompleted": 1}))
+            self.client.upload_file_to_webhook("t-1", handle.name, use_mmap=use_mmap)
+            bodies = [request.body for request in self.server.requests]
+            self.assertEqual(len(bodies), 2)
+            self.assertEqual(bodies[0], bodies[1])
+            self.assertEqual(len(bodies[1]), 200000)
+
+    def test_streaming_multipart_replayed(self):
+        """Streaming multipart bodies are reset and resent"""
+        with tempfile.NamedTemporaryFile(suffix=".txt", delete=False) as handle:
+            handle.write(b"x" * 100000)
+        self.addCleanup(os.unlink, handle.name)
+        self.server.routes[("PUT", "/pipe/process")] = _failing([429], ok({}))
+
+        self.assertTrue(self.client.upload_files("p-1", [handle.name]))
+        first, second = self.server.requests
+        self.assertEqual(first.body, second.body)
+
+    def test_retry_after_honored(self):
+        """Retry-After delays are used instead of backoff"""
+        self.server.routes[("GET", "/status")] = _failing([503], ok({}), headers={"Retry-After": "2"})
+        with mock.patch("dtc_api_sdk.client.time.sleep") as sleep:
+            self.client.get_status()
+        sleep.assert_called_once_with(2.0)
+
+    def test_long_retry_after_gives_up(self):
+        """A Retry-After beyond max_retry_after is not waited out"""
+        self.server.routes[("GET", "/status")] = _failing([429], ok({}), headers={"Retry-After": "3600"})
+        with self.assertRaises(DTCApiError) as context:
+            self.client.get_status()
+        self.assertEqual(context.exception.status_code, 429)
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_retry_budget(self):
+        """Once the budget is spent, failures are surfaced without retrying"""
+        policy = RetryPolicy(backoff_base=0.001, budget_reserve=2, budget_ratio=0)
+        client = DTCApiClient(api_key="key", base_url=self.server.base_url, retry_policy=policy)
+        self.addCleanup(client.close)
+        self.server.routes[("GET", "/version")] = (500, {"status": "Error"})
+
+        with self.assertRaises(DTCApiError):
+            client.get_version()
+        with self.assertRaises(DTCApiError):
+            client.get_version()
+        stats = client.get_retry_stats()
+        self.assertEqual(stats.retries, 2)
+        self.assertEqual(stats.budget_exhausted, 2)
+        self.assertEqual(len(self.server.requests), 4)
+
+    def test_connect_failure_retried_for_unsafe(self):
+        """Unsent requests are retried even on unsafe endpoints"""
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        client = DTCApiClient(api_key="key", base_url=f"http://127.0.0.1:{port}", retry_policy=FAST)
+        self.addCleanup(client.close)
+
+        with self.assertRaises(NetworkError):
+            client.execute_task({"pipeline": {}})
+        self.assertEqual(client.get_retry_stats().retries, FAST.max_retries)
+
+    def test_classification(self):
+        """Endpoints are classified by method and path, with overrides"""
+        policy = RetryPolicy(safety={("PUT", "/webhook"): EndpointSafety.IDEMPOTENT})
+        self.assertEqual(policy.classify("get", "/task"), EndpointSafety.IDEMPOTENT)
+        self.assertEqual(policy.classify("DELETE", "/task"), EndpointSafety.IDEMPOTENT)
+        self.assertEqual(policy.classify("PUT", "/task"), EndpointSafety.UNSAFE)
+        self.assertEqual(policy.classify("PUT", "/webhook"), EndpointSafety.IDEMPOTENT)
+
+    def test_replayable_body(self):
+        """Generators cannot be replayed; seekable files are rewound"""
+        self.assertFalse(ReplayableBody(iter([b"a"])).replayable)
+        with tempfile.TemporaryFile() as handle:
+            handle.write(b"abcdef")
+            handle.seek(2)
+            body = ReplayableBody(handle)
+            handle.read()
+            body.rewind()
+            self.assertEqual(handle.read(), b"cdef")
+
+    def test_parse_retry_after(self):
+        """Retry-After accepts delta-seconds and HTTP dates"""
+        self.assertEqual(parse_retry_after("5"), 5.0)
+        self.assertAlmostEqual(parse_retry_after(formatdate(1030, usegmt=True), now=1000), 30.0)
+        self.assertIsNone(parse_retry_after("soon"))
+        self.assertIsNone(parse_retry_after(None))
+
+    @unittest.skipUnless(httpx, "httpx is not installed")
+    def test_async_client_retries(self):
+        """The async client follows the same rules"""
+        self.server.routes[("GET", "/version")] = _failing([503], ok("2.0"))
+        self.server.routes[("PUT", "/task")] = _failing([500], ok({"token": "t"}))
+
+        async def scenario():
+            async with AsyncDTCApiClient(api_key="key", base_url=self.server.base_url,
+                                         retry_policy=FAST) as client:
+                version = await client.get_version()
+                with self.assertRaises(DTCApiError):
+                    await client.execute_task({"pipeline": {}})
+                return version
+
+        self.assertEqual(asyncio.run(scenario()), "2.0")
+        self.assertEqual(self._paths(), [("GET", "/version")] * 2 + [("PUT", "/task")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Unit tests for streaming uploads
+
+Runs upload_files and send_webhook_file against the local mock server:
+- The streamed body is valid multipart/form-data with an exact Content-Length
+- Files are opened one at a time, only while their part is sent
+- Per-part progress is reported
+- Base64 JSON webhook payloads decode to the original file
+- Memory-mapped webhook uploads send the exact file bytes
+"""
+
+import asyncio
+import base64
+import builtins
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from email.parser import BytesParser
+from email.policy import HTTP
+from pathlib import Path
+from unittest import mock
+
+# Add the parent directory to Python path to import dtc_api_sdk
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dtc_api_sdk import DTCApiClient, AsyncDTCApiClient
+from dtc_api_sdk.streaming import MultipartEncoder, Base64JSONBody, MappedFileBody
+from unit_tests.mock_server import MockDTCServer, ok
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+def _parse_multipart(request):
+    """Decode a recorded multipart request into {field: (filename, bytes)}"""
+    message = BytesParser(policy=HTTP).parsebytes(
+        f"Content-Type: {request.headers['Content-Type']}\r\n\r\n".encode() + request.body
+    )
+    return {
+        part.get_param("name", header="content-disposition"): (part.get_filename(), part.get_payload(decode=True))
+        for part in message.iter_parts()
+    }
+
+
+class TestStreamingUpload(unittest.TestCase):
+    """Test cases for the streaming multipart encoder"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.paths = []
+        for i, size in enumerate([0, 10, 200000]):
+            path = Path(self.tmpdir.name) / f"doc_{i}.txt"
+            path.write_bytes(bytes([65 + i]) * size)
+            self.paths.append(path)
+
+        self.server = MockDTCServer().start()
+        self.addCleanup(self.server.stop)
+        self.server.routes[("PUT", "/pipe/process")] = ok({"accepted": True})
+
+    def test_length_matches_body(self):
+        """__len__ equals the number of bytes produced"""
+        encoder = MultipartEncoder(self.paths)
+        self.assertEqual(len(encoder), sum(len(chunk) for chunk in encoder))
+        encoder.reset()
+        self.assertEqual(len(encoder.read()), len(encoder))
+
+    def test_upload_files_streams_multipart(self):
+        """upload_files sends every file as a part with a Content-Length"""
+        with DTCApiClient(api_key="key", base_url=self.server.base_url) as client:
+            self.assertTrue(client.upload_files("pipe-1", self.paths))
+
+        request = self.server.requests[0]
+        self.assertEqual(request.query["token"], "pipe-1")
+        self.assertNotIn("Transfer-Encoding", request.headers)
+        self.assertEqual(int(request.headers["Content-Length"]), len(request.body))
+        parts = _parse_multipart(request)
+        self.assertEqual(sorted(parts), ["file_0", "file_1", "file_2"])
+        for i, path in enumerate(self.paths):
+            self.assertEqual(parts[f"file_{i}"], (path.name, path.read_bytes()))
+
+    def test_files_opened_one_at_a_time(self):
+        """At most one upload file is open while the body streams"""
+        real_open = builtins.open
+        state = {"open": 0, "peak": 0}
+
+        class Tracked(io.BufferedReader):
+            def close(self):
+                if not self.closed:
+                    state["open"] -= 1
+                super().close()
+
+        def tracking_open(file, mode="r", *args, **kwargs):
+            if Path(str(file)).parent == Path(self.tmpdir.name) and "b" in mode:
+                state["open"] += 1
+                state["peak"] = max(state["peak"], state["open"])
+                return Tracked(real_open(file, "rb", buffering=0))
+            return real_open(file, mode, *args, **kwargs)
+
+        encoder = MultipartEncoder(self.paths)
+        with mock.patch("builtins.open", tracking_open):
+            self.assertEqual(state["open"], 0)
+            for _ in encoder:
+                pass
+        self.assertEqual(state, {"open": 0, "peak": 1})
+
+    def test_progress_callback(self):
+        """Progress is reported per part up to the file size"""
+        events = []
+        encoder = MultipartEncoder(self.paths, chunk_size=65536, progress=lambda *args: events.append(args))
+        for _ in encoder:
+            pass
+        self.assertEqual(events[0], ("doc_1.txt", 10, 10))
+        self.assertEqual(events[-1], ("doc_2.txt", 200000, 200000))
+        self.assertEqual(len(events), 1 + 4)
+
+    def test_filename_cannot_inject_headers(self):
+        """CR, LF and quotes in file names are percent-encoded in the part header"""
+        path = Path(self.tmpdir.name) / 'evil"\r\nX-Injected: 1.txt'
+        path.write_bytes(b"data")
+        header = next(iter(MultipartEncoder([path])))
+        self.assertIn(b'filename="evil%22%0D%0AX-Injected: 1.txt"', header)
+        self.assertNotIn(b"\r\nX-Injected", header)
+
+    def test_missing_file(self):
+        """Missing files are rejected before anything is sent"""
+        with self.assertRaises(FileNotFoundError):
+            MultipartEncoder(self.paths + [Path(self.tmpdir.name) / "missing.txt"])
+
+    @unittest.skipUnless(httpx, "httpx is not installed")
+    def test_async_upload_files(self):
+        """The async client streams the same body"""
+        async def scenario():
+            async with AsyncDTCApiClient(api_key="key", base_url=self.server.base_url) as client:
+                return await client.upload_files("pipe-1", self.paths)
+
+        self.assertTrue(asyncio.run(scenario()))
+        request = self.server.requests[0]
+        self.assertEqual(int(request.headers["Content-Length"]), len(request.body))
+        self.assertEqual(_parse_multipart(request)["file_2"][1], self.paths[2].read_bytes())
+
+
+class TestBase64JSONBody(unittest.TestCase):
+    """Test cases for streamed base64 webhook payloads"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.server = MockDTCServer().start()
+        self.addCleanup(self.server.stop)
+        self.server.routes[("PUT", "/webhook")] = ok({"objectsCompleted": 1})
+
+    def _file(self, size, name="invoice.pdf"):
+        path = Path(self.tmpdir.name) / name
+        path.write_bytes(os.urandom(size))
+        return path
+
+    def test_length_for_every_padding(self):
+        """The precomputed length is exact whatever the base64 padding"""
+        for size in (0, 1, 2, 3, 4, 5, 100001):
+            body = Base64JSONBody(self._file(size), chunk_size=1000)
+            encoded = body.read()
+            self.assertEqual(len(encoded), len(body), size)
+            payload = json.loads(encoded)
+            self.assertEqual(base64.b64decode(payload["data"]), body.path.read_bytes())
+            self.assertEqual(payload["size"], size)
+
+    def test_chunks_are_bounded(self):
+        """No chunk is larger than the encoding of one read"""
+        body = Base64JSONBody(self._file(1000000), chunk_size=65536)
+        self.assertLessEqual(max(len(chunk) for chunk in body), 4 * 65536 // 3 + 4)
+
+    def test_send_webhook_file(self):
+        """send_webhook_file sends the same payload as the documented dict"""
+        path = self._file(300000)
+        with DTCApiClient(api_key="key", base_url=self.server.base_url) as client:
+            result = client.send_webhook_file("task-1", path, fields={"source": "test"})
+
+        self.assertEqual(result, {"objectsCompleted": 1})
+        request = self.server.requests[0]
+        self.assertEqual(request.headers["Content-Type"], "application/json")
+        self.assertEqual(request.headers["Authorization"], "Bearer key")
+        self.assertEqual(request.json(), {
+            "filename": "invoice.pdf",
+            "content_type": "application/pdf",
+            "size": 300000,
+            "source": "test",
+            "data": base64.b64encode(path.read_bytes()).decode("ascii"),
+        })
+
+    @unittest.skipUnless(httpx, "httpx is not installed")
+    def test_async_send_webhook_file(self):
+        """The async client streams the same payload"""
+        path = self._file(70000)
+
+        async def scenario():
+            async with AsyncDTCApiClient(api_key="key", base_url=self.server.base_url) as client:
+                return await client.send_webhook_file("task-1", path)
+
+        self.assertEqual(asyncio.run(scenario()), {"objectsCompleted": 1})
+        payload = self.server.requests[0].json()
+        self.assertEqual(base64.b64decode(payload["data"]), path.read_bytes())
+
+
+class TestMappedFileBody(unittest.TestCase):
+    """Test cases for memory-mapped webhook uploads"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = Path(self.tmpdir.name) / "audio.mp3"
+        self.path.write_bytes(os.urandom(3 * 1024 * 1024 + 17))
+        self.server = MockDTCServer().start()
+        self.addCleanup(self.server.stop)
+        self.server.routes[("PUT", "/webhook")] = ok({"objectsCompleted": 1})
+
+    def test_windows_cover_file(self):
+        """Windows are zero-copy views that concatenate to the file"""
+        body = MappedFileBody(self.path, window_size=1024 * 1024)
+        windows = []
+        for window in body:
+            self.assertIsInstance(window, memoryview)
+            windows.append(bytes(window))
+        self.assertEqual(len(windows), 4)
+        self.assertEqual(b"".join(windows), self.path.read_bytes())
+        self.assertEqual(len(body), self.path.stat().st_size)
+
+    def test_concurrent_iteration(self):
+        """Two uploads of the same file can stream at once"""
+        body = MappedFileBody(self.path, window_size=1024 * 1024)
+        first, second = iter(body), iter(body)
+        pairs = [(bytes(a), bytes(b)) for a, b in zip(first, second)]
+        self.assertTrue(all(a == b for a, b in pairs))
+
+    def test_empty_file(self):
+        """Empty files produce no windows"""
+        empty = Path(self.tmpdir.name) / "empty.txt"
+        empty.write_bytes(b"")
+        self.assertEqual(list(MappedFileBody(empty)), [])
+
+    def test_upload_file_to_webhook_mmap(self):
+        """use_mmap uploads the exact bytes with a Content-Length"""
+        with DTCApiClient(api_key="key", base_url=self.server.base_url) as client:
+            result = client.upload_file_to_webhook("task-1", self.path, use_mmap=True)
+
+        self.assertEqual(result["data"]["objectsCompleted"], 1)
+        request = self.server.requests[0]
+        self.assertEqual(request.headers["Authorization"], "key")
+        self.assertEqual(request.headers["Content-Type"], "audio/mpeg")
+        self.assertEqual(int(request.headers["Content-Length"]), self.path.stat().st_size)
+        self.assertEqual(request.body, self.path.read_bytes())
+
+
+if __name__ == "__main__":
+    unittest.main()
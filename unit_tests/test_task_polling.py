@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Unit tests for multi-task polling
+
+Runs as_completed / wait_for_tasks against the local mock server:
+- Tasks are yielded in completion order, as soon as they finish
+- Each token backs off independently
+- A token whose status request fails is reported without stopping the others
+- Engine payloads map to TaskStatus via the completed flag and exitCode
+- Adaptive backoff, progress-based speed-up and wasted-poll metrics
+"""
+
+import sys
+import threading
+import unittest
+from pathlib import Path
+
+# Add the parent directory to Python path to import dtc_api_sdk
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dtc_api_sdk import DTCApiClient, TaskStatus, TaskInfo, PollPolicy
+from dtc_api_sdk.polling import PollTracker
+from unit_tests.mock_server import MockDTCServer, ok
+
+RUNNING = {"completed": False, "status": "Running", "exitCode": 0}
+DONE = {"completed": True, "status": "Completed", "exitCode": 0}
+FAILED = {"completed": True, "status": "Completed", "exitCode": 1, "exitMsg": "boom"}
+
+
+class TestTaskPolling(unittest.TestCase):
+    """Test cases for the shared polling scheduler"""
+
+    def setUp(self):
+        self.server = MockDTCServer().start()
+        self.polls = {}
+        self.lock = threading.Lock()
+        # Number of polls after which each task finishes, and its final state
+        self.finish_after = {"slow": (6, DONE), "fast": (2, DONE), "bad": (3, FAILED)}
+        self.server.routes[("GET", "/task")] = self._status
+        self.client = DTCApiClient(api_key="key", base_url=self.server.base_url)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop()
+
+    def _status(self, request):
+        token = request.query["token"]
+        with self.lock:
+            self.polls[token] = self.polls.get(token, 0) + 1
+            polls = self.polls[token]
+        limit, final = self.finish_after.get(token, (float("inf"), DONE))
+        return ok(final if polls >= limit else RUNNING)
+
+    def test_yields_in_completion_order(self):
+        """Faster tasks are yielded before slower ones"""
+        policy = PollPolicy(initial_interval=0.05, max_interval=0.1, jitter=0)
+        results = list(self.client.as_completed(["slow", "fast", "bad"], timeout=10, policy=policy))
+        self.assertEqual([info.token for info in results], ["fast", "bad", "slow"])
+        self.assertEqual([info.status for info in results],
+                         [TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.COMPLETED])
+
+    def test_api_error_fails_only_that_token(self):
+        """A token whose status request fails is yielded as FAILED; the rest keep polling"""
+        status = self._status
+        self.server.routes[("GET", "/task")] = (
+            lambda request: (404, {"status": "Error", "error": {"message": "no such task"}})
+            if request.query["token"] == "gone" else status(request)
+        )
+        policy = PollPolicy(initial_interval=0.05, max_interval=0.1, jitter=0)
+        results = list(self.client.as_completed(["slow", "gone", "fast"], timeout=10, policy=policy))
+
+        self.assertEqual([info.token for info in results], ["gone", "fast", "slow"])
+        self.assertEqual(results[0].status, TaskStatus.FAILED)
+        self.assertTrue(results[0].error_message)
+        self.assertEqual(self.polls, {"slow": 6, "fast": 2})
+
+    def test_polls_stop_when_task_finishes(self):
+        """Each token is polled only until it reaches a terminal state"""
+        self.client.wait_for_tasks(["slow", "fast"], timeout=10, min_interval=0.01)
+        self.assertEqual(self.polls, {"slow": 6, "fast": 2})
+
+    def test_duplicate_tokens_polled_once(self):
+        """Duplicate tokens are collapsed"""
+        results = self.client.wait_for_tasks(["fast", "fast"], timeout=10, min_interval=0.01)
+        self.assertEqual(list(results), ["fast"])
+
+    def test_timeout(self):
+        """Tasks that never finish raise TimeoutError"""
+        with self.assertRaises(TimeoutError):
+            self.client.wait_for_tasks(["fast", "forever"], timeout=0.3, min_interval=0.01)
+
+    def test_engine_payload_status_mapping(self):
+        """Running engine payloads map to RUNNING instead of UNKNOWN"""
+        self.assertEqual(self.client.get_task_status("slow").status, TaskStatus.RUNNING)
+
+    def test_wait_for_task_records_poll_stats(self):
+        """Polls without a status or progress change are counted as wasted"""
+        info = self.client.wait_for_task("slow", policy=PollPolicy(initial_interval=0.01, max_interval=0.02))
+        self.assertEqual(info.status, TaskStatus.COMPLETED)
+        stats = self.client.get_poll_stats()
+        self.assertEqual(stats.polls, 6)
+        self.assertEqual(stats.tasks_finished, 1)
+        # The first poll is new information; polls 2-5 saw the same running state
+        self.assertEqual(stats.wasted_polls, 4)
+
+    def test_fixed_poll_interval(self):
+        """An explicit poll_interval disables backoff and jitter"""
+        info = self.client.wait_for_task("fast", poll_interval=0)
+        self.assertEqual(info.status, TaskStatus.COMPLETED)
+        self.assertEqual(self.polls["fast"], 2)
+
+
+class TestPollPolicy(unittest.TestCase):
+    """Test cases for the adaptive poll schedule"""
+
+    def _info(self, progress=None):
+        return TaskInfo(token="t", status=TaskStatus.RUNNING, progress=progress)
+
+    def test_backs_off_to_max_interval(self):
+        """Intervals grow geometrically after the first poll and are capped"""
+        tracker = PollTracker(PollPolicy(initial_interval=1.0, max_interval=5.0, backoff=2.0, jitter=0))
+        intervals = []
+        for now in range(6):
+            tracker.observe(self._info(), now=float(now))
+            intervals.append(tracker.next_delay())
+        self.assertEqual(intervals, [1.0, 2.0, 4.0, 5.0, 5.0, 5.0])
+
+    def test_progress_pulls_next_poll_in(self):
+        """A task nearing the end is polled around its estimated completion"""
+        tracker = PollTracker(PollPolicy(initial_interval=0.5, max_interval=30.0, backoff=4.0, jitter=0))
+        tracker.observe(self._info(0.5), now=0.0)
+        tracker.observe(self._info(0.9), now=4.0)
+        # 10% left at 10%/s: poll again in about a second instead of 2s
+        self.assertAlmostEqual(tracker.next_delay(), 1.0)
+
+    def test_jitter_bounds(self):
+        """Jitter stays within the configured fraction"""
+        policy = PollPolicy(jitter=0.2)
+        for _ in range(100):
+            self.assertTrue(8.0 <= policy.jittered(10.0) <= 12.0)
+
+    def test_observe_reports_changes(self):
+        """observe() flags status or progress changes only"""
+        tracker = PollTracker(PollPolicy())
+        self.assertTrue(tracker.observe(self._info(0.1)))
+        self.assertFalse(tracker.observe(self._info(0.1)))
+        self.assertTrue(tracker.observe(self._info(0.2)))
+
+
+if __name__ == "__main__":
+    unittest.main()
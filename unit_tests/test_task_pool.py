@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Unit tests for TaskPool
+
+Runs the warm task pool against the local mock server:
+- Tasks are leased only once GET /task reports them ready
+- The pool tops itself back up after each lease
+- Idle tasks past their TTL and unleased tasks on close are cancelled
+- Configs unused for the TTL are not relaunched, and exited tasks are not leased
+- wait_until_ready polls with backoff instead of sleeping a fixed time
+"""
+
+import itertools
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+# Add the parent directory to Python path to import dtc_api_sdk
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dtc_api_sdk import DTCApiClient, TaskPool
+from dtc_api_sdk.exceptions import TaskError
+from unit_tests.mock_server import MockDTCServer, ok
+
+STARTING = {"status": "Running", "serviceUp": 0, "currentObject": "", "exitCode": 0, "completed": False}
+READY = {"status": "Running", "serviceUp": 1, "currentObject": "webhook://WebHook", "exitCode": 0, "completed": False}
+
+
+class MockTaskServerCase(unittest.TestCase):
+    """Base case serving tasks that become ready on their second poll"""
+
+    def setUp(self):
+        self.server = MockDTCServer().start()
+        self.counter = itertools.count(1)
+        self.polls = {}
+        self.lock = threading.Lock()
+        self.server.routes[("PUT", "/task")] = lambda request: ok({"token": f"task-{next(self.counter)}"})
+        self.server.routes[("GET", "/task")] = self._status
+        self.server.routes[("DELETE", "/task")] = ok(None)
+        self.client = DTCApiClient(api_key="key", base_url=self.server.base_url)
+        self.config = {"pipeline": {"source": "webhook_1", "components": []}}
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop()
+
+    def _status(self, request):
+        """Tasks become ready on their second status poll"""
+        token = request.query["token"]
+        with self.lock:
+            self.polls[token] = self.polls.get(token, 0) + 1
+            polls = self.polls[token]
+        return ok(READY if polls >= 2 else STARTING)
+
+
+
+class TestTaskPool(MockTaskServerCase):
+    """Test cases for the warm task pool"""
+
+    def _cancelled(self):
+        return [r.query["token"] for r in self.server.requests if r.method == "DELETE"]
+
+    def test_lease_returns_ready_task(self):
+        """A leased task has been polled until ready"""
+        with TaskPool(self.client, size=1, poll_interval=0.01) as pool:
+            lease = pool.lease(self.config, timeout=5)
+            self.assertGreaterEqual(self.polls[lease.token], 2)
+            self.assertGreaterEqual(lease.startup_seconds, 0)
+
+    def test_pool_tops_up_after_lease(self):
+        """The pool launches a replacement for every leased task"""
+        with TaskPool(self.client, size=2, poll_interval=0.01) as pool:
+            first = pool.lease(self.config, timeout=5)
+            second = pool.lease(self.config, timeout=5)
+            self.assertNotEqual(first.token, second.token)
+
+            deadline = time.monotonic() + 5
+            while time.monotonic() < deadline:
+                counts = list(pool.stats()["pools"].values())[0]
+                if counts["ready"] == 2:
+                    break
+                time.sleep(0.01)
+            self.assertEqual(counts["ready"], 2)
+            self.assertEqual(pool.stats()["launched"], 4)
+
+    def test_close_cancels_unleased_tasks(self):
+        """Closing the pool cancels tasks that were never leased"""
+        pool = TaskPool(self.client, size=2, poll_interval=0.01)
+        leased = pool.lease(self.config, timeout=5)
+        pool.close()
+
+        cancelled = self._cancelled()
+        self.assertNotIn(leased.token, cancelled)
+        self.assertGreaterEqual(len(cancelled), 1)
+
+    def test_idle_ttl_cancels_stale_tasks(self):
+        """Ready tasks idle past the TTL are cancelled and an unused config is dropped"""
+        with TaskPool(self.client, size=1, idle_ttl=0.05, poll_interval=0.01) as pool:
+            pool.warm(self.config)
+            deadline = time.monotonic() + 5
+            while time.monotonic() < deadline:
+                if self._cancelled() and not pool.stats()["pools"]:
+                    break
+                time.sleep(0.01)
+            self.assertEqual(self._cancelled(), ["task-1"])
+            self.assertEqual(pool.stats()["pools"], {})
+
+            # Nothing is relaunched for a config nobody uses
+            time.sleep(0.2)
+            self.assertEqual(pool.stats()["launched"], 1)
+
+    def test_lease_after_pool_dropped(self):
+        """Leasing a config whose pool was dropped warms it again"""
+        with TaskPool(self.client, size=1, idle_ttl=0.05, poll_interval=0.01) as pool:
+            pool.warm(self.config)
+            deadline = time.monotonic() + 5
+            while pool.stats()["pools"] and time.monotonic() < deadline:
+                time.sleep(0.01)
+            lease = pool.lease(self.config, timeout=5)
+            self.assertEqual(lease.token, "task-2")
+
+    def test_lease_skips_exited_task(self):
+        """A ready task that exited while idle is cancelled instead of leased"""
+        with TaskPool(self.client, size=1, poll_interval=0.05) as pool:
+            pool.warm(self.config)
+            deadline = time.monotonic() + 5
+            while time.monotonic() < deadline:
+                if list(pool.stats()["pools"].values())[0]["ready"] == 1:
+                    break
+                time.sleep(0.01)
+            time.sleep(0.1)
+
+            exited = {"status": "Completed", "serviceUp": 0, "currentObject": "", "exitCode": 1, "completed": True}
+            status = self._status
+            self.server.routes[("GET", "/task")] = (
+                lambda request: ok(exited) if request.query["token"] == "task-1" else status(request)
+            )
+            lease = pool.lease(self.config, timeout=5)
+
+        self.assertEqual(lease.token, "task-2")
+        self.assertIn("task-1", self._cancelled())
+
+    def test_lease_timeout(self):
+        """lease raises TimeoutError when no task becomes ready"""
+        self.server.routes[("GET", "/task")] = ok(STARTING)
+        with TaskPool(self.client, size=1, poll_interval=0.01) as pool:
+            with self.assertRaises(TimeoutError):
+                pool.lease(self.config, timeout=0.1)
+
+
+
+class TestWaitUntilReady(MockTaskServerCase):
+    """Test cases for the client readiness probe"""
+
+    def test_returns_once_ready(self):
+        """wait_until_ready returns the payload that reported readiness"""
+        status = self.client.wait_until_ready("task-1", deadline=5, initial_interval=0.01)
+        self.assertEqual(status["currentObject"], "webhook://WebHook")
+        self.assertEqual(self.polls["task-1"], 2)
+
+    def test_exited_task_raises(self):
+        """A task that exits during startup raises TaskError"""
+        self.server.routes[("GET", "/task")] = ok(dict(STARTING, completed=True, exitCode=1, exitMsg="bad"))
+        with self.assertRaises(TaskError):
+            self.client.wait_until_ready("task-1", deadline=5, initial_interval=0.01)
+
+    def test_deadline(self):
+        """wait_until_ready gives up at the deadline with backing-off polls"""
+        self.server.routes[("GET", "/task")] = ok(STARTING)
+        start = time.monotonic()
+        with self.assertRaises(TimeoutError):
+            self.client.wait_until_ready("task-1", deadline=0.3, initial_interval=0.02)
+        self.assertLess(time.monotonic() - start, 1.0)
+        # 0.02 + 0.04 + 0.08 + 0.16 covers the deadline in at most six polls
+        self.assertLessEqual(len(self.server.requests), 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Unit tests for TaskStatusSnapshot
+
+Parses real and synthetic GET /task payloads:
+- Engine counters are mapped from the reference payload
+- Throughput and ETA are derived from rates or elapsed time
+- The trace is only kept when requested and is parsed lazily
+"""
+
+import json
+import sys
+import unittest
+from pathlib import Path
+
+# Add the parent directory to Python path to import dtc_api_sdk
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dtc_api_sdk import DTCApiClient, TaskStatus, TaskStatusSnapshot
+from unit_tests.mock_server import MockDTCServer, ok
+
+REFERENCE_PAYLOAD = Path(__file__).parent.parent / "reference_code" / "working_pdf_task_status.json"
+
+
+def _payload(**overrides):
+    data = {
+        "completed": False, "status": "Running", "startTime": 1000.0, "endTime": 0,
+        "totalSize": 1000, "completedSize": 250, "failedSize": 0,
+        "totalCount": 10, "completedCount": 2, "failedCount": 0,
+        "rateSize": 0, "rateCount": 0, "exitCode": 0, "exitMsg": "",
+    }
+    data.update(overrides)
+    return data
+
+
+class TestTaskStatusSnapshot(unittest.TestCase):
+    """Test cases for the task status snapshot model"""
+
+    def test_reference_payload(self):
+        """The captured engine payload maps onto snapshot fields"""
+        data = json.loads(REFERENCE_PAYLOAD.read_text())["data"]
+        snapshot = TaskStatusSnapshot.from_payload(data)
+        self.assertEqual(snapshot.status, "Running")
+        self.assertTrue(snapshot.service_up)
+        self.assertEqual(snapshot.current_object, "webhook://WebHook")
+        self.assertEqual(snapshot.task_status, TaskStatus.RUNNING)
+        self.assertEqual(snapshot.trace_length, len(data["trace"]))
+        self.assertIsNone(snapshot.trace)
+        self.assertEqual(snapshot.metrics["requests"], 1)
+
+    def test_slots(self):
+        """Snapshots carry no per-instance __dict__"""
+        snapshot = TaskStatusSnapshot.from_payload(_payload())
+        self.assertFalse(hasattr(snapshot, "__dict__"))
+
+    def test_throughput_from_elapsed_time(self):
+        """Without engine rates, throughput is averaged over the elapsed time"""
+        snapshot = TaskStatusSnapshot.from_payload(_payload())
+        self.assertAlmostEqual(snapshot.bytes_per_second(now=1010.0), 25.0)
+        self.assertAlmostEqual(snapshot.objects_per_second(now=1010.0), 0.2)
+        self.assertAlmostEqual(snapshot.progress, 0.25)
+        self.assertAlmostEqual(snapshot.eta_seconds(now=1010.0), 30.0)
+
+    def test_engine_rates_preferred(self):
+        """Reported rateSize/rateCount take precedence over averages"""
+        snapshot = TaskStatusSnapshot.from_payload(_payload(rateSize=75, rateCount=1))
+        self.assertEqual(snapshot.bytes_per_second(now=1010.0), 75.0)
+        self.assertEqual(snapshot.objects_per_second(now=1010.0), 1.0)
+        self.assertAlmostEqual(snapshot.eta_seconds(now=1010.0), 10.0)
+
+    def test_eta_unknown_without_totals(self):
+        """No totals or no progress yet means no ETA"""
+        self.assertIsNone(TaskStatusSnapshot.from_payload(_payload(totalSize=0, totalCount=0)).eta_seconds())
+        self.assertIsNone(TaskStatusSnapshot.from_payload(_payload(completedSize=0)).eta_seconds(now=1010.0))
+        self.assertEqual(TaskStatusSnapshot.from_payload(_payload(completed=True)).eta_seconds(), 0.0)
+
+    def test_lazy_trace(self):
+        """The trace is parsed into entries on first access only"""
+        snapshot = TaskStatusSnapshot.from_payload(
+            _payload(trace=["[79MB] [E] beginEndpoint : webhook", "Status: Running"]),
+            include_trace=True
+        )
+        self.assertIsNone(snapshot._trace)
+        first, second = snapshot.trace
+        self.assertEqual((first.memory_mb, first.message), (79, "[E] beginEndpoint : webhook"))
+        self.assertEqual((second.memory_mb, second.message), (None, "Status: Running"))
+        self.assertIs(snapshot.trace, snapshot.trace)
+
+    def test_client_attaches_snapshot(self):
+        """get_task_status exposes the snapshot and engine error message"""
+        with MockDTCServer() as server:
+            server.routes[("GET", "/task")] = ok(_payload(completed=True, exitCode=2, exitMsg="boom"))
+            with DTCApiClient(api_key="key", base_url=server.base_url) as client:
+                info = client.get_task_status("t")
+                snapshot = client.get_task_snapshot("t", include_trace=True)
+
+        self.assertEqual(info.status, TaskStatus.FAILED)
+        self.assertEqual(info.error_message, "boom")
+        self.assertEqual(info.snapshot.completed_count, 2)
+        self.assertEqual(snapshot.trace, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
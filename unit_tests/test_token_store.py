@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the persistent token store
+
+Runs TokenStore on temporary databases and as a client registry against
+the local mock server:
+- Tokens are recorded, queried by kind, state, name and config, and kept
+  after release
+- Several stores (as in several processes) share one database
+- The reaper cleans up stale tokens recorded in the store
+"""
+
+import itertools
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+# Add the parent directory to Python path to import dtc_api_sdk
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dtc_api_sdk import DTCApiClient, Reaper, TokenStore
+from dtc_api_sdk.pipeline import config_hash
+from dtc_api_sdk.reaper import TASK, PIPELINE, RUNNING, RELEASED
+from unit_tests.mock_server import MockDTCServer, ok
+
+CONFIG_A = {"pipeline": {"source": "webhook_1", "components": []}}
+CONFIG_B = {"pipeline": {"source": "dropper_1", "components": []}}
+
+
+class StoreCase(unittest.TestCase):
+    """Base case with a temporary database"""
+
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.root)
+        self.path = self.root / "tokens.db"
+
+    def _open(self, **kwargs):
+        store = TokenStore(self.path, **kwargs)
+        self.addCleanup(store.close)
+        return store
+
+
+class TestTokenStore(StoreCase):
+    """Test cases for TokenStore"""
+
+    def test_register_and_query(self):
+        """Tokens can be found by kind, state, name and configuration"""
+        store = self._open()
+        store.register("t1", TASK, name="nightly", config_hash=config_hash(CONFIG_A))
+        store.register("t2", TASK, config_hash=config_hash(CONFIG_B))
+        store.register("p1", PIPELINE, config_hash=config_hash(CONFIG_A))
+        store.register("t3", TASK, config_hash=config_hash(CONFIG_A))
+        self.assertTrue(store.unregister("t3"))
+        self.assertFalse(store.unregister("t3"))
+
+        running_a = store.find(kind=TASK, state=RUNNING, config=CONFIG_A)
+        self.assertEqual([t.token for t in running_a], ["t1"])
+        self.assertEqual([t.token for t in store.find(name="nightly")], ["t1"])
+        self.assertEqual([t.token for t in store.find(newest_first=True, limit=2)], ["t3", "p1"])
+        self.assertEqual(store.get("t3").state, RELEASED)
+        self.assertEqual(len(store), 3)
+        self.assertIn("t1", store)
+        self.assertNotIn("t3", store)
+        self.assertEqual([t.token for t in store.tokens(PIPELINE)], ["p1"])
+
+        store.set_state("t2", "completed")
+        self.assertEqual([t.token for t in store.find(state="completed")], ["t2"])
+
+    def test_shared_between_stores(self):
+        """Writes from one store are visible to another on the same file"""
+        writer = self._open()
+        reader = self._open()
+        writer.register("t1", TASK)
+        self.assertEqual(reader.get("t1").kind, TASK)
+
+        errors = []
+
+        def register_many(store, prefix):
+            try:
+                for n in range(50):
+                    store.register(f"{prefix}-{n}", TASK)
+            except Exception as e:  # pragma: no cover - reported below
+                errors.append(e)
+
+        threads = [threading.Thread(target=register_many, args=(store, prefix))
+                   for store, prefix in ((writer, "a"), (reader, "b"))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(len(reader), 101)
+
+    def test_touch_is_throttled(self):
+        """last_used is written at most once per touch interval"""
+        store = self._open(touch_interval=60)
+        tracked = store.register("t1", TASK)
+        time.sleep(0.01)
+        store.touch("t1")
+        self.assertEqual(store.get("t1").last_used, tracked.last_used)
+
+        store.touch_interval = 0
+        store.touch("t1")
+        self.assertGreater(store.get("t1").last_used, tracked.last_used)
+
+    def test_touch_tracks_only_running_tokens(self):
+        """Unknown and released tokens are not kept in the touch throttle"""
+        store = self._open(touch_interval=60)
+        store.touch("never-registered")
+        store.register("t1", TASK)
+        store.register("t2", TASK)
+        store.unregister("t2")
+        store.touch("t1")
+        store.touch("t2")
+        self.assertEqual(sorted(store._touched), ["t1"])
+
+        store.unregister("t1")
+        self.assertEqual(store._touched, {})
+
+    def test_stale(self):
+        """Idle, orphaned and running tokens are told apart"""
+        store = self._open()
+        store.register("fresh", TASK)
+        store.register("idle", TASK)
+        store.register("orphan", TASK)
+        store.register("detached", TASK)
+        store.detach("detached")
+        process = subprocess.Popen([sys.executable, "-c", "pass"])
+        process.wait()
+        store._connection.execute("UPDATE tokens SET pid = ? WHERE token = 'orphan'", (process.pid,))
+        store._connection.execute("UPDATE tokens SET last_used = last_used - 100 WHERE token = 'idle'")
+
+        self.assertEqual(sorted(t.token for t in store.stale(ttl=60)), ["idle", "orphan"])
+
+    def test_purge(self):
+        """Only old released tokens are purged"""
+        store = self._open()
+        store.register("old", TASK)
+        store.register("live", TASK)
+        store.unregister("old")
+        self.assertEqual(store.purge(older_than=-1), 1)
+        self.assertIsNone(store.get("old"))
+        self.assertIsNotNone(store.get("live"))
+
+
+class TestClientRegistry(StoreCase):
+    """Test cases for TokenStore as a client registry"""
+
+    def setUp(self):
+        super().setUp()
+        self.server = MockDTCServer().start()
+        self.addCleanup(self.server.stop)
+        counter = itertools.count(1)
+        self.server.routes[("PUT", "/task")] = lambda request: ok({"token": f"task-{next(counter)}"})
+        self.server.routes[("DELETE", "/task")] = ok(None)
+        self.store = self._open()
+        self.client = DTCApiClient(api_key="key", base_url=self.server.base_url, registry=self.store)
+        self.addCleanup(self.client.close)
+
+    def test_client_records_tokens(self):
+        """Created tasks are stored and marked released when cancelled"""
+        token = self.client.execute_task(CONFIG_A, name="job")
+        self.assertEqual(self.store.find(state=RUNNING, config=CONFIG_A)[0].name, "job")
+        self.client.cancel_task(token)
+        self.assertEqual(self.store.get(token).state, RELEASED)
+
+    def test_reaper_uses_store(self):
+        """Another process's stale tokens are reaped through the shared store"""
+        other = self._open()
+        other.register("leaked", TASK)
+        self.client.execute_task(CONFIG_A)
+
+        report = Reaper(self.client).reap(ttl=0)
+
+        self.assertEqual(sorted(report.cancelled), ["leaked", "task-1"])
+        self.assertEqual(len(other), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the pooled HTTP transport
+
+Runs DTCApiClient against the local mock server:
+- Direct webhook uploads reuse pooled keep-alive connections
+- Webhook uploads use the raw-key Authorization profile
+- Pool statistics are reported per plane
+- Transport profiles size pools and expire idle connections
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+# Add the parent directory to Python path to import dtc_api_sdk
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dtc_api_sdk import DTCApiClient, TransportProfile
+from unit_tests.mock_server import MockDTCServer, ok
+
+
+class TestPooledTransport(unittest.TestCase):
+    """Test cases for connection pooling and auth profiles"""
+
+    def setUp(self):
+        self.server = MockDTCServer().start()
+        self.server.routes[("PUT", "/webhook")] = ok({"objectsCompleted": 1})
+        self.server.routes[("GET", "/version")] = ok("1.2.3")
+        self.client = DTCApiClient(api_key="key", base_url=self.server.base_url)
+
+        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as handle:
+            handle.write(b"%PDF-1.4 test")
+        self.file_path = handle.name
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop()
+        os.unlink(self.file_path)
+
+    def test_webhook_uploads_reuse_connection(self):
+        """Repeated uploads share one keep-alive connection"""
+        for _ in range(5):
+            self.client.upload_file_to_webhook("task-123", self.file_path)
+
+        self.assertEqual(self.server.connections, 1)
+        stats = self.client.get_pool_stats()["data"]
+        self.assertEqual(stats.requests, 5)
+        self.assertEqual(stats.connections_opened, 1)
+        self.assertAlmostEqual(stats.reuse_ratio, 0.8)
+
+    def test_webhook_auth_profile(self):
+        """Webhook uploads send the raw key, control calls send a Bearer token"""
+        self.client.upload_file_to_webhook("task-123", self.file_path)
+        self.client.get_version()
+
+        upload, version = self.server.requests
+        self.assertEqual(upload.headers["Authorization"], "key")
+        self.assertEqual(upload.headers["Content-Type"], "application/pdf")
+        self.assertEqual(upload.query, {"type": "cpu", "apikey": "key", "token": "task-123"})
+        self.assertEqual(upload.body, b"%PDF-1.4 test")
+        self.assertEqual(version.headers["Authorization"], "Bearer key")
+
+    def test_pool_stats_per_plane(self):
+        """Control and data plane traffic is counted separately"""
+        self.client.get_version()
+        self.client.get_version()
+
+        stats = self.client.get_pool_stats()
+        self.assertEqual(stats["control"].requests, 2)
+        self.assertEqual(stats["data"].requests, 0)
+        self.assertEqual(stats["control"].idle_connections, 1)
+
+    def test_webhook_json_uses_data_plane(self):
+        """send_webhook goes through the data-plane pool with a Bearer token"""
+        self.client.send_webhook("task-123", {"message": "hi"})
+
+        stats = self.client.get_pool_stats()
+        self.assertEqual(stats["data"].requests, 1)
+        self.assertEqual(stats["control"].requests, 0)
+        self.assertEqual(self.server.requests[0].headers["Authorization"], "Bearer key")
+
+
+class TestTransportProfiles(unittest.TestCase):
+    """Test cases for configurable transport profiles"""
+
+    def setUp(self):
+        self.server = MockDTCServer().start()
+        self.server.routes[("GET", "/version")] = ok("1.2.3")
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_pool_maxsize_bounds_connections(self):
+        """A blocking pool never opens more connections than pool_maxsize"""
+        client = DTCApiClient(
+            api_key="key",
+            base_url=self.server.base_url,
+            control_transport=TransportProfile(pool_maxsize=3, pool_block=True)
+        )
+        self.addCleanup(client.close)
+
+        threads = [threading.Thread(target=client.get_version) for _ in range(12)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(client.get_pool_stats()["control"].requests, 12)
+        self.assertLessEqual(self.server.connections, 3)
+
+    def test_keepalive_idle_timeout(self):
+        """Connections idle past the timeout are replaced"""
+        client = DTCApiClient(
+            api_key="key",
+            base_url=self.server.base_url,
+            control_transport=TransportProfile(keepalive_idle_timeout=0.05)
+        )
+        self.addCleanup(client.close)
+
+        client.get_version()
+        client.get_version()
+        time.sleep(0.1)
+        client.get_version()
+
+        self.assertEqual(self.server.connections, 2)
+        self.assertEqual(client.get_pool_stats()["control"].idle_resets, 1)
+
+    def test_idle_timeout_is_per_connection(self):
+        """Only the idle connection is replaced; one in use is left alone"""
+        def slow_status(request):
+            time.sleep(0.3)
+            return ok({"status": "ok"})
+
+        self.server.routes[("GET", "/status")] = slow_status
+        client = DTCApiClient(
+            api_key="key",
+            base_url=self.server.base_url,
+            control_transport=TransportProfile(keepalive_idle_timeout=0.05)
+        )
+        self.addCleanup(client.close)
+
+        statuses = []
+        slow = threading.Thread(target=lambda: statuses.append(client.get_status()))
+        slow.start()
+        time.sleep(0.05)
+        client.get_version()
+        time.sleep(0.1)
+        client.get_version()
+        slow.join()
+
+        self.assertEqual(statuses, [{"status": "ok"}])
+        self.assertEqual(self.server.connections, 3)
+        self.assertEqual(client.get_pool_stats()["control"].idle_resets, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()